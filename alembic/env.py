@@ -22,8 +22,11 @@ db_url = str(app_config.SQLALCHEMY_DATABASE_URI)
 config.set_main_option("sqlalchemy.url", db_url)
 
 # Interpret the config file for Python logging.
-# This line sets up loggers basically.
-if config.config_file_name is not None:
+# This line sets up loggers basically. Callers running migrations in-process
+# (e.g. tests) can opt out so their own logging is left alone.
+if config.config_file_name is not None and config.attributes.get(
+    "configure_logger", True
+):
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
@@ -67,6 +70,14 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # A connection passed in by the caller (e.g. tests migrating a scratch schema)
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -24,6 +24,21 @@ def upgrade() -> None:
     # ### commands auto generated by Alembic - please adjust! ###
     conn = op.get_bind()
     inspector = sa.inspect(conn)
+    if "books" not in inspector.get_table_names():
+        # Fresh database: the table used to be created by the app at startup
+        op.create_table(
+            "books",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("title", sa.String(), nullable=False),
+            sa.Column("author", sa.String(), nullable=False),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("region", sa.String(), nullable=True),
+            sa.Column("country", sa.String(), nullable=True),
+            sa.Column("subjects", sa.Text(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_books_id", "books", ["id"])
+        op.create_index("ix_books_title", "books", ["title"])
     columns = [c["name"] for c in inspector.get_columns("books")]
     if "is_fiction" not in columns:
         op.add_column("books", sa.Column("is_fiction", sa.String(), nullable=True))
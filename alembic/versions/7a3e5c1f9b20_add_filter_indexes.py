@@ -0,0 +1,51 @@
+"""Add indexes for list filters and title lookups
+
+Revision ID: 7a3e5c1f9b20
+Revises: cb1dd1bad822
+Create Date: 2026-10-19 10:12:41.508113
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7a3e5c1f9b20"
+down_revision: Union[str, Sequence[str], None] = "cb1dd1bad822"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_books_is_fiction_id": [sa.text("is_fiction"), sa.text("id DESC")],
+    "ix_books_is_owned_id": [sa.text("is_owned"), sa.text("id DESC")],
+    "ix_books_is_owned_is_fiction_id": [
+        sa.text("is_owned"),
+        sa.text("is_fiction"),
+        sa.text("id DESC"),
+    ],
+    "ix_books_lower_title": [sa.text("lower(title)")],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing = {index["name"] for index in inspector.get_indexes("books")}
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            if name not in existing:
+                op.create_index(name, "books", columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(
+                name, table_name="books", postgresql_concurrently=True, if_exists=True
+            )
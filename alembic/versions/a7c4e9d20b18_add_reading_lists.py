@@ -0,0 +1,120 @@
+"""Add reading lists and scope books to a list
+
+Revision ID: a7c4e9d20b18
+Revises: f3b8d2a61c47
+Create Date: 2026-10-19 18:12:44.306157
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c4e9d20b18"
+down_revision: Union[str, Sequence[str], None] = "f3b8d2a61c47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Single-column indexes superseded by the list_id-leading ones below
+OLD_INDEXES = {
+    "ix_books_is_fiction_id": ["is_fiction", sa.text("id DESC")],
+    "ix_books_is_owned_id": ["is_owned", sa.text("id DESC")],
+    "ix_books_is_owned_is_fiction_id": ["is_owned", "is_fiction", sa.text("id DESC")],
+    "ix_books_lower_title": [sa.text("lower(title)")],
+    "ix_books_lower_author": [sa.text("lower(author)")],
+    "ix_books_created_at": ["created_at"],
+    "ix_books_owned_at": ["owned_at"],
+}
+LIST_INDEXES = {
+    "ix_books_list_id": ["list_id", sa.text("id DESC")],
+    "ix_books_list_is_fiction_id": ["list_id", "is_fiction", sa.text("id DESC")],
+    "ix_books_list_is_owned_id": ["list_id", "is_owned", sa.text("id DESC")],
+    "ix_books_list_is_owned_is_fiction_id": [
+        "list_id",
+        "is_owned",
+        "is_fiction",
+        sa.text("id DESC"),
+    ],
+    "ix_books_list_lower_title": ["list_id", sa.text("lower(title)")],
+    "ix_books_list_lower_author": ["list_id", sa.text("lower(author)")],
+    "ix_books_list_created_at": ["list_id", "created_at"],
+    "ix_books_list_owned_at": ["list_id", "owned_at"],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if "reading_lists" not in inspector.get_table_names():
+        reading_lists = op.create_table(
+            "reading_lists",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("slug", sa.String(length=64), nullable=False, unique=True),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("admin_password_hash", sa.String(), nullable=True),
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                nullable=False,
+                server_default=sa.func.now(),
+            ),
+        )
+        # Existing books become the default list, unlocked by ADMIN_PASSWORD
+        op.bulk_insert(
+            reading_lists, [{"id": 1, "slug": "default", "name": "Reading list"}]
+        )
+        if conn.dialect.name == "postgresql":
+            op.execute(
+                "SELECT setval(pg_get_serial_sequence('reading_lists', 'id'), "
+                "(SELECT max(id) FROM reading_lists))"
+            )
+
+    columns = [c["name"] for c in inspector.get_columns("books")]
+    if "list_id" not in columns:
+        # The server default fills existing rows without rewriting them on PG 11+
+        op.add_column(
+            "books",
+            sa.Column("list_id", sa.Integer(), nullable=False, server_default="1"),
+        )
+        op.create_foreign_key(
+            "fk_books_list_id",
+            "books",
+            "reading_lists",
+            ["list_id"],
+            ["id"],
+            ondelete="CASCADE",
+        )
+
+    existing = {index["name"] for index in inspector.get_indexes("books")}
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        for name, columns in LIST_INDEXES.items():
+            if name not in existing:
+                op.create_index(name, "books", columns, postgresql_concurrently=True)
+        for name in OLD_INDEXES:
+            if name in existing:
+                op.drop_index(name, table_name="books", postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, columns in OLD_INDEXES.items():
+            op.create_index(
+                name,
+                "books",
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        for name in LIST_INDEXES:
+            op.drop_index(
+                name, table_name="books", postgresql_concurrently=True, if_exists=True
+            )
+    op.drop_constraint("fk_books_list_id", "books", type_="foreignkey")
+    op.drop_column("books", "list_id")
+    op.drop_table("reading_lists")
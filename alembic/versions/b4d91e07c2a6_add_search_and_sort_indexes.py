@@ -0,0 +1,60 @@
+"""Add trigram search and author sort indexes
+
+Revision ID: b4d91e07c2a6
+Revises: 7a3e5c1f9b20
+Create Date: 2026-10-19 14:03:27.911540
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b4d91e07c2a6"
+down_revision: Union[str, Sequence[str], None] = "7a3e5c1f9b20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_COLUMNS = ("subjects", "author", "region")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing = {index["name"] for index in inspector.get_indexes("books")}
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        if "ix_books_lower_author" not in existing:
+            op.create_index(
+                "ix_books_lower_author",
+                "books",
+                [sa.text("lower(author)")],
+                postgresql_concurrently=True,
+            )
+        for column in TRIGRAM_COLUMNS:
+            name = f"ix_books_{column}_trgm"
+            if name not in existing:
+                op.create_index(
+                    name,
+                    "books",
+                    [column],
+                    postgresql_using="gin",
+                    postgresql_ops={column: "gin_trgm_ops"},
+                    postgresql_concurrently=True,
+                )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    names = ["ix_books_lower_author"] + [f"ix_books_{c}_trgm" for c in TRIGRAM_COLUMNS]
+    with op.get_context().autocommit_block():
+        for name in names:
+            op.drop_index(
+                name, table_name="books", postgresql_concurrently=True, if_exists=True
+            )
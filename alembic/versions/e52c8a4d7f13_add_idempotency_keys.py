@@ -0,0 +1,48 @@
+"""Add idempotency_keys table for /api/add retries
+
+Revision ID: e52c8a4d7f13
+Revises: b4d91e07c2a6
+Create Date: 2026-10-19 14:05:12.731402
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e52c8a4d7f13"
+down_revision: Union[str, Sequence[str], None] = "b4d91e07c2a6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if "idempotency_keys" not in inspector.get_table_names():
+        op.create_table(
+            "idempotency_keys",
+            sa.Column("key", sa.String(length=255), nullable=False),
+            sa.Column("request_hash", sa.String(length=64), nullable=False),
+            sa.Column("status_code", sa.Integer(), nullable=True),
+            sa.Column("response", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+            sa.PrimaryKeyConstraint("key"),
+        )
+        op.create_index(
+            "ix_idempotency_keys_created_at", "idempotency_keys", ["created_at"]
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_idempotency_keys_created_at",
+        table_name="idempotency_keys",
+        if_exists=True,
+    )
+    op.drop_table("idempotency_keys", if_exists=True)
@@ -0,0 +1,61 @@
+"""Add created_at, updated_at and owned_at to books
+
+Revision ID: f3b8d2a61c47
+Revises: e52c8a4d7f13
+Create Date: 2026-10-19 16:42:08.518209
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3b8d2a61c47"
+down_revision: Union[str, Sequence[str], None] = "e52c8a4d7f13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TIMESTAMP_COLUMNS = ("created_at", "updated_at", "owned_at")
+INDEXED_COLUMNS = ("created_at", "owned_at")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    columns = [c["name"] for c in inspector.get_columns("books")]
+    for name in TIMESTAMP_COLUMNS:
+        if name not in columns:
+            # Added without a default so existing books stay NULL (unknown)
+            # instead of all dating from this migration
+            op.add_column(
+                "books", sa.Column(name, sa.DateTime(timezone=True), nullable=True)
+            )
+    for name in ("created_at", "updated_at"):
+        op.alter_column("books", name, server_default=sa.func.now())
+
+    indexes = {index["name"] for index in inspector.get_indexes("books")}
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        for name in INDEXED_COLUMNS:
+            if f"ix_books_{name}" not in indexes:
+                op.create_index(
+                    f"ix_books_{name}", "books", [name], postgresql_concurrently=True
+                )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in INDEXED_COLUMNS:
+            op.drop_index(
+                f"ix_books_{name}",
+                table_name="books",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+    for name in TIMESTAMP_COLUMNS:
+        op.drop_column("books", name)
@@ -1,13 +1,161 @@
 import json
 import logging
 import re
+import time
 
 import anthropic
 
 from bibliotracker.config import Config
+from bibliotracker.metrics import metrics
+from bibliotracker.resilience import (
+    PriorityScheduler,
+    UpstreamUnavailable,
+    get_upstream,
+)
 
 logger = logging.getLogger(__name__)
 
+# Instruction line for each metadata field the model can be asked for
+FIELD_PROMPTS = {
+    "title": '- "title": Full canonical title',
+    "authors": '- "authors": List of author names',
+    "description": '- "description": A concise English summary (max 100 words). No markdown citations or source links.',
+    "region": '- "region": Up to 2 major regions/continents, comma-separated string',
+    "subjects": '- "subjects": List of 3 main genres/subjects',
+    "is_fiction": '- "is_fiction": Categorize as "Fiction" or "Non-Fiction"',
+}
+
+# Shortest prefix (tools + system prompt) Anthropic will cache, by model name
+# prefix, most specific first. Shorter prefixes are processed in full on every
+# call, so the cache breakpoint is only sent when the prefix clears this.
+MIN_CACHEABLE_TOKENS = (
+    ("claude-opus-4-6", 4096),
+    ("claude-opus-4-5", 4096),
+    ("claude-haiku-4-5", 4096),
+    ("claude-sonnet-4-6", 2048),
+    ("claude-3-5-haiku", 2048),
+    ("claude-3-haiku", 2048),
+    ("claude-sonnet-4", 1024),
+    ("claude-opus-4", 1024),
+    ("claude-3-7-sonnet", 1024),
+)
+
+# Rough token count of English prose and JSON, used to decide whether the
+# static prefix is worth marking for caching; responses confirm it
+CHARS_PER_TOKEN = 4
+
+# How each field is filled in, where the one-line field prompts leave room
+# for inconsistent answers
+CATALOGUING_GUIDE = """Cataloguing rules
+
+Title: the title of the best-known English edition, without edition or
+format noise ("(Penguin Classics)", "A Novel", volume numbers). Translated
+works use their established English title.
+
+Authors: every credited author in cover order, in the form they publish
+under ("J.R.R. Tolkien"). Leave out translators, illustrators and writers of
+forewords.
+
+Description: two to four plain English sentences on the premise (fiction)
+or subject and argument (non-fiction). No spoilers, praise, awards, markdown,
+citation markers or links.
+
+Region: one or two of Africa, Asia, Europe, Middle East, North America,
+South America, Central America, Caribbean, Oceania, Antarctica, Global,
+comma-separated. Prefer the region over the country; use "Global" for books
+that span the world or have no real-world setting that matters.
+
+Subjects: exactly three short title-cased labels, most specific first
+("Science Fiction", "Economic History"). Avoid vague labels ("Fiction",
+"Literature") and don't repeat the region.
+
+Fiction or non-fiction: novels, short stories, poetry, plays and graphic
+novels are "Fiction"; memoir, biography, history, science, essays and
+narrative non-fiction are "Non-Fiction". Myth retellings are "Fiction".
+
+Confidence: "high" if you recognise this exact book and every answer is
+well known, "medium" if one field is a judgement call, "low" if you don't
+recognise the book or are guessing. Always fill in every requested field,
+even at low confidence: give your best guess and let the low confidence
+send it for a second opinion.
+
+Examples
+
+Book: "The Odyssey" by "Homer, Emily Wilson".
+Fields to fill in: authors, region, is_fiction.
+record_book_metadata: authors ["Homer"]; region "Europe"; is_fiction
+"Fiction"; confidence "high" (Emily Wilson is the translator).
+
+Book: "The Orchard Keeper's Daughter" by "M. Talbot".
+Fields to fill in: region, subjects, is_fiction.
+record_book_metadata: region "Global"; subjects ["Literary Fiction",
+"Family Saga", "Rural Life"]; is_fiction "Fiction"; confidence "low" (the
+book is not recognised, so every field is a guess from the title)."""
+
+# Static across requests so it can be served from the prompt cache
+SYSTEM_PROMPT = f"""You are a meticulous librarian cataloguing books for a personal to-read list.
+For the book you are given, record metadata with the record_book_metadata tool.
+Only fill in the fields you are asked for:
+{chr(10).join(FIELD_PROMPTS.values())}
+
+Data must be accurate. Description MUST be in English.
+Fill in every requested field. Set "confidence" to "low" if you do not
+recognise the book or are guessing.
+
+{CATALOGUING_GUIDE}"""
+
+METADATA_TOOL = {
+    "name": "record_book_metadata",
+    "description": "Record catalogue metadata for a single book.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "title": {"type": "string"},
+            "authors": {"type": "array", "items": {"type": "string"}},
+            "description": {"type": "string"},
+            "region": {"type": "string"},
+            "subjects": {"type": "array", "items": {"type": "string"}, "maxItems": 5},
+            "is_fiction": {"type": "string", "enum": ["Fiction", "Non-Fiction"]},
+            "confidence": {"type": "string", "enum": ["high", "medium", "low"]},
+        },
+        "required": ["confidence"],
+    },
+}
+
+# Expected JSON type of every metadata field returned by the tool
+FIELD_TYPES = {
+    "title": str,
+    "authors": list,
+    "description": str,
+    "region": str,
+    "subjects": list,
+    "is_fiction": str,
+}
+
+
+def min_cacheable_tokens(model: str) -> int:
+    """
+    Return the shortest prompt prefix, in tokens, that `model` can cache.
+
+    Unknown models get the largest minimum, so caching is never assumed.
+    """
+    for prefix, tokens in MIN_CACHEABLE_TOKENS:
+        if model.startswith(prefix):
+            return tokens
+    return max(tokens for _, tokens in MIN_CACHEABLE_TOKENS)
+
+
+def static_prefix_tokens() -> int:
+    """Estimate the tokens in the tool definition and system prompt."""
+    return (len(json.dumps(METADATA_TOOL)) + len(SYSTEM_PROMPT)) // CHARS_PER_TOKEN
+
+
+def _is_upstream_failure(error: Exception) -> bool:
+    """Bad requests are our fault; only overload and server errors trip the breaker."""
+    if isinstance(error, anthropic.APIStatusError):
+        return error.status_code >= 500 or error.status_code == 429
+    return True
+
 
 class BookAI:
     """
@@ -16,54 +164,221 @@ class BookAI:
 
     def __init__(self) -> None:
         config = Config()
-        self.client = anthropic.Anthropic(api_key=config.ANTHROPIC_API_KEY)
+        self.client = anthropic.Anthropic(
+            api_key=config.ANTHROPIC_API_KEY, timeout=config.AI_TIMEOUT_SECONDS
+        )
+        self.upstream = get_upstream(
+            "anthropic",
+            rate_per_second=config.AI_RATE_LIMIT,
+            capacity=config.AI_RATE_BURST,
+        )
+        # Cheapest model first; later tiers are only used on escalation
+        self.models = list(
+            dict.fromkeys([config.AI_FAST_MODEL, config.AI_STRONG_MODEL])
+        )
+        self.max_tokens = config.AI_MAX_TOKENS
+        # Interactive adds go first; background enrichment only starts while
+        # no add is waiting and the rate limiter has tokens to spare
+        self.background_reserve_tokens = config.AI_BACKGROUND_RESERVE_TOKENS
+        self.scheduler = PriorityScheduler(
+            {
+                "interactive": config.AI_INTERACTIVE_CONCURRENCY,
+                "background": config.AI_BACKGROUND_CONCURRENCY,
+            },
+            has_capacity=self._has_capacity,
+        )
+        # Models whose static prefix is marked for caching; a model is dropped
+        # once a response shows the marker isn't being honoured
+        self._cache_prefix: dict[str, bool] = {}
 
-    def get_book_details(self, book_title: str, book_author: str) -> dict:
+    def _caches_prefix(self, model: str) -> bool:
+        if model not in self._cache_prefix:
+            self._cache_prefix[model] = static_prefix_tokens() >= min_cacheable_tokens(
+                model
+            )
+        return self._cache_prefix[model]
+
+    def _has_capacity(self, lane: str) -> bool:
+        if lane == "interactive":
+            return True
+        return self.upstream.bucket.available >= self.background_reserve_tokens + 1
+
+    def get_book_details(
+        self,
+        book_title: str,
+        book_author: str,
+        fields: list[str] | None = None,
+        lane: str = "interactive",
+    ) -> dict:
         """
         Fetch rich metadata for a specific book using Claude AI.
 
+        The fast model is tried first; the request escalates to the next tier
+        when the answer is missing, invalid or marked low-confidence.
+
         Args:
             book_title (str): The title of the book.
             book_author (str): The author(s) of the book.
+            fields (list[str], optional): Only ask for these keys of FIELD_PROMPTS.
+                Defaults to all fields.
+            lane (str): Scheduler lane, "interactive" (user waiting) or
+                "background" (backfill). Defaults to "interactive".
 
         Returns:
             dict: A dictionary containing canonical title, authors, description,
                   region, subjects, and fiction/non-fiction status.
         """
-        prompt = f"""Provide detailed metadata for the book "{book_title}" by "{book_author}".
-Return a JSON object with:
-- "title": Full canonical title
-- "authors": List of author names
-- "description": A concise English summary (max 100 words). No markdown citations or source links.
-- "region": Up to 2 major regions/continents, comma-separated string
-- "subjects": List of 3 main genres/subjects
-- "is_fiction": Categorize as "Fiction" or "Non-Fiction"
+        with self.scheduler.slot(lane):
+            return self._get_book_details(book_title, book_author, fields)
 
-Data must be accurate. Description MUST be in English.
-Return ONLY valid JSON. No explanation."""
+    def _get_book_details(
+        self, book_title: str, book_author: str, fields: list[str] | None
+    ) -> dict:
+        requested = [f for f in (fields or FIELD_PROMPTS) if f in FIELD_PROMPTS]
+        prompt = (
+            f'Book: "{book_title}" by "{book_author}".\n'
+            f"Fields to fill in: {', '.join(requested)}."
+        )
+
+        fallback = {}
+        for tier, model in enumerate(self.models):
+            details, problem = self._request_details(model, prompt, requested)
+            if problem is None:
+                metrics.increment(f"ai.resolved.tier{tier}")
+                return details
+            if details:
+                # Low confidence but usable; keep it in case later tiers fail
+                fallback = details
+            if problem == "unavailable":
+                # Every tier shares the same upstream; escalating can't help
+                break
+            if tier + 1 < len(self.models):
+                logger.info(f"Escalating '{book_title}' from {model}: {problem}")
+                metrics.increment(f"ai.escalations.{problem}")
+
+        metrics.increment("ai.unresolved")
+        return fallback
+
+    def _request_details(
+        self, model: str, prompt: str, requested: list[str]
+    ) -> tuple[dict, str | None]:
+        """
+        Ask a single model for metadata through the record_book_metadata tool.
+
+        Returns:
+            tuple[dict, str | None]: The cleaned details and the reason they
+                should be escalated ("unavailable", "error", "no_tool_use",
+                "invalid", "low_confidence"), or None if they are good enough.
+        """
+        cached = self._caches_prefix(model)
+        system_block = {"type": "text", "text": SYSTEM_PROMPT}
+        if cached:
+            # Tools precede the system prompt, so this one breakpoint caches both
+            system_block["cache_control"] = {"type": "ephemeral"}
 
+        start = time.perf_counter()
         try:
-            response = self.client.messages.create(
-                model="claude-opus-4-6",
-                max_tokens=1024,
-                messages=[{"role": "user", "content": prompt}],
+            response = self.upstream.call(
+                lambda: self.client.messages.create(
+                    model=model,
+                    max_tokens=self.max_tokens,
+                    system=[system_block],
+                    tools=[METADATA_TOOL],
+                    tool_choice={"type": "tool", "name": METADATA_TOOL["name"]},
+                    messages=[{"role": "user", "content": prompt}],
+                ),
+                acquire_timeout=5.0,
+                is_failure=_is_upstream_failure,
             )
-            raw = response.content[0].text.strip()
-            json_str = self._clean_json(raw)
-            details = json.loads(json_str)
-            if "description" in details:
-                details["description"] = self._clean_description(details["description"])
-            return details
+        except UpstreamUnavailable as e:
+            logger.warning(f"Claude AI call rejected ({model}): {e}")
+            return {}, "unavailable"
         except Exception as e:
-            logger.error(f"Claude AI Error: {e}")
-            return {}
-
-    def _clean_json(self, raw_content: str) -> str:
-        """Extract and clean a JSON object string from the AI's response."""
-        content = raw_content.replace("```json", "").replace("```", "").strip()
-        start = content.find("{")
-        end = content.rfind("}") + 1
-        return content[start:end] if start != -1 and end != -1 else "{}"
+            logger.error(f"Claude AI Error ({model}): {e}")
+            metrics.increment(f"ai.errors.{model}")
+            return {}, "error"
+        finally:
+            metrics.observe(f"ai.latency.{model}", time.perf_counter() - start)
+
+        metrics.increment(f"ai.calls.{model}")
+        self._record_usage(response)
+        if cached:
+            self._check_cache_usage(model, response)
+
+        tool_input = next(
+            (
+                block.input
+                for block in response.content
+                if getattr(block, "type", None) == "tool_use"
+            ),
+            None,
+        )
+        if not isinstance(tool_input, dict):
+            return {}, "no_tool_use"
+
+        details = self._validate_details(tool_input, requested)
+        if details is None:
+            return {}, "invalid"
+        if tool_input.get("confidence") == "low":
+            return details, "low_confidence"
+        return details, None
+
+    def _validate_details(self, tool_input: dict, requested: list[str]) -> dict | None:
+        """
+        Keep the requested fields, returning None if any is missing or mistyped.
+        """
+        details = {}
+        for field in requested:
+            value = tool_input.get(field)
+            if not value or not isinstance(value, FIELD_TYPES[field]):
+                return None
+            if isinstance(value, list) and not all(
+                isinstance(item, str) and item for item in value
+            ):
+                return None
+            details[field] = value
+
+        if "is_fiction" in details and details["is_fiction"] not in (
+            "Fiction",
+            "Non-Fiction",
+        ):
+            return None
+        if "description" in details:
+            details["description"] = self._clean_description(details["description"])
+        return details
+
+    def _record_usage(self, response) -> None:
+        """Track token usage, including prompt cache hits."""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        for field in (
+            "input_tokens",
+            "output_tokens",
+            "cache_read_input_tokens",
+            "cache_creation_input_tokens",
+        ):
+            value = getattr(usage, field, None)
+            if isinstance(value, int):
+                metrics.increment(f"ai.tokens.{field}", value)
+
+    def _check_cache_usage(self, model: str, response) -> None:
+        """
+        Stop marking the prefix for caching if `model` neither wrote nor read
+        the cache, e.g. because the prefix is below its minimum after all.
+        """
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        cache_tokens = [
+            getattr(usage, field, None)
+            for field in ("cache_read_input_tokens", "cache_creation_input_tokens")
+        ]
+        if any(isinstance(value, int) and value > 0 for value in cache_tokens):
+            return
+        logger.warning(f"Prompt prefix is not being cached by {model}; not marking it")
+        metrics.increment(f"ai.cache_disabled.{model}")
+        self._cache_prefix[model] = False
 
     def _clean_description(self, text: str) -> str:
         """Remove citation markers (e.g., [1], [2]) from description text."""
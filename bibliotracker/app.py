@@ -1,14 +1,48 @@
+import asyncio
+import hashlib
+import html
+import json
 import logging
 import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from typing import Annotated
 
-from fastapi import Depends, FastAPI, Header, HTTPException, Query
-from fastapi.responses import HTMLResponse
+from fastapi import (
+    BackgroundTasks,
+    Depends,
+    FastAPI,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+)
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from bibliotracker.books.service import BookLookupService
+from bibliotracker.books.duplicates import DuplicateSweep
+from bibliotracker.books.similarity import SimilarityIndex
+from bibliotracker.cache import TTLCache
 from bibliotracker.config import Config
+from bibliotracker.events import EventBroker
+from bibliotracker.lazy import Lazy
+from bibliotracker.metrics import metrics
+from bibliotracker.passwords import hash_password, verify_password
+from bibliotracker.resilience import UpstreamUnavailable, upstreams_snapshot
 from bibliotracker.storage.client import PostgresClient
+from bibliotracker.storage.models import DEFAULT_LIST_ID, DEFAULT_LIST_SLUG, ReadingList
+from bibliotracker.storage.query import (
+    TIMELINE_PERIODS,
+    BookQuery,
+    timeline_buckets,
+)
+
+# Measured from import so the startup budget covers module loading too
+_import_started = time.perf_counter()
 
 # Configure logging
 logging.basicConfig(
@@ -18,7 +52,134 @@ logging.basicConfig(
 logging.getLogger("httpx").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+
+def _build_book_service():
+    # Imported here because the anthropic SDK alone takes ~1s to import
+    from bibliotracker.books.service import BookLookupService
+
+    return BookLookupService()
+
+
+# Initialize services (constructed on first use, closed on shutdown)
+config = Config()
+
+db_client = Lazy(lambda: PostgresClient(config))
+book_service = Lazy(_build_book_service)
+event_broker = EventBroker()
+# Description/subject vectors for "similar books" per list ID, loaded on first
+# use; an evicted list's index is rebuilt on its next query
+similar_books = TTLCache(max_size=64, ttl_seconds=3600)
+_similar_books_locks: dict[int, threading.Lock] = defaultdict(threading.Lock)
+_similar_books_locks_guard = threading.Lock()
+# Lists whose search suggestions are being loaded in the background
+_library_loads_pending: set[int] = set()
+_library_loads_lock = threading.Lock()
+# Latest near-duplicate report per list, refreshed by the periodic or
+# on-demand sweep
+duplicate_sweep = DuplicateSweep(db_client, config.DUPLICATE_SIMILARITY_THRESHOLD)
+
+
+def _warm_up() -> None:
+    """
+    Open database and Google Books connections and index the default list's
+    search suggestions ahead of the first request.
+    """
+    try:
+        db_client.warm_up(config.DB_WARM_CONNECTIONS)
+    except Exception as error:
+        logger.warning(f"Database warm-up failed: {error}")
+    try:
+        book_service.warm_up()
+    except Exception as error:
+        logger.warning(f"Google Books warm-up failed: {error}")
+    _load_library_suggestions(DEFAULT_LIST_ID)
+
+
+async def _backfill_metadata_periodically() -> None:
+    """
+    Re-enrich books with Unknown metadata every
+    ENRICHMENT_BACKFILL_INTERVAL_SECONDS, in the background AI lane.
+    """
+    # Imported here for the same reason as in _build_book_service
+    from bibliotracker.books.backfill import MetadataBackfill
+
+    backfill = None
+    while True:
+        await asyncio.sleep(config.ENRICHMENT_BACKFILL_INTERVAL_SECONDS)
+        try:
+            if backfill is None:
+                backfill = MetadataBackfill(
+                    db_client,
+                    book_service.ai,
+                    event_broker.publish,
+                    batch_size=config.ENRICHMENT_BACKFILL_BATCH,
+                    concurrency=config.AI_BACKGROUND_CONCURRENCY,
+                )
+            await asyncio.to_thread(backfill.run_once)
+        except Exception as error:
+            logger.warning(f"Metadata backfill failed: {error}")
+
+
+def _sweep_duplicates(list_id: int) -> None:
+    """
+    Rebuild one list's near-duplicate report, after `duplicate_sweep.start`.
+    """
+    try:
+        duplicate_sweep.run(list_id)
+    except Exception as error:
+        logger.warning(f"Duplicate sweep of list {list_id} failed: {error}")
+
+
+async def _sweep_duplicates_periodically() -> None:
+    """
+    Rebuild every list's near-duplicate report every
+    DUPLICATE_SWEEP_INTERVAL_SECONDS.
+    """
+    while True:
+        await asyncio.sleep(config.DUPLICATE_SWEEP_INTERVAL_SECONDS)
+        try:
+            for list_id in await asyncio.to_thread(db_client.get_list_ids):
+                if duplicate_sweep.start(list_id):
+                    await asyncio.to_thread(_sweep_duplicates, list_id)
+        except Exception as error:
+            logger.warning(f"Duplicate sweep failed: {error}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if config.WARM_ON_STARTUP:
+        # Runs in the background so readiness never waits on the network
+        warm_task = asyncio.create_task(asyncio.to_thread(_warm_up))
+    if config.ENRICHMENT_BACKFILL_INTERVAL_SECONDS > 0:
+        backfill_task = asyncio.create_task(_backfill_metadata_periodically())
+    if config.DUPLICATE_SWEEP_INTERVAL_SECONDS > 0:
+        sweep_task = asyncio.create_task(_sweep_duplicates_periodically())
+
+    startup_seconds = time.perf_counter() - _import_started
+    metrics.observe("startup", startup_seconds)
+    if startup_seconds > config.STARTUP_BUDGET_SECONDS:
+        logger.warning(
+            f"Startup took {startup_seconds:.3f}s, over the "
+            f"{config.STARTUP_BUDGET_SECONDS:.1f}s budget"
+        )
+    else:
+        logger.info(f"Startup completed in {startup_seconds:.3f}s")
+
+    yield
+
+    if config.WARM_ON_STARTUP:
+        await warm_task
+    if config.ENRICHMENT_BACKFILL_INTERVAL_SECONDS > 0:
+        backfill_task.cancel()
+    if config.DUPLICATE_SWEEP_INTERVAL_SECONDS > 0:
+        sweep_task.cancel()
+    event_broker.close()
+    for service in (book_service, db_client):
+        if isinstance(service, Lazy) and (instance := service.reset()):
+            instance.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Mount static files
 static_dir = os.path.join(os.path.dirname(__file__), "static")
@@ -26,11 +187,40 @@ if not os.path.exists(static_dir):
     os.makedirs(static_dir)
 app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
-# Initialize services
-config = Config()
+# Read endpoints whose JSON responses get an ETag for client revalidation
+ETAG_PATHS = ("/api/toread", "/api/books/", "/api/stats")
 
-db_client = PostgresClient(config)
-book_service = BookLookupService()
+
+@app.middleware("http")
+async def add_etag(request: Request, call_next) -> Response:
+    """
+    Tag read responses with a content hash and answer matching
+    If-None-Match requests with 304, so clients revalidating a cached page
+    don't download it again.
+    """
+    response = await call_next(request)
+    if (
+        request.method != "GET"
+        or response.status_code != 200
+        or not request.url.path.startswith(ETAG_PATHS)
+    ):
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = dict(response.headers)
+    headers["ETag"] = etag
+    headers["Cache-Control"] = "no-cache"
+    headers["Vary"] = "X-List"
+    if request.headers.get("if-none-match") == etag:
+        headers.pop("content-length", None)
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=body,
+        status_code=response.status_code,
+        headers=headers,
+        media_type=response.media_type,
+    )
 
 
 class BookSelection(BaseModel):
@@ -41,47 +231,361 @@ class BookSelection(BaseModel):
     is_owned: bool = False
 
 
-async def verify_admin(x_admin_password: str = Header(None)):
+# Upper bound on ids per bulk request, keeping each statement and event small
+MAX_BULK_BOOKS = 1000
+
+
+class BulkOwnershipUpdate(BaseModel):
+    book_ids: list[int] = Field(min_length=1, max_length=MAX_BULK_BOOKS)
+    is_owned: bool
+
+
+class BulkDelete(BaseModel):
+    book_ids: list[int] = Field(min_length=1, max_length=MAX_BULK_BOOKS)
+
+
+class BookMerge(BaseModel):
+    keep_id: int
+    duplicate_ids: list[int] = Field(min_length=1, max_length=MAX_BULK_BOOKS)
+
+
+class ListCreate(BaseModel):
+    slug: str = Field(pattern=r"^[a-z0-9][a-z0-9-]{0,63}$")
+    name: str = Field(min_length=1, max_length=200)
+    admin_password: str | None = Field(None, min_length=8)
+
+
+# Requests that name no list use the default one, without a database lookup
+DEFAULT_LIST = ReadingList(
+    id=DEFAULT_LIST_ID, slug=DEFAULT_LIST_SLUG, name="Reading list"
+)
+# Other lists by slug; every request resolves one, so skip the lookup
+list_cache = TTLCache(max_size=256, ttl_seconds=60)
+
+
+def _resolve_list(slug: str | None) -> ReadingList:
+    """
+    Return the reading list with `slug`, or the default list if it's empty.
+
+    Raises:
+        HTTPException: 404 if there is no such list.
+    """
+    if not slug or slug == DEFAULT_LIST_SLUG:
+        return DEFAULT_LIST
+    reading_list = list_cache.get(slug)
+    if reading_list is None:
+        reading_list = db_client.get_list(slug)
+        if reading_list is None:
+            raise HTTPException(status_code=404, detail=f"Unknown list '{slug}'")
+        list_cache.set(slug, reading_list)
+    return reading_list
+
+
+def current_list(
+    x_list: Annotated[str | None, Header()] = None,
+    list_slug: Annotated[str | None, Query(alias="list")] = None,
+) -> ReadingList:
+    """
+    Resolve the list a request is for from the X-List header, or the `list`
+    query parameter for clients that can't set headers (EventSource).
+    """
+    return _resolve_list(x_list or list_slug)
+
+
+CurrentList = Annotated[ReadingList, Depends(current_list)]
+
+
+def _is_admin(password: str | None, reading_list: ReadingList) -> bool:
+    """
+    Check `password` against the instance admin password, then against the
+    list's own one if it has one.
+    """
+    if password == config.ADMIN_PASSWORD:
+        return True
+    return bool(
+        password
+        and reading_list.admin_password_hash
+        and verify_password(password, reading_list.admin_password_hash)
+    )
+
+
+def verify_admin(reading_list: CurrentList, x_admin_password: str = Header(None)):
+    """
+    Verify the admin password provided in the header, which may be the
+    instance's or the current list's.
+    """
+    if not _is_admin(x_admin_password, reading_list):
+        raise HTTPException(status_code=401, detail="Invalid admin password")
+    return True
+
+
+def verify_instance_admin(x_admin_password: str = Header(None)):
     """
-    Verify the admin password provided in the header.
+    Verify the instance admin password, for settings that span every list.
     """
     if x_admin_password != config.ADMIN_PASSWORD:
         raise HTTPException(status_code=401, detail="Invalid admin password")
     return True
 
 
+BOOK_FORMATTERS = {
+    "id": lambda book: book.id,
+    "title": lambda book: book.title,
+    "author": lambda book: book.author,
+    "description": lambda book: book.description,
+    "region": lambda book: book.region,
+    "subjects": lambda book: book.subjects.split(", ") if book.subjects else [],
+    "is_fiction": lambda book: book.is_fiction or "Unknown",
+    "is_owned": lambda book: book.is_owned or False,
+}
+
+
+def format_book(book_record, fields: list[str] | None = None) -> dict:
+    """
+    Convert a Book record into the JSON shape used by the frontend.
+
+    Args:
+        book_record: The Book to format.
+        fields (list[str], optional): Keys to include. Columns that were not
+            loaded must be left out, since they can't be fetched once the
+            session is closed. Defaults to all keys.
+    """
+    return {
+        name: formatter(book_record)
+        for name, formatter in BOOK_FORMATTERS.items()
+        if fields is None or name in fields
+    }
+
+
+# Keys the list cards need; the description is fetched by the details modal
+LIST_FIELDS = "title,author,region,subjects,is_fiction,is_owned"
+LIST_PAGE_SIZE = 12
+BOOK_CHANGE_EVENTS = {
+    "book_added",
+    "book_updated",
+    "book_deleted",
+    "books_updated",
+    "books_deleted",
+}
+
+# index.html per list ID, with the list's first page of books inlined
+first_page_cache = TTLCache(max_size=256, ttl_seconds=config.SSR_CACHE_SECONDS)
+
+
+def _invalidate_first_page(event_type: str, data: dict) -> None:
+    if event_type in BOOK_CHANGE_EVENTS:
+        first_page_cache.pop(data["list_id"])
+
+
+event_broker.add_listener(_invalidate_first_page)
+
+
+def render_index(template: str, reading_list: ReadingList = DEFAULT_LIST) -> str:
+    """
+    Inline the first page of a list's default view into index.html.
+
+    The page is embedded as JSON that script.js renders instead of fetching
+    `/api/toread`. It holds no admin-specific state, so one rendered copy
+    serves every visitor of the list.
+
+    Args:
+        template (str): The contents of index.html.
+        reading_list (ReadingList): The list to render. Defaults to the
+            default list.
+
+    Returns:
+        str: The document with the initial state, or `template` unchanged if
+            the books could not be loaded.
+    """
+    try:
+        initial_state = get_toread(
+            reading_list,
+            page_number=1,
+            page_size=LIST_PAGE_SIZE,
+            fields=LIST_FIELDS,
+            include_facets=True,
+        )
+    except Exception as error:
+        logger.warning(f"Serving index.html without initial state: {error}")
+        return template
+
+    # "</" would let a book title close the script element early
+    payload = json.dumps(initial_state).replace("</", "<\\/")
+    state_tag = (
+        f'<script id="initialState" type="application/json">{payload}</script>\n    '
+    )
+    return template.replace(
+        '<script src="/static/script.js',
+        state_tag + '<script src="/static/script.js',
+        1,
+    )
+
+
+def _serve_index(reading_list: ReadingList) -> HTMLResponse | str:
+    """
+    Return index.html for a list, naming the list for script.js and, with
+    SSR_FIRST_PAGE enabled, with its first page of books inlined.
+    """
+    cached = first_page_cache.get(reading_list.id)
+    if cached is not None:
+        return cached
+
+    index_path = os.path.join(static_dir, "index.html")
+    if not os.path.exists(index_path):
+        return "<h1>Frontend not found. Please create static/index.html</h1>"
+    with open(index_path, "r") as f:
+        document = f.read()
+    if reading_list.id != DEFAULT_LIST_ID:
+        slug = html.escape(reading_list.slug)
+        document = document.replace(
+            "</head>", f'    <meta name="list" content="{slug}">\n</head>', 1
+        )
+    if config.SSR_FIRST_PAGE:
+        document = render_index(document, reading_list)
+        first_page_cache.set(reading_list.id, document)
+    return document
+
+
 @app.get("/", response_class=HTMLResponse, response_model=None)
-async def read_root() -> HTMLResponse | str:
+def read_root() -> HTMLResponse | str:
     """
-    Serve the main frontend application.
+    Serve the main frontend application for the default list.
+
+    With SSR_FIRST_PAGE enabled, the first page of books is inlined so the
+    list renders without a follow-up API request.
 
     Returns:
         The content of index.html if it exists, otherwise a simple Error message.
     """
-    index_path = os.path.join(static_dir, "index.html")
-    if os.path.exists(index_path):
-        with open(index_path, "r") as f:
-            return f.read()
-    return "<h1>Frontend not found. Please create static/index.html</h1>"
+    return _serve_index(DEFAULT_LIST)
+
+
+@app.get("/lists/{slug}", response_class=HTMLResponse, response_model=None)
+def read_list(slug: str) -> HTMLResponse | str:
+    """
+    Serve the frontend application for the list with `slug`.
+
+    Raises:
+        HTTPException: 404 if there is no such list.
+    """
+    return _serve_index(_resolve_list(slug))
+
+
+def _load_library_suggestions(list_id: int) -> None:
+    """
+    Index a list's titles and authors for local search suggestions, once per
+    service instance.
+    """
+    index = book_service.autocomplete
+    try:
+        if not index.library_loaded(list_id):
+            books = db_client.iter_books(
+                BookQuery(sort="oldest", fields=["title", "author"], list_id=list_id)
+            )
+            index.load_library(
+                ((book.id, book.title, book.author) for book in books), list_id
+            )
+    except Exception as error:
+        logger.warning(f"Could not load library suggestions: {error}")
+    finally:
+        with _library_loads_lock:
+            _library_loads_pending.discard(list_id)
+
+
+def _schedule_library_suggestions(
+    list_id: int, background_tasks: BackgroundTasks
+) -> None:
+    """
+    Load a list's suggestions after the current response, unless they are
+    loaded or already loading; searches until then are answered remotely.
+    """
+    if book_service.autocomplete.library_loaded(list_id):
+        return
+    with _library_loads_lock:
+        if list_id in _library_loads_pending:
+            return
+        _library_loads_pending.add(list_id)
+    background_tasks.add_task(_load_library_suggestions, list_id)
+
+
+def _update_library_suggestions(event_type: str, data: dict) -> None:
+    # Before the service exists there is nothing to update; it loads on first search
+    if isinstance(book_service, Lazy) and not book_service.initialized:
+        return
+    if event_type == "book_added":
+        book_service.autocomplete.add_library_book(
+            data["id"], data["title"], data["author"], data["list_id"]
+        )
+    elif event_type == "book_deleted":
+        book_service.autocomplete.remove_library_book(data["id"], data["list_id"])
+    elif event_type == "books_deleted":
+        for book_id in data["ids"]:
+            book_service.autocomplete.remove_library_book(book_id, data["list_id"])
+
+
+event_broker.add_listener(_update_library_suggestions)
+
+
+def _library_titles(results: list[dict], list_id: int) -> set[str]:
+    """
+    Look up which result titles are already on the list, in one query per page.
+    """
+    titles = [
+        book["title"]
+        for book in results
+        if book.get("title") and not book.get("in_library")
+    ]
+    try:
+        return db_client.get_existing_titles(titles, list_id)
+    except Exception as error:
+        # Search still works without the annotation; /api/add rejects duplicates
+        logger.warning(f"Could not check search results against the list: {error}")
+        return set()
 
 
 @app.get("/api/search")
 def search_books(
-    query_string: str = Query(..., alias="q"), page: int = Query(1, alias="page")
+    reading_list: CurrentList,
+    background_tasks: BackgroundTasks,
+    query_string: str = Query(..., alias="q"),
+    page: int = Query(1, alias="page"),
+    remote: bool = Query(False, alias="remote"),
+    aggregate: bool = Query(False, alias="aggregate"),
 ) -> list[dict]:
     """
-    Search for books using the OpenLibrary service.
+    Search for books, answering from local suggestions when there are enough.
 
     Args:
+        reading_list (ReadingList): The list whose books are flagged `in_library`.
+        background_tasks (BackgroundTasks): Loads the list's suggestions on
+            its first search.
         query_string (str): The search query provided by the user.
         page (int): Page number for pagination.
+        remote (bool): Always query Google Books, skipping local suggestions.
+        aggregate (bool): Fill each page from SEARCH_AGGREGATE_PAGES Google
+            Books pages fetched concurrently, with duplicate editions removed.
 
     Returns:
         list[dict]: A list of formatted book objects for the frontend.
     """
     if not query_string:
         return []
-    raw_results, _ = book_service.search_books(query_string, page_number=page)
+    _schedule_library_suggestions(reading_list.id, background_tasks)
+    try:
+        raw_results, _ = book_service.search_books(
+            query_string,
+            page_number=page,
+            remote=remote,
+            aggregate_pages=config.SEARCH_AGGREGATE_PAGES if aggregate else 1,
+            list_id=reading_list.id,
+        )
+    except UpstreamUnavailable as error:
+        logger.warning(f"Search rejected: {error}")
+        raise HTTPException(
+            status_code=503, detail="Book search is temporarily unavailable."
+        )
+
+    library_titles = _library_titles(raw_results, reading_list.id)
 
     # Format for frontend
     # Frontend expects authors to be a string, and sends it back as authors_str
@@ -99,6 +603,9 @@ def search_books(
                 "authors": authors_str,
                 "key": book.get("key"),
                 "subjects": book.get("subjects", []),
+                "source": book.get("source", "google"),
+                "in_library": book.get("in_library", False)
+                or (book.get("title") or "").lower() in library_titles,
             }
         )
 
@@ -111,39 +618,172 @@ def search_books(
 @app.post("/api/verify-admin", dependencies=[Depends(verify_admin)])
 def verify_admin_status() -> dict:
     """
-    Verify if the provided admin password is correct.
+    Verify if the provided admin password is correct for the current list.
     """
     return {"status": "ok"}
 
 
+@app.get("/api/lists/current")
+def get_current_list(reading_list: CurrentList) -> dict:
+    """
+    Return the list a request is for (see `current_list`).
+    """
+    return {"id": reading_list.id, "slug": reading_list.slug, "name": reading_list.name}
+
+
+@app.post("/api/lists", dependencies=[Depends(verify_instance_admin)])
+def create_list(list_create: ListCreate) -> dict:
+    """
+    Create a new, empty reading list. Instance admin only.
+
+    With an `admin_password`, that password also unlocks admin actions on the
+    new list (and only on it); the instance admin password always does.
+
+    Raises:
+        HTTPException: 409 if the slug is taken.
+    """
+    password_hash = (
+        hash_password(list_create.admin_password)
+        if list_create.admin_password
+        else None
+    )
+    reading_list = db_client.create_list(
+        list_create.slug, list_create.name, password_hash
+    )
+    if reading_list is None:
+        raise HTTPException(
+            status_code=409, detail=f"List '{list_create.slug}' already exists."
+        )
+    return {"id": reading_list.id, "slug": reading_list.slug, "name": reading_list.name}
+
+
+@app.get("/api/metrics", dependencies=[Depends(verify_instance_admin)])
+def get_metrics() -> dict:
+    """
+    Return in-process counters and timings (AI tiers, token usage, upstream
+    circuit breakers, etc.). Admin only.
+    """
+    return {**metrics.snapshot(), "upstreams": upstreams_snapshot()}
+
+
+@app.get("/api/admin/pool", dependencies=[Depends(verify_instance_admin)])
+def get_pool_stats() -> dict:
+    """
+    Return database connection pool occupancy and checkout wait times. Admin only.
+    """
+    return db_client.pool_stats()
+
+
+# Outcomes a retry with the same Idempotency-Key gets replayed; anything else
+# (enrichment or database failures) is released so the retry runs again
+REPLAYED_STATUS_CODES = (200, 409)
+
+
 @app.post("/api/add")
-def add_book(selection: BookSelection, x_admin_password: str = Header(None)) -> dict:
+def add_book(
+    selection: BookSelection,
+    reading_list: CurrentList,
+    x_admin_password: str = Header(None),
+    idempotency_key: str | None = Header(None, max_length=255),
+) -> dict:
     """
     Add a selected book to the to-read list. Fetches rich metadata using AI.
 
+    With an `Idempotency-Key` header, repeats of the request return the
+    original outcome instead of enriching the book again.
+
     Args:
         selection (BookSelection): The book selected by the user from search results.
+        reading_list (ReadingList): The list to add it to.
+        idempotency_key (str, optional): Client-generated key shared by retries.
 
     Returns:
         dict: A success message and status.
 
     Raises:
-        HTTPException: If book details cannot be fetched or DB addition fails.
+        HTTPException: If book details cannot be fetched or DB addition fails,
+            the key is still in use by a running request (409), or the key was
+            used for a different request (422).
     """
     logger.info(f"Adding book: {selection.title}")
 
     # Security Check: Only admins can set is_owned
     if selection.is_owned:
-        if x_admin_password != config.ADMIN_PASSWORD:
+        if not _is_admin(x_admin_password, reading_list):
             logger.warning("Unauthorized attempt to set is_owned. defaulting to False.")
             selection.is_owned = False
 
-    # Fetch details via AI (single source of truth now)
-    # We assume 'authors_str' is passed, or we can use the author list from search result if available.
-    # The BookSelection model might need adjustment, but for now we'll use what we have.
-    # key in BookSelection might be the AI generated key or title-author slug.
+    if not idempotency_key:
+        return _add_selection(selection, reading_list.id)
 
-    details = book_service.get_book_metadata(selection.title, selection.authors_str)
+    # The same selection on another list is a different request
+    request_body = f"{reading_list.id}:{selection.model_dump_json()}"
+    request_hash = hashlib.sha256(request_body.encode()).hexdigest()
+    previous = db_client.claim_idempotency_key(
+        idempotency_key,
+        request_hash,
+        config.IDEMPOTENCY_KEY_TTL_SECONDS,
+        config.IDEMPOTENCY_LEASE_SECONDS,
+    )
+    if previous is not None:
+        if previous["request_hash"] != request_hash:
+            raise HTTPException(
+                status_code=422,
+                detail="Idempotency-Key was already used for a different request.",
+            )
+        if previous["status_code"] is None:
+            raise HTTPException(
+                status_code=409,
+                detail="A request with this Idempotency-Key is still in progress.",
+            )
+        metrics.increment("add.idempotent_replays")
+        if previous["status_code"] == 200:
+            return previous["response"]
+        raise HTTPException(
+            status_code=previous["status_code"], detail=previous["response"]["detail"]
+        )
+
+    try:
+        result = _add_selection(selection, reading_list.id)
+    except HTTPException as error:
+        if error.status_code in REPLAYED_STATUS_CODES:
+            db_client.complete_idempotency_key(
+                idempotency_key, error.status_code, {"detail": error.detail}
+            )
+        else:
+            db_client.release_idempotency_key(idempotency_key)
+        raise
+    except Exception:
+        db_client.release_idempotency_key(idempotency_key)
+        raise
+    db_client.complete_idempotency_key(idempotency_key, 200, result)
+    return result
+
+
+def _add_selection(selection: BookSelection, list_id: int) -> dict:
+    """
+    Enrich `selection` and store it on list `list_id`, publishing a
+    book_added event.
+
+    Raises:
+        HTTPException: If the book is already listed (409), details cannot be
+            fetched (404), or the database write fails (500).
+    """
+    # Reject known duplicates before paying for enrichment
+    if selection.title.lower() in db_client.get_existing_titles(
+        [selection.title], list_id
+    ):
+        raise HTTPException(
+            status_code=409,
+            detail=f"'{selection.title}' is already in your reading list.",
+        )
+
+    # Fetch details from the selected Google Books volume, filling gaps via AI.
+    # book_key is the Google Books ID of the search result.
+
+    details = book_service.get_book_metadata(
+        selection.title, selection.authors_str, book_key=selection.book_key
+    )
 
     if not details:
         raise HTTPException(status_code=404, detail="Could not fetch book details.")
@@ -164,9 +804,16 @@ def add_book(selection: BookSelection, x_admin_password: str = Header(None)) ->
         book_subjects=details.get("subjects") or [],
         is_fiction_category=details.get("is_fiction") or "Unknown",
         is_owned=selection.is_owned,
+        list_id=list_id,
     )
 
     if added:
+        new_book = db_client.get_book_by_title(ai_title, list_id)
+        if new_book:
+            book = {**format_book(new_book), "list_id": list_id}
+            event_broker.publish("book_added", book)
+            # The persisted book with its enriched fields, patched in by id
+            event_broker.publish("enrichment_completed", book)
         return {"status": "success", "message": msg}
     elif "already in your reading list" in msg:
         raise HTTPException(status_code=409, detail=msg)
@@ -175,103 +822,432 @@ def add_book(selection: BookSelection, x_admin_password: str = Header(None)) ->
         raise HTTPException(status_code=500, detail=msg)
 
 
-@app.patch("/api/books/{book_id}")
-async def update_book_status(
-    book_id: int,
-    status_update: dict,
-    x_admin_password: str = Header(None),
+@app.patch("/api/books/{book_id}", dependencies=[Depends(verify_admin)])
+def update_book_status(
+    book_id: int, status_update: dict, reading_list: CurrentList
 ) -> dict:
     """
     Update the ownership status of a book. Admin only.
     """
-    await verify_admin(x_admin_password)
-
     is_owned = status_update.get("is_owned")
     if is_owned is None:
         raise HTTPException(status_code=400, detail="Missing is_owned field")
 
-    success = db_client.update_book_ownership(book_id, is_owned)
+    success = db_client.update_book_ownership(book_id, is_owned, reading_list.id)
     if not success:
         raise HTTPException(status_code=404, detail="Book not found")
 
+    event_broker.publish(
+        "book_updated",
+        {"id": book_id, "is_owned": bool(is_owned), "list_id": reading_list.id},
+    )
     return {"status": "success", "message": "Book status updated"}
 
 
-@app.delete("/api/books/{book_id}")
-async def delete_book_endpoint(
+@app.post("/api/books/bulk-update", dependencies=[Depends(verify_admin)])
+def bulk_update_book_status(
+    bulk_update: BulkOwnershipUpdate, reading_list: CurrentList
+) -> dict:
+    """
+    Set the ownership status of many books in one transaction. Admin only.
+
+    Returns:
+        dict: The IDs that were updated; unknown IDs are skipped.
+    """
+    updated = db_client.update_books_ownership(
+        bulk_update.book_ids, bulk_update.is_owned, reading_list.id
+    )
+    if updated:
+        event_broker.publish(
+            "books_updated",
+            {
+                "ids": updated,
+                "is_owned": bulk_update.is_owned,
+                "list_id": reading_list.id,
+            },
+        )
+    return {
+        "status": "success",
+        "message": f"Updated {len(updated)} books",
+        "ids": updated,
+    }
+
+
+@app.post("/api/books/bulk-delete", dependencies=[Depends(verify_admin)])
+def bulk_delete_books(bulk_delete: BulkDelete, reading_list: CurrentList) -> dict:
+    """
+    Delete many books in one transaction. Admin only.
+
+    Returns:
+        dict: The IDs that were deleted; unknown IDs are skipped.
+    """
+    deleted = db_client.delete_books(bulk_delete.book_ids, reading_list.id)
+    if deleted:
+        event_broker.publish(
+            "books_deleted", {"ids": deleted, "list_id": reading_list.id}
+        )
+    return {
+        "status": "success",
+        "message": f"Deleted {len(deleted)} books",
+        "ids": deleted,
+    }
+
+
+def _duplicate_report(report: dict | None, list_id: int) -> dict:
+    """
+    Expand a sweep report's book IDs into list fields, dropping books deleted
+    (or merged) since the sweep and clusters with fewer than two left.
+    """
+    running = list_id in duplicate_sweep.running
+    if report is None:
+        return {
+            "clusters": [],
+            "books_scanned": 0,
+            "generated_at": None,
+            "running": running,
+        }
+    ids = [book_id for cluster in report["clusters"] for book_id in cluster["ids"]]
+    books = {
+        book.id: format_book(book, ["id", *LIST_FIELDS.split(",")])
+        for book in db_client.get_books_by_ids(ids, list_id)
+    }
+    clusters = []
+    for cluster in report["clusters"]:
+        members = [books[i] for i in cluster["ids"] if i in books]
+        if len(members) > 1:
+            clusters.append({"books": members, "similarity": cluster["similarity"]})
+    return {**report, "clusters": clusters, "running": running}
+
+
+@app.get("/api/admin/duplicates", dependencies=[Depends(verify_admin)])
+def get_duplicates(reading_list: CurrentList) -> dict:
+    """
+    Return the list's latest near-duplicate report. Admin only.
+
+    Returns:
+        dict: "clusters" of likely duplicates, each with its "books" and the
+            lowest estimated "similarity" between them, plus "books_scanned",
+            "duration_seconds" and "generated_at" of the sweep (None if none
+            has run yet), and whether a new sweep is "running".
+    """
+    return _duplicate_report(
+        duplicate_sweep.reports.get(reading_list.id), reading_list.id
+    )
+
+
+@app.post(
+    "/api/admin/duplicates/sweep",
+    status_code=202,
+    dependencies=[Depends(verify_admin)],
+)
+def sweep_duplicates(
+    reading_list: CurrentList, background_tasks: BackgroundTasks
+) -> dict:
+    """
+    Start a near-duplicate sweep over every book of the list in the
+    background. Admin only.
+
+    Poll `GET /api/admin/duplicates` until "running" is false for the report.
+
+    Returns:
+        dict: "started", False if a sweep of this list was already running.
+    """
+    started = duplicate_sweep.start(reading_list.id)
+    if started:
+        background_tasks.add_task(_sweep_duplicates, reading_list.id)
+    return {"started": started}
+
+
+@app.post("/api/books/merge", dependencies=[Depends(verify_admin)])
+def merge_books(book_merge: BookMerge, reading_list: CurrentList) -> dict:
+    """
+    Merge duplicates into one book and delete them. Admin only.
+
+    The kept book fills its missing metadata from the duplicates and becomes
+    owned if any of them was.
+
+    Returns:
+        dict: The kept "book" and the "ids" that were merged into it.
+
+    Raises:
+        HTTPException: 404 if the book to keep isn't on the list.
+    """
+    merged = db_client.merge_books(
+        book_merge.keep_id, book_merge.duplicate_ids, reading_list.id
+    )
+    if merged is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    kept, merged_ids = merged
+    book = format_book(kept)
+    if merged_ids:
+        event_broker.publish(
+            "books_deleted", {"ids": merged_ids, "list_id": reading_list.id}
+        )
+        event_broker.publish("book_updated", {**book, "list_id": reading_list.id})
+    return {
+        "status": "success",
+        "message": f"Merged {len(merged_ids)} books into '{kept.title}'",
+        "book": book,
+        "ids": merged_ids,
+    }
+
+
+@app.get("/api/books/{book_id}")
+def get_book(book_id: int, reading_list: CurrentList) -> dict:
+    """
+    Return every field of one book, including the full description.
+    """
+    book_record = db_client.get_book(book_id, reading_list.id)
+    if book_record is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    return format_book(book_record)
+
+
+def _load_similar_books(list_id: int) -> SimilarityIndex:
+    """
+    Return the list's similarity index, building it from every book's
+    description and subjects if needed.
+
+    Builds hold the list's lock, so concurrent first queries share one build.
+    """
+    with _similar_books_locks_guard:
+        lock = _similar_books_locks[list_id]
+    with lock:
+        index = similar_books.get(list_id)
+        if index is None:
+            index = SimilarityIndex()
+            similar_books.set(list_id, index)
+        if not index.loaded:
+            books = db_client.iter_books(
+                BookQuery(
+                    sort="oldest", fields=["description", "subjects"], list_id=list_id
+                )
+            )
+            index.load(
+                (book.id, book.description, BOOK_FORMATTERS["subjects"](book))
+                for book in books
+            )
+    return index
+
+
+def _update_similar_books(event_type: str, data: dict) -> None:
+    # Until the list's first query there is nothing to update; the load picks it up
+    index = similar_books.get(data["list_id"])
+    if index is None or not index.loaded:
+        return
+    if event_type == "book_added":
+        index.add_book(data["id"], data.get("description"), data["subjects"])
+    elif event_type == "book_deleted":
+        index.remove_book(data["id"])
+    elif event_type == "books_deleted":
+        for book_id in data["ids"]:
+            index.remove_book(book_id)
+    elif event_type == "book_updated" and "description" in data:
+        # Full books, e.g. after a merge, can be re-indexed in place
+        index.add_book(data["id"], data["description"], data["subjects"])
+    elif event_type == "book_updated" and "subjects" in data:
+        # The event lacks the description, so rebuild on the next query
+        index.invalidate()
+
+
+event_broker.add_listener(_update_similar_books)
+
+
+@app.get("/api/books/{book_id}/similar")
+def get_similar_books(
     book_id: int,
-    x_admin_password: str = Header(None),
+    reading_list: CurrentList,
+    limit: Annotated[int, Query(ge=1, le=20)] = 5,
 ) -> dict:
     """
-    Delete a book from the list. Admin only.
+    Return the books whose descriptions and subjects are most like this one's.
+
+    Args:
+        book_id (int): The book to find neighbours for.
+        limit (int): Max number of books to return (1-20).
+
+    Returns:
+        dict: "items" with the list fields of each book plus its "score"
+            (cosine similarity, 0-1), most similar first.
     """
-    await verify_admin(x_admin_password)
+    index = _load_similar_books(reading_list.id)
+    try:
+        neighbours = index.similar(book_id, limit)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Book not found")
+    scores = dict(neighbours)
+    books = db_client.get_books_by_ids(list(scores), reading_list.id)
+    return {
+        "items": [
+            {
+                **format_book(book, ["id", *LIST_FIELDS.split(",")]),
+                "score": scores[book.id],
+            }
+            for book in books
+        ]
+    }
+
 
-    success = db_client.delete_book(book_id)
+@app.delete("/api/books/{book_id}", dependencies=[Depends(verify_admin)])
+def delete_book_endpoint(book_id: int, reading_list: CurrentList) -> dict:
+    """
+    Delete a book from the list. Admin only.
+    """
+    success = db_client.delete_book(book_id, reading_list.id)
     if not success:
         raise HTTPException(
             status_code=404, detail="Book not found or could not be deleted"
         )
 
+    event_broker.publish("book_deleted", {"id": book_id, "list_id": reading_list.id})
     return {"status": "success", "message": "Book deleted successfully"}
 
 
 @app.get("/api/stats")
-async def get_stats() -> dict:
+def get_stats(reading_list: CurrentList) -> dict:
+    """
+    Get aggregated statistics of the list for charts.
+    """
+    return db_client.get_stats(reading_list.id)
+
+
+@app.get("/api/stats/timeline")
+def get_stats_timeline(
+    reading_list: CurrentList,
+    period: Annotated[str, Query()] = "week",
+    periods: Annotated[int, Query(ge=1, le=104)] = 26,
+) -> dict:
+    """
+    Count books added and marked owned per week or month, grouped in SQL.
+
+    Args:
+        period (str): "week" (starting Monday) or "month".
+        periods (int): Number of periods up to the current one (1-104).
+
+    Returns:
+        dict: "buckets" (period start dates) with parallel "added" and "owned"
+            count series, plus "total_before" and "owned_before" to start
+            cumulative totals from.
+
+    Raises:
+        HTTPException: 400 if the period is unknown.
+    """
+    if period not in TIMELINE_PERIODS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown period '{period}', expected one of {list(TIMELINE_PERIODS)}",
+        )
+    buckets = timeline_buckets(period, periods, datetime.now(UTC).date())
+    first = buckets[0]
+    timeline = db_client.get_timeline(
+        period,
+        datetime(first.year, first.month, first.day, tzinfo=UTC),
+        reading_list.id,
+    )
+    return {
+        "period": period,
+        "buckets": [bucket.isoformat() for bucket in buckets],
+        "added": [timeline["added"].get(bucket, 0) for bucket in buckets],
+        "owned": [timeline["owned"].get(bucket, 0) for bucket in buckets],
+        "total_before": timeline["total_before"],
+        "owned_before": timeline["owned_before"],
+    }
+
+
+@app.get("/api/events")
+def stream_events(reading_list: CurrentList) -> StreamingResponse:
     """
-    Get aggregated statistics for charts.
+    Push book added/removed/ownership-changed and enrichment events of the list
+    to the UI.
     """
-    return db_client.get_stats()
+    return StreamingResponse(
+        event_broker.stream(reading_list.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.get("/api/toread")
 def get_toread(
-    page_number: int = Query(1, alias="page"),
-    page_size: int = Query(12, alias="size"),
-    filter_fiction: str | None = Query(None, alias="fiction"),
-    filter_owned: bool | None = Query(None, alias="owned"),
+    reading_list: CurrentList,
+    page_number: Annotated[int, Query(alias="page")] = 1,
+    page_size: Annotated[int, Query(alias="size")] = 12,
+    filter_fiction: Annotated[str | None, Query(alias="fiction")] = None,
+    filter_owned: Annotated[bool | None, Query(alias="owned")] = None,
+    filter_subject: Annotated[str | None, Query(alias="subject")] = None,
+    filter_author: Annotated[str | None, Query(alias="author")] = None,
+    filter_region: Annotated[str | None, Query(alias="region")] = None,
+    sort: Annotated[str, Query()] = "added",
+    fields: Annotated[str | None, Query()] = None,
+    cursor: Annotated[str | None, Query()] = None,
+    include_facets: Annotated[bool, Query(alias="facets")] = False,
 ) -> dict:
     """
-    Retrieve a paginated list of books from the to-read list.
+    Retrieve a filtered, sorted, paginated list of books from the to-read list.
 
     Args:
+        reading_list (ReadingList): The list to read.
         page_number (int): The page number to fetch. Defaults to 1.
         page_size (int): The number of items per page. Defaults to 12.
         filter_fiction (str, optional): Filter by "Fiction" or "Non-Fiction".
         filter_owned (bool, optional): Filter by ownership status.
+        filter_subject (str, optional): Case-insensitive subject substring.
+        filter_author (str, optional): Case-insensitive author substring.
+        filter_region (str, optional): Case-insensitive region substring.
+        sort (str): "added" (newest first), "oldest", "title" or "author".
+        fields (str, optional): Comma-separated keys to return for each book,
+            e.g. "title,author". "id" is always included. Defaults to all keys.
+        cursor (str, optional): Switches to cursor (keyset) pagination: pass an
+            empty cursor for the first page, then the returned "next_cursor".
+            `page` is ignored in this mode.
+        include_facets (bool): Also return unfiltered counts for every filter bar
+            facet under "facets". Defaults to False.
 
     Returns:
         dict: Paginated results including items, total count, and pagination metadata.
+
+    Raises:
+        HTTPException: 400 if the sort key, a field or the cursor is invalid, or
+            a search term is too short.
     """
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    try:
+        book_query = BookQuery(
+            fiction=filter_fiction,
+            owned=filter_owned,
+            subject=filter_subject,
+            author=filter_author,
+            region=filter_region,
+            sort=sort,
+            fields=field_list,
+            list_id=reading_list.id,
+        )
+        after = book_query.decode_cursor(cursor) if cursor else None
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
     skip = (page_number - 1) * page_size
     books = db_client.get_all_books(
         skip_records=skip,
         limit_records=page_size,
-        filter_fiction=filter_fiction,
-        filter_owned=filter_owned,
+        book_query=book_query,
+        after=after,
     )
-    total = db_client.get_total_count(filter_fiction=filter_fiction, filter_owned=filter_owned)
+    total = db_client.get_total_count(book_query=book_query)
 
-    formatted = []
-    for book_record in books:
-        formatted.append(
-            {
-                "id": book_record.id,
-                "title": book_record.title,
-                "author": book_record.author,
-                "description": book_record.description,
-                "region": book_record.region,
-                "subjects": book_record.subjects.split(", ")
-                if book_record.subjects
-                else [],
-                "is_fiction": book_record.is_fiction or "Unknown",
-                "is_owned": book_record.is_owned or False,
-            }
-        )
-    return {
+    formatted = [format_book(book_record, book_query.fields) for book_record in books]
+    response = {
         "items": formatted,
         "total": total,
         "page": page_number,
         "size": page_size,
         "total_pages": (total + page_size - 1) // page_size,
     }
+    if cursor is not None:
+        full_page = books and len(books) == page_size
+        response["next_cursor"] = (
+            book_query.encode_cursor(books[-1]) if full_page else None
+        )
+    if include_facets:
+        response["facets"] = db_client.get_facet_counts(reading_list.id)
+    return response
@@ -0,0 +1,249 @@
+import bisect
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from bibliotracker.config import Config
+from bibliotracker.storage.models import DEFAULT_LIST_ID
+
+# Leading articles are also indexed without, so "hob" finds "The Hobbit"
+ARTICLES = ("the ", "a ", "an ")
+
+
+def normalize(text: str) -> str:
+    """
+    Lowercase `text`, drop punctuation and collapse whitespace.
+    """
+    return " ".join(re.sub(r"[^\w\s]", " ", text.casefold()).split())
+
+
+def _terms_for(entry: dict) -> set[str]:
+    terms = set()
+    title = normalize(entry["title"])
+    terms.add(title)
+    for article in ARTICLES:
+        if title.startswith(article):
+            terms.add(title[len(article) :])
+    for author in entry["authors"]:
+        name = normalize(author)
+        if name:
+            terms.add(name)
+            terms.add(name.split()[-1])
+    terms.discard("")
+    return terms
+
+
+class _PrefixIndex:
+    """
+    Entries and their terms in a sorted list, so a prefix lookup is a binary
+    search followed by a scan of the matching run. Not thread-safe.
+    """
+
+    def __init__(self) -> None:
+        self.terms: list[tuple[str, str]] = []  # (normalized term, entry id)
+        self.entries: dict[str, dict] = {}
+        self.loaded = False
+
+    def insert(self, entry_id: str, entry: dict) -> None:
+        self.remove(entry_id)
+        self.entries[entry_id] = entry
+        for term in _terms_for(entry):
+            bisect.insort(self.terms, (term, entry_id))
+
+    def remove(self, entry_id: str) -> None:
+        entry = self.entries.pop(entry_id, None)
+        if entry is None:
+            return
+        for term in _terms_for(entry):
+            position = bisect.bisect_left(self.terms, (term, entry_id))
+            if self.terms[position : position + 1] == [(term, entry_id)]:
+                del self.terms[position]
+
+    def replace(self, entries: dict[str, dict]) -> None:
+        # One sort instead of an insort per term, which is quadratic
+        self.terms = sorted(
+            (term, entry_id)
+            for entry_id, entry in entries.items()
+            for term in _terms_for(entry)
+        )
+        self.entries = entries
+
+    def matches(self, prefix: str) -> set[str]:
+        found = set()
+        position = bisect.bisect_left(self.terms, (prefix, ""))
+        while position < len(self.terms):
+            term, entry_id = self.terms[position]
+            if not term.startswith(prefix):
+                break
+            found.add(entry_id)
+            position += 1
+        return found
+
+
+class AutocompleteIndex:
+    """
+    Thread-safe prefix index over book titles and authors.
+
+    Results of past Google Books searches share one index, ranked by how
+    often they were seen. Each reading list's books (flagged `in_library`)
+    get an index of their own, so lookups only scan the list searched; the
+    least recently searched lists are dropped and reload on their next search.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = Config.AUTOCOMPLETE_MAX_ENTRIES,
+        min_results: int = Config.AUTOCOMPLETE_MIN_RESULTS,
+        max_lists: int = Config.AUTOCOMPLETE_MAX_LISTS,
+    ) -> None:
+        """
+        Initialize an empty index.
+
+        Args:
+            max_entries (int): Search results kept before the least seen are
+                evicted. Library books don't count towards the limit.
+            min_results (int): Matches needed before a search is answered
+                locally instead of remotely.
+            max_lists (int): Reading lists whose books are kept indexed.
+        """
+        self.max_entries = max_entries
+        self.min_results = min_results
+        self.max_lists = max_lists
+        self._lock = threading.Lock()
+        self._remote = _PrefixIndex()
+        self._hits: dict[str, int] = {}
+        self._libraries: OrderedDict[int, _PrefixIndex] = OrderedDict()
+
+    def record_results(self, results: list[dict]) -> None:
+        """
+        Add or re-rank books returned by a remote search.
+
+        Args:
+            results (list[dict]): Normalized search results with "title",
+                "authors", "key" and "subjects".
+        """
+        with self._lock:
+            for result in results:
+                if not result.get("key") or not result.get("title"):
+                    continue
+                entry_id = f"google:{result['key']}"
+                if entry_id not in self._remote.entries:
+                    self._remote.insert(
+                        entry_id,
+                        {
+                            "title": result["title"],
+                            "authors": list(result.get("authors") or []),
+                            "key": result["key"],
+                            "subjects": list(result.get("subjects") or []),
+                            "in_library": False,
+                        },
+                    )
+                self._hits[entry_id] = self._hits.get(entry_id, 0) + 1
+            self._evict()
+
+    def _evict(self) -> None:
+        excess = len(self._remote.entries) - self.max_entries
+        if excess > 0:
+            for entry_id in sorted(
+                self._remote.entries, key=lambda e: self._hits.get(e, 0)
+            )[:excess]:
+                self._remote.remove(entry_id)
+                self._hits.pop(entry_id, None)
+
+    def _library(self, list_id: int) -> _PrefixIndex:
+        """Return the index of a list, marking it most recently used."""
+        library = self._libraries.get(list_id)
+        if library is None:
+            library = self._libraries[list_id] = _PrefixIndex()
+            while len(self._libraries) > self.max_lists:
+                self._libraries.popitem(last=False)
+        self._libraries.move_to_end(list_id)
+        return library
+
+    @staticmethod
+    def _library_entry(title: str, author: str) -> dict:
+        return {
+            "title": title,
+            "authors": [a.strip() for a in (author or "").split(",") if a.strip()],
+            "key": None,
+            "subjects": [],
+            "in_library": True,
+        }
+
+    def add_library_book(
+        self, book_id: int, title: str, author: str, list_id: int = DEFAULT_LIST_ID
+    ) -> None:
+        """
+        Index a book from a reading list.
+        """
+        entry = self._library_entry(title, author)
+        with self._lock:
+            self._library(list_id).insert(str(book_id), entry)
+
+    def remove_library_book(self, book_id: int, list_id: int = DEFAULT_LIST_ID) -> None:
+        with self._lock:
+            library = self._libraries.get(list_id)
+            if library is not None:
+                library.remove(str(book_id))
+
+    def load_library(
+        self, books: Iterable[tuple[int, str, str]], list_id: int = DEFAULT_LIST_ID
+    ) -> None:
+        """
+        Replace the indexed books of one list with `books` as (id, title,
+        author) tuples.
+        """
+        library = _PrefixIndex()
+        library.replace(
+            {
+                str(book_id): self._library_entry(title, author)
+                for book_id, title, author in books
+            }
+        )
+        library.loaded = True
+        with self._lock:
+            self._library(list_id)
+            self._libraries[list_id] = library
+
+    def library_loaded(self, list_id: int = DEFAULT_LIST_ID) -> bool:
+        """
+        Return whether the books of list `list_id` are loaded.
+        """
+        with self._lock:
+            library = self._libraries.get(list_id)
+            return library is not None and library.loaded
+
+    def search(
+        self, query: str, limit: int = 10, list_id: int = DEFAULT_LIST_ID
+    ) -> list[dict]:
+        """
+        Return up to `limit` books whose title or an author starts with `query`.
+
+        Books of list `list_id` come first, then search results by how often
+        they were seen; other lists' books are left out.
+        """
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        with self._lock:
+            library = self._libraries.get(list_id)
+            own = []
+            if library is not None:
+                self._libraries.move_to_end(list_id)
+                own = sorted(
+                    (library.entries[e] for e in library.matches(prefix)),
+                    key=lambda entry: entry["title"],
+                )
+            remote = sorted(
+                self._remote.matches(prefix),
+                key=lambda e: (-self._hits.get(e, 0), self._remote.entries[e]["title"]),
+            )
+            ranked = own + [self._remote.entries[e] for e in remote]
+            return [dict(entry) for entry in ranked[:limit]]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._remote.entries) + sum(
+                len(library.entries) for library in self._libraries.values()
+            )
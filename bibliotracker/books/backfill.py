@@ -0,0 +1,105 @@
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from bibliotracker.ai import BookAI
+from bibliotracker.metrics import metrics
+from bibliotracker.storage.client import PostgresClient
+from bibliotracker.storage.models import Book
+from bibliotracker.storage.query import MISSING_METADATA
+
+logger = logging.getLogger(__name__)
+
+# Fields the backfill asks Claude for when they are missing
+BACKFILL_FIELDS = ("region", "is_fiction", "subjects")
+
+
+def missing_fields(book: Book) -> list[str]:
+    """
+    Return the BACKFILL_FIELDS that `book` has no usable value for.
+    """
+    return [
+        field
+        for field in BACKFILL_FIELDS
+        if getattr(book, field) is None or getattr(book, field) in MISSING_METADATA
+    ]
+
+
+class MetadataBackfill:
+    """
+    Re-enriches books stored with Unknown region, category or subjects.
+
+    Claude calls go through the "background" scheduler lane, so they only use
+    capacity that interactive adds leave free. Books that could not be
+    enriched are skipped for `retry_after_seconds`.
+    """
+
+    def __init__(
+        self,
+        db_client: PostgresClient,
+        book_ai: BookAI,
+        publish: Callable[[str, dict], None],
+        batch_size: int = 20,
+        concurrency: int = 1,
+        retry_after_seconds: float = 86400.0,
+    ) -> None:
+        """
+        Initialize the backfill.
+
+        Args:
+            db_client (PostgresClient): Source and destination of the books.
+            book_ai (BookAI): Client used for the enrichment calls.
+            publish (Callable): Event publisher for "book_updated" events.
+            batch_size (int): Books enriched per run.
+            concurrency (int): Books enriched at the same time.
+            retry_after_seconds (float): How long a failed book is skipped.
+        """
+        self.db_client = db_client
+        self.book_ai = book_ai
+        self.publish = publish
+        self.batch_size = batch_size
+        self.concurrency = max(1, concurrency)
+        self.retry_after_seconds = retry_after_seconds
+        self._retry_at: dict[int, float] = {}
+
+    def run_once(self) -> int:
+        """
+        Enrich one batch of books with missing metadata.
+
+        Returns:
+            int: The number of books that were updated.
+        """
+        now = time.monotonic()
+        self._retry_at = {
+            book_id: retry_at
+            for book_id, retry_at in self._retry_at.items()
+            if retry_at > now
+        }
+        books = self.db_client.get_books_missing_metadata(
+            limit_records=self.batch_size, exclude_ids=list(self._retry_at)
+        )
+        if not books:
+            return 0
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="backfill"
+        ) as executor:
+            updated = sum(executor.map(self._enrich, books))
+        logger.info(f"Metadata backfill updated {updated}/{len(books)} books")
+        return updated
+
+    def _enrich(self, book: Book) -> bool:
+        fields = missing_fields(book)
+        details = self.book_ai.get_book_details(
+            book.title, book.author, fields=fields, lane="background"
+        )
+        updates = {field: details[field] for field in fields if details.get(field)}
+        if not updates or not self.db_client.update_book_metadata(book.id, updates):
+            metrics.increment("backfill.failed")
+            self._retry_at[book.id] = time.monotonic() + self.retry_after_seconds
+            return False
+        metrics.increment("backfill.enriched")
+        self.publish(
+            "book_updated", {"id": book.id, "list_id": book.list_id, **updates}
+        )
+        return True
@@ -0,0 +1,224 @@
+import hashlib
+import itertools
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+
+from bibliotracker.books.autocomplete import normalize
+from bibliotracker.storage.client import PostgresClient
+from bibliotracker.storage.models import DEFAULT_LIST_ID
+from bibliotracker.storage.query import BookQuery
+
+logger = logging.getLogger(__name__)
+
+# 16 bands of 4 rows: pairs above ~0.5 Jaccard almost always share a band
+NUM_BANDS = 16
+BAND_ROWS = 4
+# A bucket this full is a shared boilerplate band, not a duplicate cluster
+MAX_BUCKET_SIZE = 50
+# Books read from the database per query during a sweep
+SWEEP_PAGE_SIZE = 5000
+
+
+def shingles(title: str, author: str, description: str | None) -> set[int]:
+    """
+    Return the hashed shingles of a book: title and author words plus word
+    pairs from the description, all normalized.
+    """
+    tokens = {f"t:{word}" for word in normalize(title).split()}
+    tokens.update(f"a:{word}" for word in normalize(author).split())
+    words = normalize(description or "").split()
+    tokens.update(f"d:{first} {second}" for first, second in itertools.pairwise(words))
+    return {
+        int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest())
+        for token in tokens
+    }
+
+
+class MinHasher:
+    """
+    MinHash signatures whose agreement estimates Jaccard similarity.
+
+    Shingles are already uniform 64-bit hashes, so XOR with a random mask
+    stands in for each permutation; it is several times cheaper in pure
+    Python than universal hashing modulo a prime.
+    """
+
+    def __init__(self, num_perm: int = NUM_BANDS * BAND_ROWS, seed: int = 1) -> None:
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._masks = [rng.getrandbits(64) for _ in range(num_perm)]
+
+    def signature(self, hashed_shingles: set[int]) -> tuple[int, ...]:
+        return tuple(min([x ^ mask for x in hashed_shingles]) for mask in self._masks)
+
+    @staticmethod
+    def similarity(first: tuple[int, ...], second: tuple[int, ...]) -> float:
+        """
+        Return the fraction of matching slots, an estimate of Jaccard similarity.
+        """
+        return sum(a == b for a, b in zip(first, second)) / len(first)
+
+
+def find_duplicate_clusters(
+    signatures: dict[int, tuple[int, ...]], threshold: float = 0.5
+) -> list[dict]:
+    """
+    Group books whose signatures are at least `threshold` similar.
+
+    LSH banding yields candidate pairs in roughly linear time: only books that
+    agree on every row of some band are compared. Candidates are verified
+    against the full signature and joined transitively.
+
+    Args:
+        signatures (dict[int, tuple]): MinHash signature per book ID, of
+            NUM_BANDS * BAND_ROWS slots.
+        threshold (float): Minimum estimated Jaccard similarity of a pair.
+
+    Returns:
+        list[dict]: Clusters as {"ids": sorted book IDs, "similarity": lowest
+            verified pair similarity}, largest first.
+    """
+    buckets: dict[tuple, list[int]] = defaultdict(list)
+    for book_id, signature in signatures.items():
+        for band in range(NUM_BANDS):
+            rows = signature[band * BAND_ROWS : (band + 1) * BAND_ROWS]
+            buckets[(band, rows)].append(book_id)
+
+    parent = {}
+
+    def find(book_id: int) -> int:
+        while parent.get(book_id, book_id) != book_id:
+            # Path halving keeps the trees flat
+            parent[book_id] = parent.get(parent[book_id], parent[book_id])
+            book_id = parent[book_id]
+        return book_id
+
+    checked, similarities = set(), {}
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        if len(members) > MAX_BUCKET_SIZE:
+            logger.info(f"Skipping LSH bucket of {len(members)} books")
+            continue
+        for i, first in enumerate(members):
+            for second in members[i + 1 :]:
+                pair = (min(first, second), max(first, second))
+                if pair in checked:
+                    continue
+                checked.add(pair)
+                score = MinHasher.similarity(signatures[first], signatures[second])
+                if score >= threshold:
+                    similarities[pair] = score
+                    parent[find(first)] = find(second)
+
+    clusters: dict[int, dict] = {}
+    for (first, second), score in similarities.items():
+        cluster = clusters.setdefault(find(first), {"ids": set(), "similarity": 1.0})
+        cluster["ids"].update((first, second))
+        cluster["similarity"] = min(cluster["similarity"], score)
+    return sorted(
+        (
+            {"ids": sorted(c["ids"]), "similarity": round(c["similarity"], 3)}
+            for c in clusters.values()
+        ),
+        key=lambda c: (-len(c["ids"]), -c["similarity"], c["ids"]),
+    )
+
+
+class DuplicateSweep:
+    """
+    Offline near-duplicate detection over whole reading lists.
+
+    `run` pages through every book of a list, signs it with MinHash and keeps
+    the resulting clusters in `reports`, by list ID, until the list's next run.
+    A sweep takes about 0.7 ms per book, so callers start it with `start` and
+    run it in the background; `running` holds the lists being swept.
+    """
+
+    def __init__(self, db_client: PostgresClient, threshold: float = 0.5) -> None:
+        """
+        Initialize the sweep.
+
+        Args:
+            db_client (PostgresClient): Source of the books.
+            threshold (float): Minimum estimated Jaccard similarity of a pair.
+        """
+        self.db_client = db_client
+        self.threshold = threshold
+        self.hasher = MinHasher()
+        self.reports: dict[int, dict] = {}
+        self.running: set[int] = set()
+        self._lock = threading.Lock()
+        self._list_locks: dict[int, threading.Lock] = defaultdict(threading.Lock)
+
+    def _books(self, list_id: int) -> Iterable:
+        book_query = BookQuery(
+            sort="oldest", fields=["title", "author", "description"], list_id=list_id
+        )
+        after = None
+        while True:
+            books = self.db_client.get_all_books(
+                limit_records=SWEEP_PAGE_SIZE, book_query=book_query, after=after
+            )
+            yield from books
+            if len(books) < SWEEP_PAGE_SIZE:
+                return
+            after = [books[-1].id]
+
+    def start(self, list_id: int = DEFAULT_LIST_ID) -> bool:
+        """
+        Mark a sweep of a list as running, before handing `run` to a worker.
+
+        Returns:
+            bool: False if the list is already being swept.
+        """
+        with self._lock:
+            if list_id in self.running:
+                return False
+            self.running.add(list_id)
+            return True
+
+    def run(self, list_id: int = DEFAULT_LIST_ID) -> dict:
+        """
+        Scan every book of a list and replace its report.
+
+        Sweeps of the same list run one at a time; other lists aren't blocked.
+
+        Args:
+            list_id (int): The list to scan. Defaults to the default list.
+
+        Returns:
+            dict: "clusters" (see `find_duplicate_clusters`), "books_scanned",
+                "duration_seconds" and "generated_at" (Unix time).
+        """
+        with self._lock:
+            list_lock = self._list_locks[list_id]
+        try:
+            with list_lock:
+                started = time.perf_counter()
+                signatures = {}
+                for book in self._books(list_id):
+                    hashed = shingles(book.title, book.author, book.description)
+                    if hashed:
+                        signatures[book.id] = self.hasher.signature(hashed)
+                clusters = find_duplicate_clusters(signatures, self.threshold)
+                duration = time.perf_counter() - started
+                report = {
+                    "clusters": clusters,
+                    "books_scanned": len(signatures),
+                    "duration_seconds": round(duration, 3),
+                    "generated_at": time.time(),
+                }
+                self.reports[list_id] = report
+        finally:
+            with self._lock:
+                self.running.discard(list_id)
+        logger.info(
+            f"Duplicate sweep of list {list_id} found {len(clusters)} clusters "
+            f"in {len(signatures)} books ({duration:.1f}s)"
+        )
+        return report
@@ -1,24 +1,73 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import httpx
 
 from bibliotracker.config import Config
+from bibliotracker.resilience import UpstreamUnavailable, get_upstream, hedged_call
 
 logger = logging.getLogger(__name__)
 
 
+def _is_upstream_failure(error: Exception) -> bool:
+    """Client errors (bad query, bad key) say nothing about Google's health."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    return True
+
+
 class GoogleBooksClient:
     """
     A client to search for books using the Google Books API.
+
+    Calls go through the shared "google_books" rate limiter and circuit breaker,
+    and slow requests are hedged with a duplicate after a short delay.
     """
 
     BASE_URL = "https://www.googleapis.com/books/v1/volumes"
 
     def __init__(self, api_key: str | None = None) -> None:
         self.client = httpx.Client(
-            timeout=10.0, headers={"Referer": Config.REFERER_URL}
+            timeout=httpx.Timeout(Config.GOOGLE_BOOKS_TIMEOUT_SECONDS, connect=2.0),
+            headers={"Referer": Config.REFERER_URL},
         )
         self.api_key = api_key
+        self.hedge_after = Config.GOOGLE_BOOKS_HEDGE_AFTER_SECONDS
+        self.upstream = get_upstream(
+            "google_books",
+            rate_per_second=Config.GOOGLE_BOOKS_RATE_LIMIT,
+            capacity=Config.GOOGLE_BOOKS_RATE_BURST,
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=8, thread_name_prefix="google-books"
+        )
+
+    def _get_json(self, url: str, params: dict) -> dict:
+        """
+        GET `url` with rate limiting, circuit breaking and request hedging.
+
+        Raises:
+            UpstreamUnavailable: If the circuit is open or the rate limit is hit.
+            httpx.HTTPError: If the request itself fails.
+        """
+
+        def attempt() -> dict:
+            response = self.client.get(url, params=params)
+            response.raise_for_status()
+            return response.json()
+
+        return self.upstream.call(
+            lambda: hedged_call(
+                attempt,
+                hedge_after=self.hedge_after,
+                executor=self.executor,
+                can_hedge=self.upstream.bucket.try_acquire,
+                name="upstream.google_books",
+            ),
+            acquire_timeout=0.5,
+            is_failure=_is_upstream_failure,
+        )
 
     def search_books(
         self, query: str, max_results: int = 10, start_index: int = 0
@@ -33,6 +82,9 @@ class GoogleBooksClient:
 
         Returns:
             dict: The JSON response from Google Books API.
+
+        Raises:
+            UpstreamUnavailable: If Google Books is failing or rate limited.
         """
         params = {
             "q": query,
@@ -45,9 +97,9 @@ class GoogleBooksClient:
             params["key"] = self.api_key
 
         try:
-            response = self.client.get(self.BASE_URL, params=params)
-            response.raise_for_status()
-            return response.json()
+            return self._get_json(self.BASE_URL, params)
+        except UpstreamUnavailable:
+            raise
         except httpx.HTTPError as e:
             logger.error(f"HTTP Error searching Google Books: {e}")
             return {}
@@ -55,5 +107,30 @@ class GoogleBooksClient:
             logger.error(f"Unexpected error: {e}")
             return {}
 
+    def get_volume(self, volume_id: str) -> dict:
+        """
+        Fetch a single volume by its Google Books ID.
+
+        Args:
+            volume_id (str): The Google Books volume ID.
+
+        Returns:
+            dict: The JSON response from Google Books API, or {} on error.
+        """
+        params = {"key": self.api_key} if self.api_key else {}
+
+        try:
+            return self._get_json(f"{self.BASE_URL}/{volume_id}", params)
+        except UpstreamUnavailable as e:
+            logger.warning(f"Skipping Google Books volume lookup: {e}")
+            return {}
+        except httpx.HTTPError as e:
+            logger.error(f"HTTP Error fetching Google Books volume: {e}")
+            return {}
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            return {}
+
     def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
         self.client.close()
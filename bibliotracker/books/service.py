@@ -1,11 +1,27 @@
+import html
 import logging
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 
-from bibliotracker.ai import BookAI
+from bibliotracker.ai import FIELD_PROMPTS, BookAI
+from bibliotracker.books.autocomplete import AutocompleteIndex, normalize
 from bibliotracker.books.google_books import GoogleBooksClient
+from bibliotracker.cache import TTLCache
 from bibliotracker.config import Config
+from bibliotracker.metrics import metrics
+from bibliotracker.resilience import UpstreamUnavailable
+from bibliotracker.storage.models import DEFAULT_LIST_ID
 
 logger = logging.getLogger(__name__)
 
+# Google Books descriptions shorter than this are too thin to replace the AI summary
+MIN_DESCRIPTION_WORDS = 20
+MAX_DESCRIPTION_WORDS = 100
+MAX_SUBJECTS = 3
+# Speculatively fetched next search pages are only kept while a user is scrolling
+SEARCH_PREFETCH_TTL_SECONDS = 60
+
 
 class BookLookupService:
     """
@@ -19,87 +35,410 @@ class BookLookupService:
         self.ai = BookAI()
         config = Config()
         self.google_client = GoogleBooksClient(api_key=config.GOOGLE_BOOKS_API_KEY)
+        # volumeInfo of recent search results, keyed by Google Books ID
+        self.volume_cache = TTLCache(max_size=2000, ttl_seconds=3600)
+        # Titles/authors from the library and past searches, for local suggestions
+        self.autocomplete = AutocompleteIndex()
+        # Runs the page requests of aggregated searches side by side
+        self.search_executor = ThreadPoolExecutor(
+            max_workers=8, thread_name_prefix="search-pages"
+        )
+        # Remote search pages, including the speculatively fetched next page.
+        # Prefetches get their own pool since they wait on search_executor.
+        self.search_cache = TTLCache(
+            max_size=200, ttl_seconds=SEARCH_PREFETCH_TTL_SECONDS
+        )
+        self.prefetch_executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="search-prefetch"
+        )
+        self._prefetching: dict[tuple, Future] = {}
+        self._prefetch_lock = threading.Lock()
+
+    def warm_up(self) -> None:
+        """
+        Establish the Google Books HTTP connection before the first search.
+        """
+        self.google_client.search_books("warmup", max_results=1)
+
+    def close(self) -> None:
+        """
+        Release HTTP clients held by the service.
+        """
+        self.prefetch_executor.shutdown(wait=False, cancel_futures=True)
+        self.search_executor.shutdown(wait=False, cancel_futures=True)
+        self.google_client.close()
+        self.ai.client.close()
 
     def search_books(
-        self, search_query: str, page_number: int = 1, results_limit: int = 40
+        self,
+        search_query: str,
+        page_number: int = 1,
+        results_limit: int = 40,
+        remote: bool = False,
+        aggregate_pages: int = 1,
+        list_id: int = DEFAULT_LIST_ID,
     ) -> tuple[list[dict], int]:
         """
-        Search for books matching the query using the Google Books API.
+        Search for books matching the query.
+
+        The first page is answered from the local autocomplete index when it
+        has at least `autocomplete.min_results` prefix matches; otherwise, and for
+        `remote` searches, the Google Books API is queried.
+
+        With `aggregate_pages` > 1, each results page spans that many Google
+        Books pages, fetched concurrently. Filtered-out items are back-filled
+        from the extra pages and editions sharing a title and author are
+        collapsed, so one call returns a full page in one round-trip's time.
+
+        After a remote page is served, the next one is fetched in the background
+        and kept in `search_cache` for SEARCH_PREFETCH_TTL_SECONDS, so scrolling
+        to it is answered without waiting on Google Books.
 
         Args:
             search_query (str): The book title or keywords to search for.
             page_number (int): The results page to fetch. Defaults to 1.
-            results_limit (int): Max number of results per page. Defaults to 20.
+            results_limit (int): Max number of results per Google Books page.
+                Defaults to 40.
+            remote (bool): Skip local suggestions. Defaults to False.
+            aggregate_pages (int): Google Books pages per results page.
+                Defaults to 1.
+            list_id (int): The reading list whose books local suggestions
+                include. Defaults to the default list.
 
         Returns:
             tuple[list[dict], int]: A tuple containing a list of normalized book results
-                                   and the total number of books found.
-        """
-        # Calculate start_index for Google Books (0-based)
-        start_index = (page_number - 1) * results_limit
+                                   and the total number of books found. Each result
+                                   has a "source" of "local" or "google".
 
-        try:
-            data = self.google_client.search_books(
-                search_query, max_results=results_limit, start_index=start_index
+        Raises:
+            UpstreamUnavailable: If Google Books is failing or rate limited.
+        """
+        if page_number == 1 and not remote:
+            local_results = self.autocomplete.search(
+                search_query, results_limit, list_id
             )
+            if len(local_results) >= self.autocomplete.min_results:
+                metrics.increment("search.local_hits")
+                for result in local_results:
+                    result["source"] = "local"
+                return local_results, len(local_results)
+        aggregate_pages = max(1, aggregate_pages)
+        page_key = self._search_page_key(
+            search_query, page_number, results_limit, aggregate_pages
+        )
 
-            items = data.get("items") or []
-            total_matches = data.get("totalItems", 0)
-
-            # Normalize results to match standard dictionary format
-            # { "title": ..., "authors": [...], "key": ... }
-            normalized_results = []
-            for item in items:
-                info = item.get("volumeInfo", {})
-                lang = info.get("language", "").lower()
-                title = info.get("title")
-                # Ensure authors is a list of non-null strings
-                authors = [str(a) for a in (info.get("authors") or []) if a]
-
-                # Detailed logging for debugging language issues
-                logger.debug(f"Checking book: '{title}' Language: '{lang}'")
-
-                # Strict check for English language (allow en-US, en-GB, etc.)
-                if not lang.startswith("en"):
-                    logger.info(f"Skipping non-English book: '{title}' ({lang})")
-                    continue
-
-                if not title:
-                    logger.warning(
-                        f"Skipping book with missing title. ID: {item.get('id')}"
-                    )
-                    continue
-
-                normalized_results.append(
-                    {
-                        "title": title,
-                        "authors": authors,
-                        "key": item.get("id"),  # Using Google Books ID as key
-                        "subjects": info.get("categories", []),
-                    }
+        try:
+            cached_page = self._cached_search_page(page_key)
+            if cached_page is None:
+                metrics.increment("search.remote")
+                normalized_results, total_matches = self._search_remote(
+                    search_query, page_number, results_limit, aggregate_pages
                 )
+                self.search_cache.set(page_key, (normalized_results, total_matches))
+            else:
+                metrics.increment("search.prefetch_hits")
+                normalized_results, total_matches = cached_page
+            self.autocomplete.record_results(normalized_results)
 
-            logger.info(
-                f"Search results after filtering: {len(normalized_results)}/{len(items)}"
-            )
+            if total_matches > page_number * results_limit * aggregate_pages:
+                self._prefetch_search_page(
+                    search_query, page_number + 1, results_limit, aggregate_pages
+                )
 
             # Note: We return the total_matches from API, but items is filtered.
             # This is standard for search APIs where real-time filtering happens.
-            return normalized_results, total_matches
+            return [dict(result) for result in normalized_results], total_matches
+        except UpstreamUnavailable:
+            raise
         except Exception as error:
             logger.error(f"Google Books Search Error: {error}")
             return [], 0
 
-    def get_book_metadata(self, book_title: str, book_author: str) -> dict:
+    def _search_remote(
+        self,
+        search_query: str,
+        page_number: int,
+        results_limit: int,
+        aggregate_pages: int,
+    ) -> tuple[list[dict], int]:
+        """
+        Fetch and normalize one (possibly aggregated) Google Books results page.
+
+        Raises:
+            UpstreamUnavailable: If Google Books is failing or rate limited.
         """
-        Fetch detailed AI-generated metadata for a specific book.
+        # Calculate start_index for Google Books (0-based)
+        first_index = (page_number - 1) * results_limit * aggregate_pages
+        start_indexes = [
+            first_index + offset * results_limit for offset in range(aggregate_pages)
+        ]
+        responses = self._fetch_search_pages(search_query, start_indexes, results_limit)
+        items = [item for data in responses for item in data.get("items") or []]
+        total_matches = max(
+            (data.get("totalItems", 0) for data in responses), default=0
+        )
+
+        normalized_results = self._normalize_search_items(items)
+        if aggregate_pages > 1:
+            normalized_results = self._dedupe_editions(normalized_results)
+        logger.info(
+            f"Search results after filtering: {len(normalized_results)}/{len(items)}"
+        )
+        return normalized_results, total_matches
+
+    @staticmethod
+    def _search_page_key(
+        search_query: str, page_number: int, results_limit: int, aggregate_pages: int
+    ) -> tuple:
+        return (
+            search_query.strip().casefold(),
+            page_number,
+            results_limit,
+            aggregate_pages,
+        )
+
+    def _cached_search_page(self, page_key: tuple) -> tuple[list[dict], int] | None:
+        """
+        Return a cached results page, waiting for an in-flight prefetch of it.
+        """
+        cached_page = self.search_cache.get(page_key)
+        if cached_page is not None:
+            return cached_page
+        with self._prefetch_lock:
+            pending = self._prefetching.get(page_key)
+        if pending is None:
+            return None
+        try:
+            return pending.result()
+        except Exception:
+            # The prefetch already logged its failure; fetch the page normally
+            return None
+
+    def _prefetch_search_page(
+        self,
+        search_query: str,
+        page_number: int,
+        results_limit: int,
+        aggregate_pages: int,
+    ) -> None:
+        """
+        Fetch a results page in the background and park it in the search cache.
+        """
+        page_key = self._search_page_key(
+            search_query, page_number, results_limit, aggregate_pages
+        )
+        with self._prefetch_lock:
+            if page_key in self._prefetching or page_key in self.search_cache:
+                return
+
+            def prefetch() -> tuple[list[dict], int]:
+                try:
+                    page = self._search_remote(
+                        search_query, page_number, results_limit, aggregate_pages
+                    )
+                    self.search_cache.set(page_key, page)
+                    metrics.increment("search.prefetches")
+                    return page
+                except Exception as error:
+                    logger.warning(f"Search prefetch failed: {error}")
+                    raise
+                finally:
+                    with self._prefetch_lock:
+                        self._prefetching.pop(page_key, None)
+
+            try:
+                self._prefetching[page_key] = self.prefetch_executor.submit(prefetch)
+            except RuntimeError:
+                # Executor shut down during close()
+                pass
+
+    def _fetch_search_pages(
+        self, search_query: str, start_indexes: list[int], results_limit: int
+    ) -> list[dict]:
+        """
+        Fetch Google Books search pages concurrently, in `start_indexes` order.
+
+        Pages that fail are dropped; UpstreamUnavailable is only raised if
+        every page hit it.
+        """
+        if len(start_indexes) == 1:
+            return [
+                self.google_client.search_books(
+                    search_query,
+                    max_results=results_limit,
+                    start_index=start_indexes[0],
+                )
+            ]
+        futures = [
+            self.search_executor.submit(
+                self.google_client.search_books,
+                search_query,
+                max_results=results_limit,
+                start_index=start_index,
+            )
+            for start_index in start_indexes
+        ]
+        responses = []
+        unavailable = None
+        for future in futures:
+            try:
+                responses.append(future.result())
+            except UpstreamUnavailable as error:
+                unavailable = error
+        if unavailable is not None and not responses:
+            raise unavailable
+        return responses
+
+    def _normalize_search_items(self, items: list[dict]) -> list[dict]:
+        """
+        Keep English, titled volumes in the frontend's search result format.
+        """
+        # Normalize results to match standard dictionary format
+        # { "title": ..., "authors": [...], "key": ... }
+        normalized_results = []
+        for item in items:
+            info = item.get("volumeInfo", {})
+            lang = info.get("language", "").lower()
+            title = info.get("title")
+            # Ensure authors is a list of non-null strings
+            authors = [str(a) for a in (info.get("authors") or []) if a]
+
+            # Detailed logging for debugging language issues
+            logger.debug(f"Checking book: '{title}' Language: '{lang}'")
+
+            # Strict check for English language (allow en-US, en-GB, etc.)
+            if not lang.startswith("en"):
+                logger.info(f"Skipping non-English book: '{title}' ({lang})")
+                continue
+
+            if not title:
+                logger.warning(
+                    f"Skipping book with missing title. ID: {item.get('id')}"
+                )
+                continue
+
+            self.volume_cache.set(item.get("id"), info)
+            normalized_results.append(
+                {
+                    "title": title,
+                    "authors": authors,
+                    "key": item.get("id"),  # Using Google Books ID as key
+                    "subjects": info.get("categories", []),
+                    "source": "google",
+                }
+            )
+        return normalized_results
+
+    @staticmethod
+    def _dedupe_editions(results: list[dict]) -> list[dict]:
+        """
+        Keep the first (most relevant) result per normalized title and authors.
+        """
+        seen = set()
+        unique_results = []
+        for result in results:
+            edition_key = (
+                normalize(result["title"]),
+                tuple(sorted(normalize(author) for author in result["authors"])),
+            )
+            if edition_key in seen:
+                continue
+            seen.add(edition_key)
+            unique_results.append(result)
+        return unique_results
+
+    def get_book_metadata(
+        self, book_title: str, book_author: str, book_key: str | None = None
+    ) -> dict:
+        """
+        Fetch detailed metadata for a specific book.
+
+        Fields the selected Google Books volume already provides are used as-is;
+        Claude is only asked for the ones that are missing (typically region).
 
         Args:
             book_title (str): The title of the book.
             book_author (str): The author(s) of the book.
+            book_key (str, optional): Google Books ID of the selected search result.
 
         Returns:
             dict: Detailed book metadata (summary, subjects, region, etc.).
         """
-        # Use AI for detailed metadata as requested
-        return self.ai.get_book_details(book_title, book_author)
+        details = self._details_from_volume(self._get_volume_info(book_key))
+        missing = [f for f in FIELD_PROMPTS if not details.get(f)]
+        if not missing:
+            return details
+
+        logger.info(
+            f"Fetching {', '.join(missing)} from AI for '{book_title}' "
+            f"({len(details)} fields from Google Books)"
+        )
+        ai_details = self.ai.get_book_details(
+            details.get("title") or book_title,
+            ", ".join(details.get("authors") or []) or book_author,
+            fields=missing,
+        )
+        if not ai_details:
+            # Keep whatever Google Books gave us; gaps are stored as "Unknown"
+            logger.warning(f"AI enrichment failed for '{book_title}'")
+            return details
+        for field in missing:
+            if ai_details.get(field):
+                details[field] = ai_details[field]
+        return details
+
+    def _get_volume_info(self, book_key: str | None) -> dict:
+        """
+        Return the volumeInfo for a Google Books ID, from the search cache if possible.
+        """
+        if not book_key:
+            return {}
+        info = self.volume_cache.get(book_key)
+        if info is None:
+            info = self.google_client.get_volume(book_key).get("volumeInfo") or {}
+            self.volume_cache.set(book_key, info)
+        return info
+
+    def _details_from_volume(self, info: dict) -> dict:
+        """
+        Extract the metadata fields a Google Books volumeInfo can answer reliably.
+        """
+        details = {}
+        if info.get("title"):
+            details["title"] = info["title"]
+
+        authors = [str(a) for a in (info.get("authors") or []) if a]
+        if authors:
+            details["authors"] = authors
+
+        description = self._clean_volume_description(info.get("description") or "")
+        if len(description.split()) >= MIN_DESCRIPTION_WORDS:
+            details["description"] = description
+
+        # Categories look like "Fiction / Science Fiction / General"
+        categories = info.get("categories") or []
+        subjects = []
+        for category in categories:
+            for part in category.split("/"):
+                part = part.strip()
+                if part and part != "General" and part not in subjects:
+                    subjects.append(part)
+        if subjects:
+            details["subjects"] = subjects[:MAX_SUBJECTS]
+
+        # Only an explicit fiction category is trusted; everything else is asked
+        if any(
+            "fiction" in c.lower() and "nonfiction" not in c.lower().replace("-", "")
+            for c in categories
+        ):
+            details["is_fiction"] = "Fiction"
+
+        return details
+
+    def _clean_volume_description(self, text: str) -> str:
+        """Strip HTML markup and trim a Google Books description to the summary length."""
+        text = html.unescape(re.sub(r"<[^>]+>", " ", text))
+        words = text.split()
+        if len(words) > MAX_DESCRIPTION_WORDS:
+            return " ".join(words[:MAX_DESCRIPTION_WORDS]).rstrip(".,;:") + "..."
+        return " ".join(words)
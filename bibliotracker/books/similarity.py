@@ -0,0 +1,191 @@
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from collections.abc import Iterable
+
+# Frequent words that say nothing about what a book is about
+STOPWORDS = frozenset(
+    """
+    about after again also among an and another any are around as at away back
+    be became because been before being between both but by can could did does
+    each even ever every few first for from had has have her here him his how
+    into its just last life like made make many more most much must never new
+    not now of off old once one only other our out over own same she should
+    since some still such than that the their them then there these they this
+    those three through time too two under until upon very was way well were
+    what when where which while who whom whose why will with within without
+    world would year years you young your book books novel story stories
+    """.split()
+)
+
+# A shared subject is a stronger signal than a shared description word
+SUBJECT_WEIGHT = 3.0
+
+
+def book_terms(description: str | None, subjects: Iterable[str]) -> dict[str, float]:
+    """
+    Return the term weights of a book: sublinear counts of description words
+    plus SUBJECT_WEIGHT for each whole subject label.
+    """
+    counts = Counter(
+        word
+        for word in re.findall(r"[a-z]{3,}", (description or "").casefold())
+        if word not in STOPWORDS
+    )
+    terms = {word: 1.0 + math.log(count) for word, count in counts.items()}
+    for subject in subjects:
+        label = " ".join(subject.casefold().split())
+        if label:
+            terms[f"subject:{label}"] = SUBJECT_WEIGHT
+    return terms
+
+
+class SimilarityIndex:
+    """
+    Thread-safe TF-IDF index over book descriptions and subjects.
+
+    Books are sparse term vectors kept in an inverted index (term -> book ->
+    weight), so a top-k query only touches books sharing a term with the
+    query book. IDF weights follow the current book count.
+
+    With idf(t) = a - c(t), where a = log(1 + N) + 1 depends only on the book
+    count and c(t) = log(1 + df(t)) only on the term, a book's squared norm is
+    a²·Σw² - 2a·Σw²c + Σw²c². The three sums are kept per book, so a norm costs
+    O(1) at query time and an add or remove only updates the books sharing a
+    term with it.
+    """
+
+    def __init__(self) -> None:
+        self.loaded = False
+        self._lock = threading.Lock()
+        self._books: dict[int, dict[str, float]] = {}
+        self._postings: dict[str, dict[int, float]] = {}
+        # Per book: [Σw², Σw²·c(t), Σw²·c(t)²] over its terms
+        self._sums: dict[int, list[float]] = {}
+
+    def _idf(self, term: str) -> float:
+        # Smoothed, as in scikit-learn, so terms in every book still count a little
+        return math.log((1 + len(self._books)) / (1 + len(self._postings[term]))) + 1
+
+    def _norm(self, book_id: int) -> float:
+        a = math.log(1 + len(self._books)) + 1
+        s0, s1, s2 = self._sums[book_id]
+        return math.sqrt(max(a * a * s0 - 2 * a * s1 + s2, 0.0))
+
+    def _shift_df(self, term: str, old_df: int, new_df: int) -> None:
+        # Books already holding `term` see its c(t) change
+        old_c, new_c = math.log(1 + old_df), math.log(1 + new_df)
+        for other, weight in self._postings.get(term, {}).items():
+            sums = self._sums[other]
+            sums[1] += weight * weight * (new_c - old_c)
+            sums[2] += weight * weight * (new_c * new_c - old_c * old_c)
+
+    def _add(self, book_id: int, terms: dict[str, float]) -> None:
+        self._remove(book_id)
+        self._books[book_id] = terms
+        sums = [0.0, 0.0, 0.0]
+        for term, weight in terms.items():
+            df = len(self._postings.get(term, ()))
+            self._shift_df(term, df, df + 1)
+            self._postings.setdefault(term, {})[book_id] = weight
+            c = math.log(2 + df)
+            sums[0] += weight * weight
+            sums[1] += weight * weight * c
+            sums[2] += weight * weight * c * c
+        self._sums[book_id] = sums
+
+    def _remove(self, book_id: int) -> None:
+        terms = self._books.pop(book_id, None)
+        if terms is None:
+            return
+        del self._sums[book_id]
+        for term in terms:
+            postings = self._postings[term]
+            del postings[book_id]
+            if postings:
+                self._shift_df(term, len(postings) + 1, len(postings))
+            else:
+                del self._postings[term]
+
+    def add_book(
+        self, book_id: int, description: str | None, subjects: Iterable[str]
+    ) -> None:
+        """
+        Index or re-index one book.
+        """
+        terms = book_terms(description, subjects)
+        with self._lock:
+            self._add(book_id, terms)
+
+    def remove_book(self, book_id: int) -> None:
+        with self._lock:
+            self._remove(book_id)
+
+    def load(self, books: Iterable[tuple[int, str | None, Iterable[str]]]) -> None:
+        """
+        Replace the index with `books` as (id, description, subjects) tuples.
+        """
+        indexed = {
+            book_id: book_terms(desc, subjects) for book_id, desc, subjects in books
+        }
+        postings: dict[str, dict[int, float]] = {}
+        for book_id, terms in indexed.items():
+            for term, weight in terms.items():
+                postings.setdefault(term, {})[book_id] = weight
+        c = {term: math.log(1 + len(holders)) for term, holders in postings.items()}
+        sums = {}
+        for book_id, terms in indexed.items():
+            squares = [(weight * weight, c[term]) for term, weight in terms.items()]
+            sums[book_id] = [
+                sum(square for square, _ in squares),
+                sum(square * c_t for square, c_t in squares),
+                sum(square * c_t * c_t for square, c_t in squares),
+            ]
+        with self._lock:
+            self._books = indexed
+            self._postings = postings
+            self._sums = sums
+            self.loaded = True
+
+    def invalidate(self) -> None:
+        """
+        Mark the index for a full reload, e.g. after an update it can't apply.
+        """
+        self.loaded = False
+
+    def similar(self, book_id: int, limit: int = 5) -> list[tuple[int, float]]:
+        """
+        Return up to `limit` (book id, cosine similarity) pairs, most similar first.
+
+        Raises:
+            KeyError: If `book_id` is not indexed.
+        """
+        with self._lock:
+            terms = self._books[book_id]
+            norm = self._norm(book_id)
+            if not norm:
+                return []
+            scores: dict[int, float] = {}
+            for term, weight in terms.items():
+                idf = self._idf(term)
+                query_weight = weight * idf * idf
+                for other, other_weight in self._postings[term].items():
+                    if other != book_id:
+                        scores[other] = (
+                            scores.get(other, 0.0) + query_weight * other_weight
+                        )
+            ranked = heapq.nlargest(
+                limit,
+                (
+                    (other, score / (norm * self._norm(other)))
+                    for other, score in scores.items()
+                ),
+                key=lambda item: item[1],
+            )
+            return [(other, round(score, 4)) for other, score in ranked]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._books)
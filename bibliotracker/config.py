@@ -21,6 +21,104 @@ class Config:
     ADMIN_PASSWORD: str = os.environ["ADMIN_PASSWORD"]
     GOOGLE_BOOKS_API_KEY: str | None = os.environ.get("GOOGLE_BOOKS_API_KEY")
     REFERER_URL: str = os.environ.get("REFERER_URL", "http://127.0.0.1:8000/")
+    # Enrichment tries the fast model first and escalates to the strong one
+    AI_FAST_MODEL: str = os.environ.get("AI_FAST_MODEL", "claude-haiku-4-5")
+    AI_STRONG_MODEL: str = os.environ.get("AI_STRONG_MODEL", "claude-opus-4-6")
+    AI_MAX_TOKENS: int = int(os.environ.get("AI_MAX_TOKENS", "512"))
+    AI_TIMEOUT_SECONDS: float = float(os.environ.get("AI_TIMEOUT_SECONDS", "30"))
+    AI_RATE_LIMIT: float = float(os.environ.get("AI_RATE_LIMIT", "1"))  # requests/s
+    AI_RATE_BURST: int = int(os.environ.get("AI_RATE_BURST", "5"))
+    # Concurrent Claude calls per scheduler lane; background calls also leave
+    # AI_BACKGROUND_RESERVE_TOKENS rate-limit tokens for interactive adds
+    AI_INTERACTIVE_CONCURRENCY: int = int(
+        os.environ.get("AI_INTERACTIVE_CONCURRENCY", "4")
+    )
+    AI_BACKGROUND_CONCURRENCY: int = int(
+        os.environ.get("AI_BACKGROUND_CONCURRENCY", "1")
+    )
+    AI_BACKGROUND_RESERVE_TOKENS: int = int(
+        os.environ.get("AI_BACKGROUND_RESERVE_TOKENS", "2")
+    )
+    # Periodic re-enrichment of books with Unknown metadata; 0 disables it
+    ENRICHMENT_BACKFILL_INTERVAL_SECONDS: float = float(
+        os.environ.get("ENRICHMENT_BACKFILL_INTERVAL_SECONDS", "0")
+    )
+    ENRICHMENT_BACKFILL_BATCH: int = int(
+        os.environ.get("ENRICHMENT_BACKFILL_BATCH", "20")
+    )
+    # Periodic MinHash near-duplicate sweep; 0 disables it (admins can still
+    # run one on demand). Pairs at or above the threshold are reported.
+    DUPLICATE_SWEEP_INTERVAL_SECONDS: float = float(
+        os.environ.get("DUPLICATE_SWEEP_INTERVAL_SECONDS", "0")
+    )
+    DUPLICATE_SIMILARITY_THRESHOLD: float = float(
+        os.environ.get("DUPLICATE_SIMILARITY_THRESHOLD", "0.5")
+    )
+    # Connection pool (DB_USE_NULL_POOL=true when an external pooler such as
+    # PgBouncer does the pooling)
+    DB_POOL_SIZE: int = int(os.environ.get("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT_SECONDS: float = float(
+        os.environ.get("DB_POOL_TIMEOUT_SECONDS", "30")
+    )
+    DB_POOL_RECYCLE_SECONDS: int = int(os.environ.get("DB_POOL_RECYCLE_SECONDS", "-1"))
+    DB_POOL_PRE_PING: bool = (
+        os.environ.get("DB_POOL_PRE_PING", "true").lower() == "true"
+    )
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.environ.get("DB_STATEMENT_TIMEOUT_MS", "0"))
+    DB_USE_NULL_POOL: bool = (
+        os.environ.get("DB_USE_NULL_POOL", "false").lower() == "true"
+    )
+    # Optional read replicas: comma-separated SQLAlchemy URLs
+    POSTGRES_REPLICA_URLS: list[str] = [
+        url.strip()
+        for url in os.environ.get("POSTGRES_REPLICA_URLS", "").split(",")
+        if url.strip()
+    ]
+    # Reads go to the primary for this long after a write from this process
+    READ_YOUR_WRITES_SECONDS: float = float(
+        os.environ.get("READ_YOUR_WRITES_SECONDS", "5")
+    )
+    REPLICA_RETRY_SECONDS: float = float(os.environ.get("REPLICA_RETRY_SECONDS", "30"))
+    # Local search suggestions: page 1 is served locally with enough matches
+    AUTOCOMPLETE_MIN_RESULTS: int = int(os.environ.get("AUTOCOMPLETE_MIN_RESULTS", "5"))
+    AUTOCOMPLETE_MAX_ENTRIES: int = int(
+        os.environ.get("AUTOCOMPLETE_MAX_ENTRIES", "5000")
+    )
+    # Reading lists whose books stay indexed, least recently searched dropped
+    AUTOCOMPLETE_MAX_LISTS: int = int(os.environ.get("AUTOCOMPLETE_MAX_LISTS", "32"))
+    # Inline the first page of books into index.html; the cached page is
+    # dropped on writes from this process and expires after SSR_CACHE_SECONDS
+    SSR_FIRST_PAGE: bool = os.environ.get("SSR_FIRST_PAGE", "false").lower() == "true"
+    SSR_CACHE_SECONDS: float = float(os.environ.get("SSR_CACHE_SECONDS", "60"))
+    # How long /api/add remembers an Idempotency-Key and its outcome
+    IDEMPOTENCY_KEY_TTL_SECONDS: float = float(
+        os.environ.get("IDEMPOTENCY_KEY_TTL_SECONDS", "86400")
+    )
+    # An unfinished add holds its key this long; after that a retry takes over
+    # (keep it above the slowest add: lookups plus both AI tiers)
+    IDEMPOTENCY_LEASE_SECONDS: float = float(
+        os.environ.get("IDEMPOTENCY_LEASE_SECONDS", "120")
+    )
+    # Startup: services are built lazily; warming opens DB/HTTP connections early
+    WARM_ON_STARTUP: bool = os.environ.get("WARM_ON_STARTUP", "false").lower() == "true"
+    DB_WARM_CONNECTIONS: int = int(os.environ.get("DB_WARM_CONNECTIONS", "2"))
+    STARTUP_BUDGET_SECONDS: float = float(
+        os.environ.get("STARTUP_BUDGET_SECONDS", "1.0")
+    )
+    # Upstream resilience for Google Books
+    GOOGLE_BOOKS_TIMEOUT_SECONDS: float = float(
+        os.environ.get("GOOGLE_BOOKS_TIMEOUT_SECONDS", "5")
+    )
+    GOOGLE_BOOKS_RATE_LIMIT: float = float(
+        os.environ.get("GOOGLE_BOOKS_RATE_LIMIT", "10")
+    )
+    GOOGLE_BOOKS_RATE_BURST: int = int(os.environ.get("GOOGLE_BOOKS_RATE_BURST", "20"))
+    GOOGLE_BOOKS_HEDGE_AFTER_SECONDS: float = float(
+        os.environ.get("GOOGLE_BOOKS_HEDGE_AFTER_SECONDS", "0.8")
+    )
+    # Google Books pages fetched concurrently per aggregated search page
+    SEARCH_AGGREGATE_PAGES: int = int(os.environ.get("SEARCH_AGGREGATE_PAGES", "3"))
 
     @computed_field
     @property
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import logging
+import threading
+from collections.abc import AsyncIterator, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class EventBroker:
+    """
+    Fan-out of book change events to connected Server-Sent Events clients.
+
+    Routes run in FastAPI's threadpool, so `publish` is thread-safe and hands
+    each message to the subscriber's event loop via `call_soon_threadsafe`.
+    Events carrying a "list_id" only reach streams of that list.
+
+    Fan-out is in-process only: with several workers, a client only sees
+    changes made by the worker its stream is connected to.
+    """
+
+    def __init__(self, queue_size: int = 100, keepalive_seconds: float = 15.0) -> None:
+        """
+        Initialize the broker.
+
+        Args:
+            queue_size (int): Max buffered events per client before it is dropped.
+            keepalive_seconds (float): Interval for comment pings on idle streams.
+        """
+        self.queue_size = queue_size
+        self.keepalive_seconds = keepalive_seconds
+        self._lock = threading.Lock()
+        self._subscribers: list[
+            tuple[asyncio.AbstractEventLoop, asyncio.Queue, int | None]
+        ] = []
+        self._listeners: list[Callable[[str, dict], None]] = []
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def add_listener(self, listener: Callable[[str, dict], None]) -> None:
+        """
+        Register an in-process callback run synchronously on every publish,
+        e.g. to invalidate caches derived from the book list.
+
+        Args:
+            listener (Callable): Called with the event type and payload.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def publish(self, event_type: str, data: dict) -> None:
+        """
+        Send an event to every listener and connected client.
+
+        Args:
+            event_type (str): The SSE event name (e.g. "book_added").
+            data (dict): JSON-serializable payload.
+        """
+        with self._lock:
+            listeners = list(self._listeners)
+            subscribers = list(self._subscribers)
+        for listener in listeners:
+            try:
+                listener(event_type, data)
+            except Exception as error:
+                logger.error(f"Event listener failed for {event_type}: {error}")
+        if not subscribers:
+            return
+
+        message = f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+        list_id = data.get("list_id")
+        for loop, queue, subscribed_list_id in subscribers:
+            if (
+                None not in (list_id, subscribed_list_id)
+                and list_id != subscribed_list_id
+            ):
+                continue
+            try:
+                loop.call_soon_threadsafe(self._enqueue, queue, message)
+            except RuntimeError:
+                # Loop already closed; the stream's finally block will unsubscribe
+                pass
+
+    def _enqueue(self, queue: asyncio.Queue, message: str | None) -> None:
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning("SSE client is too slow, dropping its buffered events.")
+            while not queue.empty():
+                queue.get_nowait()
+            if message is None:
+                # Shutdown must still end the stream
+                queue.put_nowait(None)
+            else:
+                # Ask the client to reload so it doesn't stay out of sync
+                queue.put_nowait("event: resync\ndata: {}\n\n")
+
+    def close(self) -> None:
+        """
+        Terminate all open streams (used on application shutdown).
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue, _ in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._enqueue, queue, None)
+            except RuntimeError:
+                pass
+
+    async def stream(self, list_id: int | None = None) -> AsyncIterator[str]:
+        """
+        Yield SSE-formatted messages for a single client until it disconnects.
+
+        Args:
+            list_id (int, optional): Only pass on events of this list (and
+                events not tied to any list). Defaults to every event.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        entry = (loop, queue, list_id)
+        with self._lock:
+            self._subscribers.append(entry)
+
+        try:
+            # Tell EventSource how long to wait before reconnecting
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        queue.get(), timeout=self.keepalive_seconds
+                    )
+                except TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if message is None:
+                    break
+                yield message
+        finally:
+            with self._lock:
+                self._subscribers.remove(entry)
@@ -0,0 +1,44 @@
+import threading
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class Lazy(Generic[T]):
+    """
+    Defers construction of an expensive service until it is first used.
+
+    Attribute access is forwarded to the underlying instance, so a Lazy can
+    stand in for the service itself at module level.
+    """
+
+    def __init__(self, factory: Callable[[], T]) -> None:
+        self._factory = factory
+        self._instance: T | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not None
+
+    def get(self) -> T:
+        """
+        Return the instance, constructing it on the first call.
+        """
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
+
+    def reset(self) -> T | None:
+        """
+        Forget the instance (if any) and return it so the caller can close it.
+        """
+        with self._lock:
+            instance, self._instance = self._instance, None
+        return instance
+
+    def __getattr__(self, name: str):
+        return getattr(self.get(), name)
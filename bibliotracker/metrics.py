@@ -0,0 +1,54 @@
+import threading
+from collections import defaultdict
+
+
+class Metrics:
+    """
+    In-process counters and timings, exposed through the admin metrics endpoint.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = defaultdict(int)
+        self._timings: dict[str, dict[str, float]] = {}
+
+    def increment(self, name: str, value: int = 1) -> None:
+        """
+        Add `value` to the counter called `name`.
+        """
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name: str, seconds: float) -> None:
+        """
+        Record a duration sample for the timing called `name`.
+        """
+        with self._lock:
+            timing = self._timings.setdefault(
+                name, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            )
+            timing["count"] += 1
+            timing["total_seconds"] += seconds
+            timing["max_seconds"] = max(timing["max_seconds"], seconds)
+
+    def snapshot(self) -> dict:
+        """
+        Return a JSON-serializable copy of all counters and timings.
+        """
+        with self._lock:
+            timings = {
+                name: {
+                    **timing,
+                    "avg_seconds": timing["total_seconds"] / timing["count"],
+                }
+                for name, timing in self._timings.items()
+            }
+            return {"counters": dict(self._counters), "timings": timings}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+
+
+metrics = Metrics()
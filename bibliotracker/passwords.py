@@ -0,0 +1,38 @@
+import hashlib
+import hmac
+import secrets
+
+# scrypt cost parameters (~16 MiB of memory per hash)
+SCRYPT_N = 2**14
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+
+def hash_password(password: str) -> str:
+    """
+    Hash a password with scrypt and a random salt.
+
+    Returns:
+        str: "scrypt$n$r$p$salt$hash", with salt and hash in hex.
+    """
+    salt = secrets.token_bytes(16)
+    digest = hashlib.scrypt(
+        password.encode(), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P
+    )
+    return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${salt.hex()}${digest.hex()}"
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    """
+    Check a password against a hash from `hash_password`, in constant time.
+    """
+    try:
+        scheme, n, r, p, salt, expected = password_hash.split("$")
+        if scheme != "scrypt":
+            return False
+        digest = hashlib.scrypt(
+            password.encode(), salt=bytes.fromhex(salt), n=int(n), r=int(r), p=int(p)
+        )
+    except ValueError:
+        return False
+    return hmac.compare_digest(digest.hex(), expected)
@@ -0,0 +1,386 @@
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from contextlib import contextmanager
+from typing import TypeVar
+
+from bibliotracker.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class UpstreamUnavailable(Exception):
+    """
+    Raised when a call is rejected by a rate limiter or an open circuit breaker.
+    """
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting the request rate to an upstream service.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: int) -> None:
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate_per_second (float): Tokens added per second.
+            capacity (int): Maximum burst size.
+        """
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_second)
+        self._updated_at = now
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def try_acquire(self, timeout: float = 0.0) -> bool:
+        """
+        Take one token, waiting up to `timeout` seconds for one to become available.
+
+        Returns:
+            bool: True if a token was taken, False if the wait would exceed `timeout`.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait_seconds = (1 - self._tokens) / self.rate_per_second
+            if time.monotonic() + wait_seconds > deadline:
+                return False
+            time.sleep(wait_seconds)
+
+
+class CircuitBreaker:
+    """
+    Fails fast once the recent error rate of an upstream crosses a threshold.
+
+    The breaker opens when at least `min_calls` outcomes were recorded in the
+    last `window_seconds` and the failure ratio reaches `failure_ratio`. After
+    `cooldown_seconds` a single probe call is let through (half-open); its
+    outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_ratio: float = 0.5,
+        min_calls: int = 5,
+        window_seconds: float = 30.0,
+        cooldown_seconds: float = 15.0,
+    ) -> None:
+        self.failure_ratio = failure_ratio
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if (
+                self._state == self.OPEN
+                and time.monotonic() - self._opened_at >= self.cooldown_seconds
+            ):
+                return self.HALF_OPEN
+            return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Return True if a call may be attempted now.
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if time.monotonic() - self._opened_at < self.cooldown_seconds:
+                return False
+            # Cooldown elapsed: let exactly one probe through
+            if self._probe_in_flight:
+                return False
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._probe_in_flight = False
+            if self._state == self.OPEN:
+                # A call that started before the circuit opened; not a probe
+                return
+            if self._state == self.HALF_OPEN:
+                logger.info("Circuit closed after successful probe")
+                self._state = self.CLOSED
+            self._record(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._probe_in_flight = False
+            if self._state == self.OPEN:
+                return
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+            self._record(False)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            if (
+                len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.failure_ratio
+            ):
+                self._open()
+
+    def release_probe(self) -> None:
+        """
+        Give back a probe slot that was granted but never used.
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _record(self, ok: bool) -> None:
+        now = time.monotonic()
+        self._outcomes.append((now, ok))
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+
+    def _open(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+
+
+class Upstream:
+    """
+    Rate limiter and circuit breaker guarding calls to one external service.
+    """
+
+    def __init__(self, name: str, bucket: TokenBucket, breaker: CircuitBreaker) -> None:
+        self.name = name
+        self.bucket = bucket
+        self.breaker = breaker
+
+    def call(
+        self,
+        fn: Callable[[], T],
+        acquire_timeout: float = 0.0,
+        is_failure: Callable[[Exception], bool] = lambda error: True,
+    ) -> T:
+        """
+        Run `fn` if the circuit is closed and a rate-limit token is available.
+
+        Args:
+            fn (Callable): The upstream call.
+            acquire_timeout (float): How long to wait for a rate-limit token.
+            is_failure (Callable): Decides whether an exception counts against
+                the circuit breaker (e.g. client errors should not).
+
+        Raises:
+            UpstreamUnavailable: If the circuit is open or no token was available.
+        """
+        if not self.breaker.allow_request():
+            metrics.increment(f"upstream.{self.name}.rejected.circuit_open")
+            raise UpstreamUnavailable(f"{self.name} circuit is open")
+        if not self.bucket.try_acquire(acquire_timeout):
+            metrics.increment(f"upstream.{self.name}.rejected.rate_limited")
+            self.breaker.release_probe()
+            raise UpstreamUnavailable(f"{self.name} rate limit exceeded")
+
+        start = time.perf_counter()
+        try:
+            result = fn()
+        except Exception as error:
+            if is_failure(error):
+                metrics.increment(f"upstream.{self.name}.failures")
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            raise
+        finally:
+            metrics.observe(
+                f"upstream.{self.name}.latency", time.perf_counter() - start
+            )
+
+        metrics.increment(f"upstream.{self.name}.successes")
+        self.breaker.record_success()
+        return result
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.breaker.state,
+            "tokens_available": round(self.bucket.available, 2),
+        }
+
+
+class PriorityScheduler:
+    """
+    Admits work to a shared upstream through priority lanes.
+
+    Lanes are given highest priority first. A lane starts work only while it
+    is under its concurrency cap, no higher-priority lane has callers
+    waiting, and `has_capacity(lane)` agrees (e.g. enough rate-limit tokens
+    are left over). Lower lanes therefore only use capacity the higher ones
+    are not asking for.
+    """
+
+    def __init__(
+        self,
+        lane_limits: dict[str, int],
+        has_capacity: Callable[[str], bool] = lambda lane: True,
+        recheck_seconds: float = 0.25,
+    ) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            lane_limits (dict[str, int]): Concurrency cap per lane, highest
+                priority first.
+            has_capacity (Callable): Extra admission check per lane. It may
+                change without notifying the scheduler (e.g. a refilling
+                token bucket), so waiters re-check it every `recheck_seconds`.
+            recheck_seconds (float): Polling interval for `has_capacity`.
+        """
+        self.lanes = list(lane_limits)
+        self.lane_limits = dict(lane_limits)
+        self.has_capacity = has_capacity
+        self.recheck_seconds = recheck_seconds
+        self._active = dict.fromkeys(self.lanes, 0)
+        self._waiting = dict.fromkeys(self.lanes, 0)
+        self._condition = threading.Condition()
+
+    def _can_start(self, lane: str) -> bool:
+        if self._active[lane] >= self.lane_limits[lane]:
+            return False
+        for higher in self.lanes[: self.lanes.index(lane)]:
+            if self._waiting[higher]:
+                return False
+        return self.has_capacity(lane)
+
+    @contextmanager
+    def slot(self, lane: str) -> Iterator[None]:
+        """
+        Block until `lane` may start work, and hold a slot for the block.
+
+        Raises:
+            KeyError: If `lane` is unknown.
+        """
+        if lane not in self._active:
+            raise KeyError(f"Unknown lane '{lane}', expected one of {self.lanes}")
+        started = time.perf_counter()
+        with self._condition:
+            self._waiting[lane] += 1
+            try:
+                while not self._can_start(lane):
+                    self._condition.wait(timeout=self.recheck_seconds)
+            finally:
+                self._waiting[lane] -= 1
+            self._active[lane] += 1
+        metrics.observe(f"scheduler.wait.{lane}", time.perf_counter() - started)
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active[lane] -= 1
+                self._condition.notify_all()
+
+    def snapshot(self) -> dict:
+        with self._condition:
+            return {
+                lane: {
+                    "active": self._active[lane],
+                    "waiting": self._waiting[lane],
+                    "limit": self.lane_limits[lane],
+                }
+                for lane in self.lanes
+            }
+
+
+def hedged_call(
+    fn: Callable[[], T],
+    hedge_after: float,
+    executor: Executor,
+    can_hedge: Callable[[], bool] = lambda: True,
+    name: str = "hedged",
+) -> T:
+    """
+    Run `fn`, starting a duplicate if the first attempt is slower than `hedge_after`.
+
+    Only use this for idempotent calls. The first attempt to succeed wins; if
+    both fail, the last error is raised.
+
+    Args:
+        fn (Callable): The idempotent call to make.
+        hedge_after (float): Seconds to wait before sending the duplicate.
+        executor (Executor): Pool used to run the attempts.
+        can_hedge (Callable): Checked before sending the duplicate, e.g. to take
+            a rate-limit token for it.
+        name (str): Metric prefix.
+    """
+    primary = executor.submit(fn)
+    try:
+        return primary.result(timeout=hedge_after)
+    except TimeoutError:
+        if not can_hedge():
+            return primary.result()
+
+    metrics.increment(f"{name}.hedges")
+    hedge = executor.submit(fn)
+    pending: set[Future] = {primary, hedge}
+    error: BaseException | None = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is hedge:
+                    metrics.increment(f"{name}.hedge_wins")
+                return future.result()
+            error = future.exception()
+    raise error
+
+
+_upstreams: dict[str, Upstream] = {}
+_registry_lock = threading.Lock()
+
+
+def get_upstream(name: str, rate_per_second: float, capacity: int) -> Upstream:
+    """
+    Return the shared Upstream for `name`, creating it on first use.
+    """
+    with _registry_lock:
+        if name not in _upstreams:
+            _upstreams[name] = Upstream(
+                name, TokenBucket(rate_per_second, capacity), CircuitBreaker()
+            )
+        return _upstreams[name]
+
+
+def upstreams_snapshot() -> dict:
+    """
+    Return the circuit state and remaining tokens of every registered upstream.
+    """
+    with _registry_lock:
+        return {name: upstream.snapshot() for name, upstream in _upstreams.items()}
@@ -7,31 +7,73 @@ const prevBtn = document.getElementById('prevPage');
 const nextBtn = document.getElementById('nextPage');
 const pageInfo = document.getElementById('pageInfo');
 
+// The list this page shows; /lists/<slug> pages name it in a meta tag
+const listMeta = document.querySelector('meta[name="list"]');
+const listSlug = listMeta ? listMeta.content : 'default';
+
+// Scope every API request to that list
+const nativeFetch = window.fetch.bind(window);
+window.fetch = (url, options = {}) => {
+    if (typeof url === 'string' && url.startsWith('/api/')) {
+        options = { ...options, headers: { ...options.headers, 'X-List': listSlug } };
+    }
+    return nativeFetch(url, options);
+};
+
 // Search Pagination State
 let debounceTimer;
 let currentSearchPage = 1;
 let isSearching = false;
 let hasMoreResults = true;
 let currentQuery = '';
+// The first page may come from local suggestions; further pages then query Google Books
+let searchRemote = false;
+let shownSearchKeys = new Set();
 
 let currentPage = 1;
 const pageSize = 12;
+let selectionMode = false;
+const selectedBookIds = new Set();
 let currentBooksData = [];
+let currentTotal = 0;
+// Cards never show the description; the details modal fetches it on demand
+const listFields = 'title,author,region,subjects,is_fiction,is_owned';
+const descriptionCache = new Map();
 
-// Filter state
+// Live updates state
+let eventSource = null;
+let facetRefreshTimer;
+
+// Filter & sort state
 let activeFilter = 'all';
+let activeSort = 'added';
 
 function getFilterParams() {
-    if (activeFilter === 'fiction') return '&fiction=Fiction';
-    if (activeFilter === 'nonfiction') return '&fiction=Non-Fiction';
-    if (activeFilter === 'owned') return '&owned=true';
-    return '';
+    let params = `&sort=${activeSort}`;
+    if (activeFilter === 'fiction') params += '&fiction=Fiction';
+    if (activeFilter === 'nonfiction') params += '&fiction=Non-Fiction';
+    if (activeFilter === 'owned') params += '&owned=true';
+    return params;
 }
 
 // Initial load
 document.addEventListener('DOMContentLoaded', () => {
-    fetchBooks(1);
+    bookGrid.classList.toggle('virtual', virtualMode);
+    const viewToggle = document.getElementById('viewToggle');
+    viewToggle.classList.toggle('active', virtualMode);
+    viewToggle.addEventListener('click', () => setVirtualMode(!virtualMode));
+    if (listSlug !== 'default') {
+        document.querySelector('.stats-link').href = `/static/stats.html?list=${encodeURIComponent(listSlug)}`;
+    }
+
+    document.getElementById('selectToggle').addEventListener('click', () => setSelectionMode(!selectionMode));
+    document.querySelectorAll('[data-bulk]').forEach(btn => {
+        btn.addEventListener('click', () => runBulkAction(btn.dataset.bulk));
+    });
+
+    if (!renderInitialState()) fetchBooks(1);
     checkAdmin();
+    connectLiveUpdates();
 
     // Filter bar
     document.querySelectorAll('.filter-btn').forEach(btn => {
@@ -42,39 +84,151 @@ document.addEventListener('DOMContentLoaded', () => {
             fetchBooks(1);
         });
     });
+
+    document.getElementById('sortSelect').addEventListener('change', (e) => {
+        activeSort = e.target.value;
+        fetchBooks(1);
+    });
 });
 
+// Page cache: memory first, IndexedDB across reloads. Cached pages render
+// instantly and are revalidated in the background with their ETag.
+const pageCache = new Map();
+const PAGE_DB_NAME = 'bibliotracker';
+const PAGE_STORE = 'pages';
+let pageDbPromise = null;
+
+function openPageDb() {
+    if (!window.indexedDB) return Promise.resolve(null);
+    if (!pageDbPromise) {
+        pageDbPromise = new Promise((resolve) => {
+            const request = indexedDB.open(PAGE_DB_NAME, 1);
+            request.onupgradeneeded = () => request.result.createObjectStore(PAGE_STORE);
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => resolve(null);
+        });
+    }
+    return pageDbPromise;
+}
+
+async function pageDbRequest(mode, action) {
+    const db = await openPageDb();
+    if (!db) return null;
+    return new Promise((resolve) => {
+        const request = action(db.transaction(PAGE_STORE, mode).objectStore(PAGE_STORE));
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => resolve(null);
+    });
+}
+
+function pageKey(page) {
+    return `${listSlug}|${page}|${pageSize}${getFilterParams()}`;
+}
+
+async function getCachedPage(key) {
+    if (pageCache.has(key)) return pageCache.get(key);
+    const entry = await pageDbRequest('readonly', store => store.get(key));
+    if (entry) pageCache.set(key, entry);
+    return entry || null;
+}
+
+function storePage(key, entry) {
+    pageCache.set(key, entry);
+    pageDbRequest('readwrite', store => store.put(entry, key));
+}
+
+// Any change can shift books between pages, so drop every cached page
+function invalidatePageCache() {
+    pageCache.clear();
+    pageDbRequest('readwrite', store => store.clear());
+}
+
+// Fetch a page, revalidating `cached` if given. Returns the fresh entry, the
+// cached one when unchanged (304), or null on failure.
+async function loadPage(page, key, cached = null) {
+    const url = `/api/toread?page=${page}&size=${pageSize}${getFilterParams()}&facets=true&fields=${listFields}`;
+    const headers = cached && cached.etag ? { 'If-None-Match': cached.etag } : {};
+    try {
+        const res = await fetch(url, { headers });
+        if (res.status === 304) return cached;
+        if (!res.ok) throw new Error(`HTTP ${res.status}`);
+        const entry = { data: await res.json(), etag: res.headers.get('ETag') };
+        storePage(key, entry);
+        return entry;
+    } catch (error) {
+        console.error("Error fetching books:", error);
+        return null;
+    }
+}
+
+function prefetchPage(page, totalPages) {
+    if (page > totalPages) return;
+    const key = pageKey(page);
+    if (pageCache.has(key)) return;
+    loadPage(page, key);
+}
+
+function showPage(data) {
+    currentBooksData = data.items;
+    currentTotal = data.total;
+    renderFacetCounts(data.facets);
+    try {
+        renderBooks(data.items);
+        renderPagination(data);
+    } catch (renderError) {
+        console.error("Error rendering books:", renderError);
+        bookGrid.innerHTML = '<div class="error-state">Something went wrong showing your books.</div>';
+    }
+}
+
 async function fetchBooks(page = 1) {
     currentPage = page;
-    try {
-        const res = await fetch(`/api/toread?page=${page}&size=${pageSize}${getFilterParams()}`);
-        const data = await res.json();
-        
-        currentBooksData = data.items;
-        
-        // Smooth Transition: Fade Out
+    if (virtualMode) return loadVirtualChunk(true);
+    const key = pageKey(page);
+    const cached = await getCachedPage(key);
+    let entry = cached;
+
+    if (cached) {
+        showPage(cached.data);
+        loadPage(page, key, cached).then(fresh => {
+            // Re-render only if the page changed and is still the one shown
+            if (fresh && fresh !== cached && pageKey(currentPage) === key) showPage(fresh.data);
+        });
+    } else {
+        // Smooth Transition: fade out while the request is in flight
+        const started = performance.now();
         bookGrid.classList.add('fade-out');
-        
-        setTimeout(() => {
-            try {
-                renderBooks(data.items);
-                renderPagination(data);
-            } catch (renderError) {
-                console.error("Error rendering books:", renderError);
-                bookGrid.innerHTML = '<div class="error-state">Something went wrong showing your books.</div>';
-            } finally {
-                // Smooth Transition: Fade In
-                bookGrid.classList.remove('fade-out');
-                bookGrid.classList.add('fade-in');
-                setTimeout(() => bookGrid.classList.remove('fade-in'), 400);
-            }
-            
-            // Scroll to top of list section smoothly
-            document.querySelector('.toread-section').scrollIntoView({ behavior: 'smooth' });
-        }, 400);
+        entry = await loadPage(page, key);
+        await new Promise(r => setTimeout(r, Math.max(0, 300 - (performance.now() - started))));
+        bookGrid.classList.remove('fade-out');
+        if (!entry || pageKey(currentPage) !== key) return;
+        showPage(entry.data);
+        bookGrid.classList.add('fade-in');
+        setTimeout(() => bookGrid.classList.remove('fade-in'), 400);
+    }
 
+    // Scroll to top of list section smoothly
+    document.querySelector('.toread-section').scrollIntoView({ behavior: 'smooth' });
+    if (entry) prefetchPage(page + 1, entry.data.total_pages);
+}
+
+// The server may inline the first page (SSR_FIRST_PAGE) to save a round-trip
+function renderInitialState() {
+    const stateEl = document.getElementById('initialState');
+    if (!stateEl || virtualMode) return false;
+    try {
+        const data = JSON.parse(stateEl.textContent);
+        currentPage = 1;
+        currentBooksData = data.items;
+        currentTotal = data.total;
+        renderFacetCounts(data.facets);
+        renderBooks(data.items);
+        renderPagination(data);
+        prefetchPage(2, data.total_pages);
+        return true;
     } catch (error) {
-        console.error("Error fetching books:", error);
+        console.error("Error reading initial state:", error);
+        return false;
     }
 }
 
@@ -91,61 +245,201 @@ function renderBooks(books) {
         card.className = 'book-card';
         // Stagger: each card delayed 60ms more than previous
         card.style.setProperty('--delay', `${index * 60}ms`);
+        fillCard(card, book, index);
+        bookGrid.appendChild(card);
+    });
+}
 
-        card.onclick = (e) => {
-            if (!e.target.closest('.owned-toggle') && !e.target.closest('.delete-btn')) {
-                openBookDetails(book);
-            }
-        };
-
-        // Determine Owned UI
-        let ownedUI = '';
-        if (adminPassword) {
-            // Admin Toggle
-            ownedUI = `
-                <div class="owned-toggle" onclick="toggleOwnership(${book.id}, ${book.is_owned}, this)">
-                    <span class="toggle-icon">${book.is_owned ? '✅' : '⬜'}</span>
-                    <span class="toggle-text">${book.is_owned ? 'Owned' : 'Mark as Owned'}</span>
-                </div>
-                <div class="delete-btn" onclick="event.stopPropagation(); deleteBook(${book.id}, '${book.title.replace(/'/g, "\\'")}')" title="Delete Book">
-                    🗑️
-                </div>
-            `;
-        } else {
-            // Guest Badge (Static)
-            ownedUI = book.is_owned ? '<span class="owned-tag">✅ Owned</span>' : '';
+function fillCard(card, book, index) {
+    // Virtual mode can't rely on nth-child for the card colour
+    card.dataset.tone = (index % 6) + 1;
+    card.classList.toggle('selected', selectedBookIds.has(book.id));
+    card.onclick = (e) => {
+        if (selectionMode) {
+            toggleBookSelection(book.id, card);
+        } else if (!e.target.closest('.owned-toggle') && !e.target.closest('.delete-btn')) {
+            openBookDetails(book);
         }
+    };
 
-        const initial = book.title.charAt(0).toUpperCase();
-        const categoryClass = book.is_fiction === 'Fiction' ? 'tag-fiction'
-            : book.is_fiction === 'Non-Fiction' ? 'tag-nonfiction'
-            : 'tag-unknown';
-
-        card.innerHTML = `
-            <div class="book-cover">
-                <span class="cover-letter">${initial}</span>
-                <h3 class="book-title">${book.title}</h3>
-                <p class="book-author">by ${book.author}</p>
+    // Determine Owned UI
+    let ownedUI = '';
+    if (adminPassword) {
+        // Admin Toggle
+        ownedUI = `
+            <div class="owned-toggle" onclick="toggleOwnership(${book.id}, ${book.is_owned}, this)">
+                <span class="toggle-icon">${book.is_owned ? '✅' : '⬜'}</span>
+                <span class="toggle-text">${book.is_owned ? 'Owned' : 'Mark as Owned'}</span>
             </div>
-            <div class="book-footer">
-                <div class="book-meta">
-                    <span class="location">📍 ${book.region}</span>
-                    <span class="category-tag ${categoryClass}">${book.is_fiction || '—'}</span>
-                </div>
-                <div class="book-tags">
-                    ${book.subjects.map(s => `<span class="tag">${s}</span>`).join('')}
-                </div>
-                ${ownedUI}
+            <div class="delete-btn" onclick="event.stopPropagation(); deleteBook(${book.id}, '${book.title.replace(/'/g, "\\'")}')" title="Delete Book">
+                🗑️
             </div>
         `;
-        bookGrid.appendChild(card);
-    });
+    } else {
+        // Guest Badge (Static)
+        ownedUI = book.is_owned ? '<span class="owned-tag">✅ Owned</span>' : '';
+    }
+
+    const initial = book.title.charAt(0).toUpperCase();
+    const categoryClass = book.is_fiction === 'Fiction' ? 'tag-fiction'
+        : book.is_fiction === 'Non-Fiction' ? 'tag-nonfiction'
+        : 'tag-unknown';
+
+    card.innerHTML = `
+        <div class="book-cover">
+            <span class="cover-letter">${initial}</span>
+            <h3 class="book-title">${book.title}</h3>
+            <p class="book-author">by ${book.author}</p>
+        </div>
+        <div class="book-footer">
+            <div class="book-meta">
+                <span class="location">📍 ${book.region}</span>
+                <span class="category-tag ${categoryClass}">${book.is_fiction || '—'}</span>
+            </div>
+            <div class="book-tags">
+                ${book.subjects.map(s => `<span class="tag">${s}</span>`).join('')}
+            </div>
+            ${ownedUI}
+        </div>
+    `;
+}
+
+// Virtualized infinite scroll: only cards near the viewport are in the DOM.
+// They are absolutely positioned in a grid sized for the whole list and
+// recycled as it scrolls, while further chunks stream in by cursor.
+const VIRTUAL_CHUNK = 60;
+const VIRTUAL_OVERSCAN_ROWS = 2;
+let virtualMode = localStorage.getItem('virtualScroll') === 'true';
+let virtualCursor = null;     // next_cursor from the API; null once all loaded
+let virtualLoading = false;
+let virtualGeneration = 0;    // bumped on reset so stale responses are dropped
+let virtualFrame = null;
+const virtualCards = new Map(); // book index -> card node
+const virtualPool = [];
+
+function resetVirtualGrid() {
+    bookGrid.innerHTML = '';
+    bookGrid.style.height = '';
+    virtualCards.clear();
+    virtualPool.length = 0;
+}
+
+function setVirtualMode(enabled) {
+    virtualMode = enabled;
+    localStorage.setItem('virtualScroll', String(enabled));
+    bookGrid.classList.toggle('virtual', enabled);
+    document.getElementById('viewToggle').classList.toggle('active', enabled);
+    resetVirtualGrid();
+    fetchBooks(1);
+}
+
+async function loadVirtualChunk(reset = false) {
+    if (reset) {
+        virtualGeneration += 1;
+        virtualCursor = '';
+        virtualLoading = false;
+        currentBooksData = [];
+        currentTotal = 0;
+        resetVirtualGrid();
+    }
+    if (virtualLoading || virtualCursor === null) return;
+
+    virtualLoading = true;
+    const generation = virtualGeneration;
+    const facets = reset ? '&facets=true' : '';
+    try {
+        const res = await fetch(`/api/toread?size=${VIRTUAL_CHUNK}&cursor=${encodeURIComponent(virtualCursor)}${getFilterParams()}&fields=${listFields}${facets}`);
+        if (!res.ok) throw new Error(`HTTP ${res.status}`);
+        const data = await res.json();
+        if (generation !== virtualGeneration) return;
+
+        currentBooksData = currentBooksData.concat(data.items);
+        currentTotal = data.total;
+        virtualCursor = data.next_cursor;
+        renderFacetCounts(data.facets);
+        renderVirtual();
+    } catch (error) {
+        console.error("Error fetching books:", error);
+    } finally {
+        if (generation === virtualGeneration) virtualLoading = false;
+    }
+}
+
+function scheduleVirtualRender() {
+    if (!virtualMode || virtualFrame) return;
+    virtualFrame = requestAnimationFrame(() => renderVirtual());
+}
+
+// Pass `refill` when books changed so visible cards are rebuilt
+function renderVirtual(refill = false) {
+    virtualFrame = null;
+    if (currentTotal === 0) {
+        resetVirtualGrid();
+        bookGrid.innerHTML = '<div class="empty-list">Your to-read list is empty. Start adding books!</div>';
+        return;
+    }
+    const emptyState = bookGrid.querySelector('.empty-list');
+    if (emptyState) emptyState.remove();
+
+    const style = getComputedStyle(bookGrid);
+    const columns = window.matchMedia('(max-width: 768px)').matches ? 1 : 3;
+    const gap = parseFloat(style.columnGap) || 0;
+    const columnWidth = (bookGrid.clientWidth - gap * (columns - 1)) / columns;
+    const rowStride = parseFloat(style.getPropertyValue('--virtual-card-height')) + gap;
+    const rows = Math.ceil(currentTotal / columns);
+    bookGrid.style.height = `${rows * rowStride - gap}px`;
+
+    const scrolled = -bookGrid.getBoundingClientRect().top;
+    const firstRow = Math.max(0, Math.floor(scrolled / rowStride) - VIRTUAL_OVERSCAN_ROWS);
+    const lastRow = Math.min(rows - 1, Math.floor((scrolled + window.innerHeight) / rowStride) + VIRTUAL_OVERSCAN_ROWS);
+    const start = firstRow * columns;
+    const end = Math.min(currentBooksData.length, (lastRow + 1) * columns);
+
+    // Recycle cards that left the window
+    for (const [index, card] of virtualCards) {
+        if (refill || index < start || index >= end) {
+            card.hidden = true;
+            virtualPool.push(card);
+            virtualCards.delete(index);
+        }
+    }
+
+    for (let index = start; index < end; index++) {
+        if (virtualCards.has(index)) continue;
+        let card = virtualPool.pop();
+        if (!card) {
+            card = document.createElement('div');
+            card.className = 'book-card';
+            bookGrid.appendChild(card);
+        }
+        fillCard(card, currentBooksData[index], index);
+        card.style.width = `${columnWidth}px`;
+        card.style.left = `${(index % columns) * (columnWidth + gap)}px`;
+        card.style.top = `${Math.floor(index / columns) * rowStride}px`;
+        card.hidden = false;
+        virtualCards.set(index, card);
+    }
+
+    // Stream the next chunk before the user reaches the end of what's loaded
+    if ((lastRow + 1 + VIRTUAL_OVERSCAN_ROWS) * columns >= currentBooksData.length) {
+        loadVirtualChunk();
+    }
+}
+
+window.addEventListener('scroll', scheduleVirtualRender, { passive: true });
+window.addEventListener('resize', () => {
+    if (virtualMode) renderVirtual(true);
+});
+
+function renderGrid() {
+    if (virtualMode) renderVirtual(true);
+    else renderBooks(currentBooksData);
 }
 
 function renderPagination(data) {
     const { page, total_pages, total } = data;
     
-    if (total === 0) {
+    if (total === 0 || virtualMode) {
         paginationControls.classList.add('hidden');
         return;
     }
@@ -157,6 +451,138 @@ function renderPagination(data) {
     nextBtn.disabled = page === total_pages;
 }
 
+function renderFacetCounts(facets) {
+    if (!facets) return;
+    document.querySelectorAll('.facet-count').forEach(el => {
+        const count = facets[el.dataset.facet];
+        el.textContent = count === undefined ? '' : count;
+    });
+}
+
+// Counts span every facet, so any live change may move them; batch refreshes
+function scheduleFacetRefresh() {
+    clearTimeout(facetRefreshTimer);
+    facetRefreshTimer = setTimeout(async () => {
+        try {
+            const res = await fetch('/api/toread?page=1&size=1&facets=true');
+            renderFacetCounts((await res.json()).facets);
+        } catch (error) {
+            console.error("Error refreshing facet counts:", error);
+        }
+    }, 1000);
+}
+
+// Live Updates (Server-Sent Events)
+function connectLiveUpdates() {
+    if (!window.EventSource) return;
+    eventSource = new EventSource(`/api/events?list=${encodeURIComponent(listSlug)}`);
+    eventSource.addEventListener('book_added', (e) => {
+        applyBookAdded(JSON.parse(e.data));
+        scheduleFacetRefresh();
+    });
+    eventSource.addEventListener('book_deleted', (e) => {
+        applyBookDeleted(JSON.parse(e.data));
+        scheduleFacetRefresh();
+    });
+    eventSource.addEventListener('book_updated', (e) => {
+        applyBookUpdated(JSON.parse(e.data));
+        scheduleFacetRefresh();
+    });
+    eventSource.addEventListener('books_updated', (e) => {
+        applyBooksUpdated(JSON.parse(e.data));
+        scheduleFacetRefresh();
+    });
+    eventSource.addEventListener('books_deleted', (e) => {
+        applyBooksDeleted(JSON.parse(e.data));
+        scheduleFacetRefresh();
+    });
+    eventSource.addEventListener('enrichment_completed', (e) => applyBookUpdated(JSON.parse(e.data)));
+    eventSource.addEventListener('resync', () => {
+        invalidatePageCache();
+        fetchBooks(currentPage);
+    });
+}
+
+function isLive() {
+    return eventSource !== null && eventSource.readyState === EventSource.OPEN;
+}
+
+function matchesActiveFilter(book) {
+    if (activeFilter === 'fiction') return book.is_fiction === 'Fiction';
+    if (activeFilter === 'nonfiction') return book.is_fiction === 'Non-Fiction';
+    if (activeFilter === 'owned') return !!book.is_owned;
+    return true;
+}
+
+function rerenderCurrentPage() {
+    renderGrid();
+    renderPagination({
+        page: currentPage,
+        total: currentTotal,
+        total_pages: Math.max(1, Math.ceil(currentTotal / pageSize)),
+    });
+}
+
+function applyBookAdded(book) {
+    invalidatePageCache();
+    if (!matchesActiveFilter(book)) return;
+    if (currentBooksData.some(b => b.id === book.id)) return;
+
+    currentTotal += 1;
+    // Newest books come first, so only page 1 shows the new card; other
+    // orders just pick it up on the next fetch
+    if (activeSort === 'added' && currentPage === 1) {
+        currentBooksData = [book, ...currentBooksData];
+        if (!virtualMode) currentBooksData = currentBooksData.slice(0, pageSize);
+    }
+    rerenderCurrentPage();
+}
+
+function applyBookDeleted({ id }) {
+    invalidatePageCache();
+    if (!currentBooksData.some(b => b.id === id)) return;
+
+    currentBooksData = currentBooksData.filter(b => b.id !== id);
+    currentTotal = Math.max(0, currentTotal - 1);
+    rerenderCurrentPage();
+}
+
+function applyBooksUpdated({ ids, is_owned }) {
+    invalidatePageCache();
+    const changed = new Set(ids);
+    const before = currentBooksData.length;
+    currentBooksData.forEach(book => {
+        if (changed.has(book.id)) book.is_owned = is_owned;
+    });
+    currentBooksData = currentBooksData.filter(book => !changed.has(book.id) || matchesActiveFilter(book));
+    currentTotal = Math.max(0, currentTotal - (before - currentBooksData.length));
+    rerenderCurrentPage();
+}
+
+function applyBooksDeleted({ ids }) {
+    invalidatePageCache();
+    const removed = new Set(ids);
+    ids.forEach(id => selectedBookIds.delete(id));
+    const before = currentBooksData.length;
+    currentBooksData = currentBooksData.filter(book => !removed.has(book.id));
+    currentTotal = Math.max(0, currentTotal - (before - currentBooksData.length));
+    updateBulkBar();
+    rerenderCurrentPage();
+}
+
+function applyBookUpdated(update) {
+    invalidatePageCache();
+    const book = currentBooksData.find(b => b.id === update.id);
+    if (!book) return;
+
+    Object.assign(book, update);
+    if (!matchesActiveFilter(book)) {
+        applyBookDeleted(book);
+        return;
+    }
+    rerenderCurrentPage();
+}
+
 prevBtn.addEventListener('click', () => {
     if (currentPage > 1) fetchBooks(currentPage - 1);
 });
@@ -178,28 +604,46 @@ searchInput.addEventListener('input', (e) => {
         currentQuery = query;
         currentSearchPage = 1;
         hasMoreResults = true;
+        searchRemote = false;
         fetchResults(query, 1);
     }, 300);
 });
 
-async function fetchResults(query, page = 1) {
+async function fetchResults(query, page = 1, append = page > 1) {
     if (isSearching) return;
     isSearching = true;
 
-    if (page === 1) {
+    if (!append) {
         dropdown.innerHTML = '<div class="dropdown-item"><span class="item-meta">Searching...</span></div>';
         dropdown.classList.remove('hidden');
     }
 
     try {
-        const res = await fetch(`/api/search?q=${encodeURIComponent(query)}&page=${page}`);
+        const remote = searchRemote ? '&remote=true' : '';
+        // Aggregated pages are fuller, so fewer scroll-triggered requests are needed
+        const res = await fetch(`/api/search?q=${encodeURIComponent(query)}&page=${page}${remote}&aggregate=true`);
         const data = await res.json();
 
+        if (!res.ok) {
+            hasMoreResults = false;
+            if (!append) {
+                dropdown.innerHTML = `<div class="dropdown-item"><span class="item-meta">${data.detail || 'Search failed'}</span></div>`;
+            }
+            return;
+        }
+
         if (data.length === 0) {
             hasMoreResults = false;
         }
 
-        renderDropdown(data, page);
+        renderDropdown(data, append);
+
+        if (data.length > 0 && data.every(book => book.source === 'local')) {
+            // Answered from suggestions: the next page is the first remote one
+            searchRemote = true;
+            currentSearchPage = 0;
+            renderMoreResultsItem();
+        }
     } catch (error) {
         console.error("Error fetching results:", error);
     } finally {
@@ -207,18 +651,30 @@ async function fetchResults(query, page = 1) {
     }
 }
 
-function renderDropdown(results, page) {
-    if (page === 1) {
+// Editions share a title and authors; the server dedupes within a page, this across pages
+function searchResultKey(book) {
+    const normalize = (text) => (text || '').toLowerCase().replace(/[^\p{L}\p{N}]+/gu, ' ').trim();
+    return `${normalize(book.title)}|${normalize(book.authors)}`;
+}
+
+function renderDropdown(results, append = false) {
+    if (!append) {
         dropdown.innerHTML = '';
+        shownSearchKeys = new Set();
     }
+    dropdown.querySelector('.more-results')?.remove();
     
-    if (results.length === 0 && page === 1) {
+    if (results.length === 0 && !append) {
         const empty = document.createElement('div');
         empty.className = 'dropdown-item';
         empty.innerHTML = '<span class="item-meta">No results found</span>';
         dropdown.appendChild(empty);
     } else {
         results.forEach(book => {
+            const resultKey = searchResultKey(book);
+            if (shownSearchKeys.has(resultKey)) return;
+            shownSearchKeys.add(resultKey);
+
             const item = document.createElement('div');
             item.className = 'dropdown-item';
             
@@ -227,32 +683,80 @@ function renderDropdown(results, page) {
                 <span class="item-meta">${book.authors}</span>
             `;
             
-            item.addEventListener('click', () => selectBook(book));
+            if (book.in_library) {
+                // Already on the list, so there is nothing to add
+                item.classList.add('in-library');
+                item.querySelector('.item-meta').textContent += ' · In your list';
+            } else {
+                item.addEventListener('click', () => selectBook(book));
+            }
             dropdown.appendChild(item);
         });
-        
-        // Setup Infinite Scroll
-        if (page === 1 && results.length > 0) {
-             // Listener already attached globally
-        }
     }
     
-    if (page === 1) {
+    if (!append) {
         dropdown.classList.remove('hidden');
         dropdown.scrollTop = 0;
     }
 }
 
+function renderMoreResultsItem() {
+    // Local suggestions are often too few to scroll, so offer the remote search explicitly
+    const more = document.createElement('div');
+    more.className = 'dropdown-item more-results';
+    more.innerHTML = '<span class="item-meta">Search Google Books for more…</span>';
+    more.addEventListener('click', (e) => {
+        e.stopPropagation();
+        loadMoreResults();
+    });
+    dropdown.appendChild(more);
+}
+
+function loadMoreResults() {
+    if (hasMoreResults && !isSearching) {
+        currentSearchPage++;
+        fetchResults(currentQuery, currentSearchPage, true);
+    }
+}
+
 // Dropdown Infinite Scroll
 dropdown.addEventListener('scroll', () => {
     if (dropdown.scrollTop + dropdown.clientHeight >= dropdown.scrollHeight - 50) {
-        if (hasMoreResults && !isSearching) {
-            currentSearchPage++;
-            fetchResults(currentQuery, currentSearchPage);
-        }
+        loadMoreResults();
     }
 });
 
+// Network errors are retried this many times with the same Idempotency-Key
+const ADD_RETRIES = 2;
+
+function newIdempotencyKey() {
+    return window.crypto?.randomUUID?.()
+        || `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+}
+
+// Each confirm click gets its own Idempotency-Key. Retries after a dropped
+// connection reuse it, so they replay the first outcome instead of enriching
+// again; a later click (e.g. re-adding a deleted book) is a new request.
+async function postAddBook(payload) {
+    const key = newIdempotencyKey();
+    for (let attempt = 0; ; attempt++) {
+        try {
+            return await fetch('/api/add', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'x-admin-password': adminPassword || '',
+                    'Idempotency-Key': key
+                },
+                body: JSON.stringify(payload)
+            });
+        } catch (error) {
+            if (attempt >= ADD_RETRIES) throw error;
+            await new Promise(r => setTimeout(r, 500 * 2 ** attempt));
+        }
+    }
+}
+
 async function selectBook(book) {
     if (!adminPassword) return; // double check
 
@@ -271,21 +775,15 @@ async function selectBook(book) {
                     subjects: book.subjects || [],
                 };
 
-                const res = await fetch('/api/add', {
-                    method: 'POST',
-                    headers: { 
-                        'Content-Type': 'application/json',
-                        'x-admin-password': adminPassword || ''
-                    },
-                    body: JSON.stringify(payload)
-                });
+                const res = await postAddBook(payload);
 
                 const data = await res.json();
 
                 if (res.ok) {
                     showToast(data.message);
                     searchInput.value = ''; // clear only on success
-                    fetchBooks(); // Refresh list
+                    // The book_added event patches the list when connected
+                    if (!isLive()) fetchBooks();
                 } else if (res.status === 409) {
                     // Book already exists — show a clear popup
                     showConfirmationModal(
@@ -327,7 +825,8 @@ async function toggleOwnership(bookId, currentStatus, element) {
         
         if (res.ok) {
             showToast("Updated ownership status");
-            fetchBooks(currentPage); 
+            applyBookUpdated({ id: bookId, is_owned: newStatus });
+            if (!isLive()) scheduleFacetRefresh();
         } else {
             showToast("Failed to update status", true);
             fetchBooks(currentPage);
@@ -354,7 +853,7 @@ const closeModalBtn = document.getElementById('closeModal');
 function openBookDetails(book) {
     document.getElementById('modalTitle').textContent = book.title;
     document.getElementById('modalAuthor').textContent = `by ${book.author}`;
-    document.getElementById('modalDescription').textContent = book.description || 'No description available.';
+    showBookDescription(book);
     document.getElementById('modalRegion').textContent = `📍 ${book.region}`;
     document.getElementById('modalCategory').textContent = book.is_fiction;
     
@@ -383,9 +882,58 @@ function openBookDetails(book) {
     const searchTerm = `${book.title} ${book.author}`;
     amazonLink.href = `https://www.amazon.de/s?k=${encodeURIComponent(searchTerm)}`;
     
+    showSimilarBooks(book);
     detailsModal.classList.remove('hidden');
 }
 
+async function showSimilarBooks(book) {
+    const section = document.getElementById('modalSimilar');
+    const list = document.getElementById('modalSimilarList');
+    section.dataset.bookId = book.id;
+    section.classList.add('hidden');
+    list.innerHTML = '';
+
+    let items = [];
+    try {
+        const res = await fetch(`/api/books/${book.id}/similar?limit=5`);
+        if (!res.ok) throw new Error(`HTTP ${res.status}`);
+        items = (await res.json()).items;
+    } catch (error) {
+        console.error("Error fetching similar books:", error);
+    }
+    // Another book may have been opened while this one was loading
+    if (section.dataset.bookId !== String(book.id) || items.length === 0) return;
+
+    items.forEach(similar => {
+        const item = document.createElement('li');
+        item.className = 'modal-similar-item';
+        item.textContent = `${similar.title} — ${similar.author}`;
+        item.addEventListener('click', () => openBookDetails(similar));
+        list.appendChild(item);
+    });
+    section.classList.remove('hidden');
+}
+
+async function showBookDescription(book) {
+    const descriptionEl = document.getElementById('modalDescription');
+    descriptionEl.dataset.bookId = book.id;
+    if (book.description !== undefined) descriptionCache.set(book.id, book.description);
+
+    if (!descriptionCache.has(book.id)) {
+        descriptionEl.textContent = 'Loading description…';
+        try {
+            const res = await fetch(`/api/books/${book.id}`);
+            if (!res.ok) throw new Error(`HTTP ${res.status}`);
+            descriptionCache.set(book.id, (await res.json()).description);
+        } catch (error) {
+            console.error("Error fetching book details:", error);
+        }
+    }
+    // Another book may have been opened while this one was loading
+    if (descriptionEl.dataset.bookId !== String(book.id)) return;
+    descriptionEl.textContent = descriptionCache.get(book.id) || 'No description available.';
+}
+
 closeModalBtn.addEventListener('click', () => {
     detailsModal.classList.add('hidden');
 });
@@ -413,7 +961,7 @@ let adminPassword = null;
 function checkAdmin() {
     // Rerender list to update card toggles if books are loaded
     if (currentBooksData && currentBooksData.length > 0) {
-         renderBooks(currentBooksData); 
+         renderGrid();
     }
 
     if (adminPassword) {
@@ -421,11 +969,17 @@ function checkAdmin() {
         searchSection.classList.remove('hidden');
         adminLoginBtn.classList.add('hidden');
         adminLogoutBtn.classList.remove('hidden');
+        selectToggle.classList.remove('hidden');
+        duplicatesToggle.classList.remove('hidden');
     } else {
         // Guest Mode
         searchSection.classList.add('hidden');
         adminLoginBtn.classList.remove('hidden');
         adminLogoutBtn.classList.add('hidden');
+        selectToggle.classList.add('hidden');
+        duplicatesToggle.classList.add('hidden');
+        duplicatesModal.classList.add('hidden');
+        if (selectionMode) setSelectionMode(false);
     }
 }
 
@@ -568,6 +1122,213 @@ if (confirmationModal) {
     });
 }
 
+// Multi-select: selections persist across pages and filters until cleared,
+// and bulk actions apply to all of them in one request
+const selectToggle = document.getElementById('selectToggle');
+const bulkBar = document.getElementById('bulkBar');
+
+function setSelectionMode(enabled) {
+    selectionMode = enabled;
+    if (!enabled) selectedBookIds.clear();
+    selectToggle.classList.toggle('active', enabled);
+    bookGrid.classList.toggle('selecting', enabled);
+    updateBulkBar();
+    renderGrid();
+}
+
+function toggleBookSelection(bookId, card) {
+    if (selectedBookIds.has(bookId)) selectedBookIds.delete(bookId);
+    else selectedBookIds.add(bookId);
+    card.classList.toggle('selected', selectedBookIds.has(bookId));
+    updateBulkBar();
+}
+
+function updateBulkBar() {
+    bulkBar.classList.toggle('hidden', !selectionMode);
+    document.getElementById('bulkCount').textContent = `${selectedBookIds.size} selected`;
+    bulkBar.querySelectorAll('[data-bulk]').forEach(btn => {
+        btn.disabled = selectedBookIds.size === 0;
+    });
+}
+
+async function runBulkAction(action) {
+    if (!adminPassword) return;
+    if (action === 'clear') {
+        selectedBookIds.clear();
+        updateBulkBar();
+        renderGrid();
+        return;
+    }
+
+    const bookIds = [...selectedBookIds];
+    const send = async () => {
+        const isDelete = action === 'delete';
+        try {
+            const res = await fetch(`/api/books/bulk-${isDelete ? 'delete' : 'update'}`, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'x-admin-password': adminPassword
+                },
+                body: JSON.stringify(isDelete
+                    ? { book_ids: bookIds }
+                    : { book_ids: bookIds, is_owned: action === 'own' })
+            });
+            const data = await res.json();
+
+            if (!res.ok) {
+                showToast(data.detail?.[0]?.msg || data.detail || "Bulk update failed", true);
+                return;
+            }
+            showToast(data.message);
+            if (isDelete) {
+                applyBooksDeleted({ ids: data.ids });
+            } else {
+                applyBooksUpdated({ ids: data.ids, is_owned: action === 'own' });
+            }
+            if (!isLive()) scheduleFacetRefresh();
+        } catch (error) {
+            console.error(error);
+            showToast("Error applying bulk update", true);
+        }
+    };
+
+    if (action === 'delete') {
+        showConfirmationModal(
+            `Are you sure you want to delete ${bookIds.length} books?`,
+            send,
+            "Delete",
+            "danger"
+        );
+    } else {
+        await send();
+    }
+}
+
+// Near-duplicate report: clusters found by the server-side MinHash sweep,
+// each merged into the book the admin chooses to keep
+const duplicatesToggle = document.getElementById('duplicatesToggle');
+const duplicatesModal = document.getElementById('duplicatesModal');
+const duplicateClusters = document.getElementById('duplicateClusters');
+const runDuplicateSweepBtn = document.getElementById('runDuplicateSweep');
+
+function renderDuplicateReport(report) {
+    const summary = document.getElementById('duplicatesSummary');
+    if (report.generated_at === null) {
+        summary.textContent = 'No sweep has run yet.';
+    } else {
+        const when = new Date(report.generated_at * 1000).toLocaleString();
+        summary.textContent = `${report.clusters.length} clusters in ${report.books_scanned} books, scanned ${when}`;
+    }
+
+    duplicateClusters.innerHTML = '';
+    report.clusters.forEach(cluster => {
+        const group = document.createElement('div');
+        group.className = 'duplicate-cluster';
+        const heading = document.createElement('div');
+        heading.className = 'duplicate-similarity';
+        heading.textContent = `~${Math.round(cluster.similarity * 100)}% similar`;
+        group.appendChild(heading);
+
+        cluster.books.forEach(book => {
+            const row = document.createElement('div');
+            row.className = 'duplicate-book';
+            const label = document.createElement('span');
+            label.textContent = `${book.title} — ${book.author}${book.is_owned ? ' ✅' : ''}`;
+            const keepBtn = document.createElement('button');
+            keepBtn.className = 'pagination-btn';
+            keepBtn.textContent = 'Keep';
+            keepBtn.title = 'Merge the others into this book';
+            keepBtn.addEventListener('click', () => mergeDuplicates(book, cluster, group));
+            row.append(label, keepBtn);
+            group.appendChild(row);
+        });
+        duplicateClusters.appendChild(group);
+    });
+}
+
+// How often the report is re-fetched while a background sweep runs
+const DUPLICATE_SWEEP_POLL_MS = 2000;
+
+async function fetchDuplicateReport() {
+    const res = await fetch('/api/admin/duplicates', {
+        headers: { 'x-admin-password': adminPassword }
+    });
+    if (!res.ok) throw new Error(`HTTP ${res.status}`);
+    return res.json();
+}
+
+async function loadDuplicateReport(sweep = false) {
+    if (!adminPassword) return;
+    runDuplicateSweepBtn.disabled = true;
+    try {
+        if (sweep) {
+            const res = await fetch('/api/admin/duplicates/sweep', {
+                method: 'POST',
+                headers: { 'x-admin-password': adminPassword }
+            });
+            if (!res.ok) throw new Error(`HTTP ${res.status}`);
+        }
+        // The sweep runs on the server in the background; poll until it's done
+        let report = await fetchDuplicateReport();
+        while (report.running) {
+            runDuplicateSweepBtn.textContent = 'Scanning…';
+            await new Promise(r => setTimeout(r, DUPLICATE_SWEEP_POLL_MS));
+            report = await fetchDuplicateReport();
+        }
+        renderDuplicateReport(report);
+    } catch (error) {
+        console.error(error);
+        showToast("Error loading duplicates", true);
+    } finally {
+        runDuplicateSweepBtn.disabled = false;
+        runDuplicateSweepBtn.textContent = 'Scan Library';
+    }
+}
+
+function mergeDuplicates(keep, cluster, group) {
+    const duplicateIds = cluster.books.filter(b => b.id !== keep.id).map(b => b.id);
+    showConfirmationModal(
+        `Merge ${duplicateIds.length} books into "${keep.title}"? The others will be deleted.`,
+        async () => {
+            try {
+                const res = await fetch('/api/books/merge', {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                        'x-admin-password': adminPassword
+                    },
+                    body: JSON.stringify({ keep_id: keep.id, duplicate_ids: duplicateIds })
+                });
+                const data = await res.json();
+                if (!res.ok) {
+                    showToast(data.detail || "Failed to merge books", true);
+                    return;
+                }
+                showToast(data.message);
+                group.remove();
+                applyBooksDeleted({ ids: data.ids });
+                applyBookUpdated(data.book);
+                if (!isLive()) scheduleFacetRefresh();
+            } catch (error) {
+                console.error(error);
+                showToast("Error merging books", true);
+            }
+        },
+        "Merge",
+        "primary"
+    );
+}
+
+duplicatesToggle.addEventListener('click', () => {
+    duplicatesModal.classList.remove('hidden');
+    loadDuplicateReport();
+});
+runDuplicateSweepBtn.addEventListener('click', () => loadDuplicateReport(true));
+document.getElementById('closeDuplicatesModal').addEventListener('click', () => {
+    duplicatesModal.classList.add('hidden');
+});
+
 async function deleteBook(bookId, bookTitle) {
     if (!adminPassword) return;
 
@@ -586,8 +1347,8 @@ async function deleteBook(bookId, bookTitle) {
 
                 if (res.ok) {
                     showToast("Book deleted");
-                    // Refresh list
-                    fetchBooks(currentPage);
+                    applyBookDeleted({ id: bookId });
+                    if (!isLive()) scheduleFacetRefresh();
                 } else {
                     showToast(data.detail || "Failed to delete book", true);
                 }
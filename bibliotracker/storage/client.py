@@ -1,19 +1,55 @@
+import itertools
+import json
 import logging
+import threading
+import time
 from collections import defaultdict
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta, timezone
+from typing import TypeVar
 
-from sqlalchemy import create_engine, delete, func, select, update
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import and_, create_engine, delete, func, or_, select, update
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.orm import Session, sessionmaker, undefer
 
 from bibliotracker.config import Config
-from bibliotracker.storage.models import Base, Book
+from bibliotracker.storage.models import (
+    DEFAULT_LIST_ID,
+    DEFAULT_LIST_SLUG,
+    Base,
+    Book,
+    IdempotencyKey,
+    ReadingList,
+)
+from bibliotracker.storage.pool import engine_options, pool_stats
+from bibliotracker.storage.query import (
+    MISSING_METADATA,
+    BookQuery,
+    existing_titles_query,
+    facet_counts_query,
+    missing_metadata_query,
+    timeline_baseline_query,
+    timeline_query,
+    title_lookup_query,
+)
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+def _owned_at(is_owned: bool):
+    # Re-marking an owned book keeps the date it was first marked
+    return func.coalesce(Book.owned_at, func.now()) if is_owned else None
+
 
 class PostgresClient:
     """
     Handles database operations for the book to-read list using SQLAlchemy.
+
+    Writes always use the primary. Read-only methods are spread across the
+    configured replicas, except for a short window after this process wrote
+    (read-your-writes) and for replicas that recently failed.
     """
 
     def __init__(self, app_config: Config) -> None:
@@ -23,37 +59,216 @@ class PostgresClient:
         Args:
             app_config (Config): Configuration object containing database credentials and host.
         """
-        self.engine = create_engine(
-            str(app_config.SQLALCHEMY_DATABASE_URI),
-            pool_pre_ping=True,  # emits a lightweight `SELECT 1` stmt before actual query
-            pool_size=5,  # keep pool small for free tiers
-            max_overflow=10,  # allow extra connections if needed
-        )
+        options = engine_options(app_config)
+        self.engine = create_engine(str(app_config.SQLALCHEMY_DATABASE_URI), **options)
         self.session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
 
-        # Ensure tables exist
-        self.initialize_schema()
+        self.replica_engines = [
+            create_engine(url, **options) for url in app_config.POSTGRES_REPLICA_URLS
+        ]
+        self.replica_sessions = [
+            sessionmaker(autocommit=False, autoflush=False, bind=engine)
+            for engine in self.replica_engines
+        ]
+        self.read_your_writes_seconds = app_config.READ_YOUR_WRITES_SECONDS
+        self.replica_retry_seconds = app_config.REPLICA_RETRY_SECONDS
+        self._replica_down_until = [0.0] * len(self.replica_engines)
+        self._replica_cursor = itertools.count()
+        self._last_write_at = float("-inf")
+        self._routing_lock = threading.Lock()
+        # Schema is managed by Alembic (`alembic upgrade head`); creating the
+        # engine does not connect, so construction never blocks on the database.
 
     def initialize_schema(self) -> None:
         """
-        Create all tables defined in the SQLAlchemy models.
+        Create all tables defined in the SQLAlchemy models and the default list
+        (for local experiments; deployments use Alembic migrations).
         """
         Base.metadata.create_all(bind=self.engine)
+        with self.session() as session:
+            if session.get(ReadingList, DEFAULT_LIST_ID) is None:
+                session.add(
+                    ReadingList(
+                        id=DEFAULT_LIST_ID, slug=DEFAULT_LIST_SLUG, name="Reading list"
+                    )
+                )
+                session.commit()
+
+    def warm_up(self, connections: int = 2) -> None:
+        """
+        Open pool connections ahead of the first request.
+
+        Args:
+            connections (int): Number of connections to establish.
+        """
+        opened = []
+        try:
+            for _ in range(connections):
+                connection = self.engine.connect()
+                connection.exec_driver_sql("SELECT 1")
+                opened.append(connection)
+        finally:
+            # Returning them to the pool keeps them open for reuse
+            for connection in opened:
+                connection.close()
+
+    def close(self) -> None:
+        """
+        Close all pooled connections.
+        """
+        self.engine.dispose()
+        for engine in self.replica_engines:
+            engine.dispose()
+
+    def pool_stats(self) -> dict:
+        """
+        Return connection pool statistics for the primary and each replica.
+        """
+        return {
+            "primary": pool_stats(self.engine),
+            "replicas": [pool_stats(engine) for engine in self.replica_engines],
+        }
+
+    def _mark_write(self) -> None:
+        """Route this process's reads to the primary for the read-your-writes window."""
+        with self._routing_lock:
+            self._last_write_at = time.monotonic()
+
+    def _replica_order(self) -> list[int]:
+        """
+        Return the indexes of replicas to try for a read, in round-robin order.
+        """
+        if not self.replica_sessions:
+            return []
+        now = time.monotonic()
+        with self._routing_lock:
+            if now - self._last_write_at < self.read_your_writes_seconds:
+                return []
+            healthy = [
+                index
+                for index, down_until in enumerate(self._replica_down_until)
+                if down_until <= now
+            ]
+            if not healthy:
+                return []
+            start = next(self._replica_cursor) % len(healthy)
+        return healthy[start:] + healthy[:start]
+
+    def _read(self, query: Callable[[Session], T]) -> T:
+        """
+        Run a read-only query on a replica, falling back to the primary.
+
+        Args:
+            query (Callable[[Session], T]): Executes the read using the given session.
 
-    def check_book_exists(self, book_title: str) -> bool:
+        Returns:
+            T: Whatever `query` returns.
+        """
+        for index in self._replica_order():
+            try:
+                with self.replica_sessions[index]() as session:
+                    return query(session)
+            except DBAPIError as error:
+                logger.warning(
+                    f"Replica {index} read failed, retrying elsewhere: {error}"
+                )
+                with self._routing_lock:
+                    self._replica_down_until[index] = (
+                        time.monotonic() + self.replica_retry_seconds
+                    )
+        with self.session() as session:
+            return query(session)
+
+    def check_book_exists(
+        self, book_title: str, list_id: int = DEFAULT_LIST_ID
+    ) -> bool:
         """
         Check if a book with the given title already exists in the database.
 
         Args:
             book_title (str): The title of the book to check (case-insensitive).
+            list_id (int): The list to look in. Defaults to the default list.
 
         Returns:
             bool: True if the book exists, False otherwise.
         """
-        with self.session() as session:
-            stmt = select(Book).where(func.lower(Book.title) == book_title.lower())
-            result = session.execute(stmt).first()
-            return result is not None
+        stmt = select(Book.id).where(
+            Book.list_id == list_id, func.lower(Book.title) == book_title.lower()
+        )
+        return self._read(lambda session: session.execute(stmt).first() is not None)
+
+    def get_existing_titles(
+        self, book_titles: list[str], list_id: int = DEFAULT_LIST_ID
+    ) -> set[str]:
+        """
+        Find which of the given titles are already in the database, in one query.
+
+        Args:
+            book_titles (list[str]): Titles to check (case-insensitive).
+            list_id (int): The list to look in. Defaults to the default list.
+
+        Returns:
+            set[str]: The lowercased titles that exist.
+        """
+        if not book_titles:
+            return set()
+        stmt = existing_titles_query(book_titles, list_id)
+        return self._read(lambda session: set(session.execute(stmt).scalars()))
+
+    def get_book_by_title(
+        self, book_title: str, list_id: int = DEFAULT_LIST_ID
+    ) -> Book | None:
+        """
+        Fetch a single book by its title (case-insensitive).
+
+        Args:
+            book_title (str): The title of the book to look up.
+            list_id (int): The list to look in. Defaults to the default list.
+
+        Returns:
+            Book | None: The matching Book instance, or None if not found.
+        """
+        stmt = title_lookup_query(book_title, list_id)
+        return self._read(lambda session: session.execute(stmt).scalars().first())
+
+    def get_book(self, book_id: int, list_id: int = DEFAULT_LIST_ID) -> Book | None:
+        """
+        Fetch a single book by ID, including its description.
+
+        Args:
+            book_id (int): The ID of the book.
+            list_id (int): The list to look in. Defaults to the default list.
+
+        Returns:
+            Book | None: The matching Book instance, or None if not found in
+                the list.
+        """
+        stmt = (
+            select(Book)
+            .options(undefer(Book.description))
+            .where(Book.id == book_id, Book.list_id == list_id)
+        )
+        return self._read(lambda session: session.execute(stmt).scalar_one_or_none())
+
+    def get_books_by_ids(
+        self, book_ids: list[int], list_id: int = DEFAULT_LIST_ID
+    ) -> list[Book]:
+        """
+        Fetch several books by ID in one query, without descriptions.
+
+        Args:
+            book_ids (list[int]): The IDs to look up.
+            list_id (int): The list to look in. Defaults to the default list.
+
+        Returns:
+            list[Book]: The books that exist, in the order of `book_ids`.
+        """
+        if not book_ids:
+            return []
+        stmt = select(Book).where(Book.list_id == list_id, Book.id.in_(book_ids))
+        books = self._read(lambda session: list(session.execute(stmt).scalars()))
+        by_id = {book.id: book for book in books}
+        return [by_id[book_id] for book_id in book_ids if book_id in by_id]
 
     def add_book(
         self,
@@ -64,6 +279,7 @@ class PostgresClient:
         book_subjects: list[str] | None = None,
         is_fiction_category: str | None = None,
         is_owned: bool = False,
+        list_id: int = DEFAULT_LIST_ID,
     ) -> tuple[bool, str]:
         """
         Add a new book record to the to-read list.
@@ -76,13 +292,20 @@ class PostgresClient:
             book_subjects (list[str], optional): List of genres/subjects. Defaults to None.
             is_fiction_category (str, optional): "Fiction" or "Non-Fiction". Defaults to None.
             is_owned (bool, optional): Whether the user owns this book. Defaults to False.
+            list_id (int): The list to add to. Defaults to the default list.
 
         Returns:
             tuple[bool, str]: A tuple of (success_status, status_message).
         """
         try:
-            if self.check_book_exists(book_title):
-                return False, f"'{book_title}' is already in your reading list."
+            # Checked on the primary: a lagging replica could miss a fresh add
+            with self.session() as session:
+                stmt = select(Book.id).where(
+                    Book.list_id == list_id,
+                    func.lower(Book.title) == book_title.lower(),
+                )
+                if session.execute(stmt).first() is not None:
+                    return False, f"'{book_title}' is already in your reading list."
 
             # Format subjects
             subjects_str = ", ".join(book_subjects[:5]) if book_subjects else None
@@ -95,11 +318,14 @@ class PostgresClient:
                 subjects=subjects_str,
                 is_fiction=is_fiction_category,
                 is_owned=is_owned,
+                owned_at=func.now() if is_owned else None,
+                list_id=list_id,
             )
 
             with self.session() as session:
                 session.add(new_book)
                 session.commit()
+            self._mark_write()
 
             return True, "Added to the To-Read List"
         except IntegrityError as error:
@@ -117,13 +343,17 @@ class PostgresClient:
             logger.error(f"DB Error: {error}")
             return False, str(error)
 
-    def update_book_ownership(self, book_id: int, is_owned: bool) -> bool:
+    def update_book_ownership(
+        self, book_id: int, is_owned: bool, list_id: int = DEFAULT_LIST_ID
+    ) -> bool:
         """
         Update the ownership status of a book.
 
         Args:
             book_id (int): The ID of the book to update.
             is_owned (bool): The new ownership status.
+            list_id (int): The list the book must be on. Defaults to the
+                default list.
 
         Returns:
             bool: True if successful, False if book not found.
@@ -133,43 +363,299 @@ class PostgresClient:
             with self.session() as session:
                 stmt = (
                     update(Book)
-                    .where(Book.id == book_id)
-                    .values(is_owned=is_owned)
+                    .where(Book.id == book_id, Book.list_id == list_id)
+                    .values(is_owned=is_owned, owned_at=_owned_at(is_owned))
                     .execution_options(synchronize_session="fetch")
                 )
                 result = session.execute(stmt)
                 session.commit()
+                self._mark_write()
                 return result.rowcount > 0
         except Exception as error:
             logger.error(f"DB Update Error: {error}")
             return False
 
-    def delete_book(self, book_id: int) -> bool:
+    def delete_book(self, book_id: int, list_id: int = DEFAULT_LIST_ID) -> bool:
         """
         Delete a book record from the database.
 
         Args:
             book_id (int): The ID of the book to delete.
+            list_id (int): The list the book must be on. Defaults to the
+                default list.
 
         Returns:
             bool: True if successful, False if book not found or error.
         """
         try:
             with self.session() as session:
-                stmt = delete(Book).where(Book.id == book_id)
+                stmt = delete(Book).where(Book.id == book_id, Book.list_id == list_id)
                 result = session.execute(stmt)
                 session.commit()
+                self._mark_write()
                 return result.rowcount > 0
         except Exception as error:
             logger.error(f"DB Delete Error: {error}")
             return False
 
+    def get_books_missing_metadata(
+        self, limit_records: int = 20, exclude_ids: list[int] | None = None
+    ) -> list[Book]:
+        """
+        Fetch books whose region, category or subjects are unknown, newest
+        first, from every list.
+
+        Args:
+            limit_records (int): Max number of books to return.
+            exclude_ids (list[int], optional): Books to skip, e.g. ones that
+                recently failed to enrich.
+
+        Returns:
+            list[Book]: The matching books, without descriptions.
+        """
+        stmt = missing_metadata_query(limit_records, exclude_ids or ())
+        return self._read(lambda session: list(session.execute(stmt).scalars()))
+
+    def update_book_metadata(self, book_id: int, metadata: dict) -> bool:
+        """
+        Fill in enrichment fields of an existing book, on whichever list it is.
+
+        Args:
+            book_id (int): The ID of the book to update.
+            metadata (dict): New "region", "is_fiction" and/or "subjects"
+                (a list); other keys are ignored.
+
+        Returns:
+            bool: True if successful, False if book not found or error.
+        """
+        values = {
+            field: metadata[field]
+            for field in ("region", "is_fiction")
+            if metadata.get(field)
+        }
+        if metadata.get("subjects"):
+            values["subjects"] = ", ".join(metadata["subjects"][:5])
+        if not values:
+            return False
+        try:
+            with self.session() as session:
+                stmt = (
+                    update(Book)
+                    .where(Book.id == book_id)
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+                result = session.execute(stmt)
+                session.commit()
+                self._mark_write()
+                return result.rowcount > 0
+        except Exception as error:
+            logger.error(f"DB Metadata Update Error: {error}")
+            return False
+
+    def update_books_ownership(
+        self, book_ids: list[int], is_owned: bool, list_id: int = DEFAULT_LIST_ID
+    ) -> list[int]:
+        """
+        Set the ownership status of many books in one statement and commit.
+
+        Args:
+            book_ids (list[int]): The IDs of the books to update.
+            is_owned (bool): The new ownership status.
+            list_id (int): The list the books must be on. Defaults to the
+                default list.
+
+        Returns:
+            list[int]: The IDs that existed on the list and were updated.
+        """
+        if not book_ids:
+            return []
+        with self.session() as session:
+            stmt = (
+                update(Book)
+                .where(Book.list_id == list_id, Book.id.in_(set(book_ids)))
+                .values(is_owned=is_owned, owned_at=_owned_at(is_owned))
+                .returning(Book.id)
+                .execution_options(synchronize_session=False)
+            )
+            updated = sorted(session.execute(stmt).scalars())
+            session.commit()
+        self._mark_write()
+        return updated
+
+    def delete_books(
+        self, book_ids: list[int], list_id: int = DEFAULT_LIST_ID
+    ) -> list[int]:
+        """
+        Delete many books in one statement and commit.
+
+        Args:
+            book_ids (list[int]): The IDs of the books to delete.
+            list_id (int): The list the books must be on. Defaults to the
+                default list.
+
+        Returns:
+            list[int]: The IDs that existed on the list and were deleted.
+        """
+        if not book_ids:
+            return []
+        with self.session() as session:
+            stmt = (
+                delete(Book)
+                .where(Book.list_id == list_id, Book.id.in_(set(book_ids)))
+                .returning(Book.id)
+                .execution_options(synchronize_session=False)
+            )
+            deleted = sorted(session.execute(stmt).scalars())
+            session.commit()
+        self._mark_write()
+        return deleted
+
+    def merge_books(
+        self, keep_id: int, duplicate_ids: list[int], list_id: int = DEFAULT_LIST_ID
+    ) -> tuple[Book, list[int]] | None:
+        """
+        Fold duplicates into one book and delete them, in one transaction.
+
+        The kept book becomes owned if any duplicate was, and takes the first
+        known description, region, category and subjects among the duplicates
+        (in the given order) for fields it has no value for.
+
+        Args:
+            keep_id (int): The ID of the book to keep.
+            duplicate_ids (list[int]): The IDs of the books to merge into it.
+            list_id (int): The list all of them must be on. Defaults to the
+                default list.
+
+        Returns:
+            tuple[Book, list[int]] | None: The kept book and the IDs that were
+                merged into it (unknown IDs are skipped), or None if the kept
+                book isn't on the list.
+        """
+        duplicate_ids = [i for i in dict.fromkeys(duplicate_ids) if i != keep_id]
+        with self.session() as session:
+            stmt = (
+                select(Book)
+                .where(Book.list_id == list_id, Book.id.in_([keep_id, *duplicate_ids]))
+                .options(undefer(Book.description))
+                .with_for_update()
+            )
+            books = {book.id: book for book in session.execute(stmt).scalars()}
+            kept = books.pop(keep_id, None)
+            if kept is None:
+                return None
+            merged = [book_id for book_id in duplicate_ids if book_id in books]
+            for book_id in merged:
+                duplicate = books[book_id]
+                if duplicate.is_owned and not kept.is_owned:
+                    kept.is_owned = True
+                    kept.owned_at = duplicate.owned_at or func.now()
+                for field in ("description", "region", "is_fiction", "subjects"):
+                    current = getattr(kept, field)
+                    if not current or current in MISSING_METADATA:
+                        value = getattr(duplicate, field)
+                        if value and value not in MISSING_METADATA:
+                            setattr(kept, field, value)
+                session.delete(duplicate)
+            session.commit()
+            # Reload every column, deferred description included, before detaching
+            session.refresh(kept, [column.key for column in Book.__table__.columns])
+        self._mark_write()
+        return kept, sorted(merged)
+
+    def claim_idempotency_key(
+        self,
+        key: str,
+        request_hash: str,
+        ttl_seconds: float,
+        lease_seconds: float,
+    ) -> dict | None:
+        """
+        Record that a request with `key` has started, unless one already did.
+
+        Keys older than `ttl_seconds` are treated as unused and replaced. A claim
+        that is still unfinished after `lease_seconds` is assumed to belong to a
+        crashed worker and is taken over, so retries don't conflict until the TTL.
+
+        Args:
+            key (str): The client's Idempotency-Key.
+            request_hash (str): Fingerprint of the request body.
+            ttl_seconds (float): How long a key is remembered.
+            lease_seconds (float): How long an unfinished request holds its key.
+
+        Returns:
+            dict | None: None if the key was claimed for this request, otherwise
+                the earlier request's "request_hash", "status_code" and
+                "response" (status and response are None while it is running).
+        """
+        now = datetime.now(timezone.utc)
+        with self.session() as session:
+            session.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.key == key,
+                    or_(
+                        IdempotencyKey.created_at
+                        < now - timedelta(seconds=ttl_seconds),
+                        and_(
+                            IdempotencyKey.status_code.is_(None),
+                            IdempotencyKey.created_at
+                            < now - timedelta(seconds=lease_seconds),
+                        ),
+                    ),
+                )
+            )
+            session.add(
+                IdempotencyKey(key=key, request_hash=request_hash, created_at=now)
+            )
+            try:
+                session.commit()
+                return None
+            except IntegrityError:
+                session.rollback()
+            existing = session.get(IdempotencyKey, key)
+            if existing is None:
+                # Released by the other request in the meantime; let the client retry
+                return {
+                    "request_hash": request_hash,
+                    "status_code": None,
+                    "response": None,
+                }
+            return {
+                "request_hash": existing.request_hash,
+                "status_code": existing.status_code,
+                "response": json.loads(existing.response)
+                if existing.response
+                else None,
+            }
+
+    def complete_idempotency_key(
+        self, key: str, status_code: int, response: dict
+    ) -> None:
+        """
+        Store the final outcome of the request that claimed `key`.
+        """
+        with self.session() as session:
+            session.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.key == key)
+                .values(status_code=status_code, response=json.dumps(response))
+            )
+            session.commit()
+
+    def release_idempotency_key(self, key: str) -> None:
+        """
+        Forget `key` so a retry runs the request again (after transient failures).
+        """
+        with self.session() as session:
+            session.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key))
+            session.commit()
+
     def get_all_books(
         self,
         skip_records: int = 0,
         limit_records: int = 10,
-        filter_fiction: str | None = None,
-        filter_owned: bool | None = None,
+        book_query: BookQuery | None = None,
+        after: list | None = None,
     ) -> list[Book]:
         """
         Fetch a paginated list of books from the database.
@@ -177,118 +663,225 @@ class PostgresClient:
         Args:
             skip_records (int): Number of records to skip for pagination. Defaults to 0.
             limit_records (int): Maximum number of records to return. Defaults to 10.
-            filter_fiction (str, optional): Filter by "Fiction" or "Non-Fiction".
-            filter_owned (bool, optional): Filter by ownership status.
+            book_query (BookQuery, optional): Filters and sort order. Defaults to
+                all books, newest first.
+            after (list, optional): A decoded cursor from `BookQuery.decode_cursor`;
+                when given, the page starts after it and `skip_records` is ignored.
 
         Returns:
-            list[Book]: A list of Book model instances, ordered by ID descending.
+            list[Book]: A page of Book model instances.
         """
-        with self.session() as session:
-            stmt = select(Book)
-            if filter_fiction:
-                stmt = stmt.where(Book.is_fiction == filter_fiction)
-            if filter_owned is not None:
-                stmt = stmt.where(Book.is_owned == filter_owned)
-            stmt = (
-                stmt.order_by(Book.id.desc()).offset(skip_records).limit(limit_records)
+        stmt = (book_query or BookQuery()).page(skip_records, limit_records, after)
+        return self._read(lambda session: session.execute(stmt).scalars().all())
+
+    def iter_books(
+        self, book_query: BookQuery | None = None, page_size: int = 5000
+    ) -> Iterator[Book]:
+        """
+        Yield every book matching `book_query`, one keyset-paginated query per
+        `page_size` books, so whole lists load without an arbitrary cap.
+
+        Args:
+            book_query (BookQuery, optional): Filters, sort order and fields.
+                Defaults to all books of the default list, newest first.
+            page_size (int): Books fetched per query. Defaults to 5000.
+        """
+        book_query = book_query or BookQuery()
+        after = None
+        while True:
+            books = self.get_all_books(
+                limit_records=page_size, book_query=book_query, after=after
             )
-            results = session.execute(stmt).scalars().all()
-            return results
+            yield from books
+            if len(books) < page_size:
+                return
+            after = book_query.decode_cursor(book_query.encode_cursor(books[-1]))
 
-    def get_total_count(
-        self,
-        filter_fiction: str | None = None,
-        filter_owned: bool | None = None,
-    ) -> int:
+    def get_total_count(self, book_query: BookQuery | None = None) -> int:
         """
-        Get the total count of all books in the to-read list.
+        Get the total count of books in the to-read list.
 
         Args:
-            filter_fiction (str, optional): Filter by "Fiction" or "Non-Fiction".
-            filter_owned (bool, optional): Filter by ownership status.
+            book_query (BookQuery, optional): Filters to count under. Defaults to
+                all books.
 
         Returns:
-            int: The total number of book records.
+            int: The total number of matching book records.
         """
+        stmt = (book_query or BookQuery()).count()
+        return self._read(lambda session: session.execute(stmt).scalar() or 0)
 
-        with self.session() as session:
-            stmt = select(func.count(Book.id))
-            if filter_fiction:
-                stmt = stmt.where(Book.is_fiction == filter_fiction)
-            if filter_owned is not None:
-                stmt = stmt.where(Book.is_owned == filter_owned)
-            return session.execute(stmt).scalar() or 0
+    def get_facet_counts(self, list_id: int = DEFAULT_LIST_ID) -> dict[str, int]:
+        """
+        Count the books matching each filter bar facet in one query.
+
+        Args:
+            list_id (int): The list to count. Defaults to the default list.
 
-    def get_stats(self) -> dict:
+        Returns:
+            dict[str, int]: Counts keyed by facet ("all", "fiction", "nonfiction", "owned").
         """
-        Aggregate stats for regions and fiction/non-fiction distribution.
-        Returns dictionaries mapping categories/regions to lists of books.
+        stmt = facet_counts_query(list_id)
+        row = self._read(lambda session: session.execute(stmt).one())
+        return dict(row._mapping)
+
+    def get_timeline(
+        self, period: str, since: datetime, list_id: int = DEFAULT_LIST_ID
+    ) -> dict:
         """
-        with self.session() as session:
-            # Fetch all books to process in python (dataset is small)
-            stmt = select(Book)
-            books = session.execute(stmt).scalars().all()
-
-            region_map = defaultdict(list)
-            category_map = defaultdict(list)
-            subject_map = defaultdict(list)
-            authors_map = defaultdict(list)
-            ownership_map = defaultdict(list)
-            authors_set = set()
-
-            for book in books:
-                item = {"title": book.title, "author": book.author}
-
-                # Track unique authors
-                authors_set.add(book.author)
-
-                # Category Stats
-                cat = book.is_fiction if book.is_fiction else "Uncategorized"
-                category_map[cat].append(item)
-
-                # Region Stats (Split comma-separated)
-                if book.region:
-                    regions = [r.strip() for r in book.region.split(",")]
-                    for region in regions:
-                        if region:
-                            region_map[region].append(item)
-                else:
-                    region_map["Unknown"].append(item)
-
-                # Subject Stats (Split comma-separated)
-                if book.subjects:
-                    subjects = [s.strip() for s in book.subjects.split(",")]
-                    for subject in subjects:
-                        if subject:
-                            subject_map[subject].append(item)
-
-                # Ownership Stats
-                status = "Owned" if book.is_owned else "Not Owned"
-                ownership_map[status].append(item)
-
-                # Author Stats (Split comma-separated)
-                if book.author:
-                    authors_list = [a.strip() for a in book.author.split(",")]
-                    for author in authors_list:
-                        if author:
-                            authors_map[author].append(item)
-
-            # Get top 5 subjects
-            top_subjects = dict(
-                sorted(subject_map.items(), key=lambda x: len(x[1]), reverse=True)[:5]
-            )
+        Count books added and marked owned per week or month, in the database.
 
-            # Get top 5 authors
-            top_authors = dict(
-                sorted(authors_map.items(), key=lambda x: len(x[1]), reverse=True)[:5]
-            )
+        Args:
+            period (str): "week" or "month".
+            since (datetime): Start of the first period to count.
+            list_id (int): The list to count. Defaults to the default list.
 
+        Returns:
+            dict: "added" and "owned" map period start dates to counts (empty
+                periods are left out); "total_before" and "owned_before" count
+                books listed and owned before `since`, or with no timestamp.
+        """
+
+        def query(session: Session) -> dict:
+            added = session.execute(
+                timeline_query(Book.created_at, period, since, list_id)
+            )
+            owned = session.execute(
+                timeline_query(Book.owned_at, period, since, list_id)
+            )
+            baseline = session.execute(timeline_baseline_query(since, list_id)).one()
             return {
-                "total_books": len(books),
-                "unique_authors": len(authors_set),
-                "regions": dict(region_map),
-                "categories": dict(category_map),
-                "top_subjects": top_subjects,
-                "top_authors": top_authors,
-                "ownership": dict(ownership_map),
+                "added": dict(added.all()),
+                "owned": dict(owned.all()),
+                "total_before": baseline.total,
+                "owned_before": baseline.owned,
             }
+
+        return self._read(query)
+
+    def get_stats(self, list_id: int = DEFAULT_LIST_ID) -> dict:
+        """
+        Aggregate stats for regions and fiction/non-fiction distribution.
+        Returns dictionaries mapping categories/regions to lists of books.
+
+        Args:
+            list_id (int): The list to aggregate. Defaults to the default list.
+        """
+        # Fetch all books to process in python (one list is small)
+        stmt = select(Book).where(Book.list_id == list_id)
+        books = self._read(lambda session: session.execute(stmt).scalars().all())
+
+        region_map = defaultdict(list)
+        category_map = defaultdict(list)
+        subject_map = defaultdict(list)
+        authors_map = defaultdict(list)
+        ownership_map = defaultdict(list)
+        authors_set = set()
+
+        for book in books:
+            item = {"id": book.id, "title": book.title, "author": book.author}
+
+            # Track unique authors
+            authors_set.add(book.author)
+
+            # Category Stats
+            cat = book.is_fiction if book.is_fiction else "Uncategorized"
+            category_map[cat].append(item)
+
+            # Region Stats (Split comma-separated)
+            if book.region:
+                regions = [r.strip() for r in book.region.split(",")]
+                for region in regions:
+                    if region:
+                        region_map[region].append(item)
+            else:
+                region_map["Unknown"].append(item)
+
+            # Subject Stats (Split comma-separated)
+            if book.subjects:
+                subjects = [s.strip() for s in book.subjects.split(",")]
+                for subject in subjects:
+                    if subject:
+                        subject_map[subject].append(item)
+
+            # Ownership Stats
+            status = "Owned" if book.is_owned else "Not Owned"
+            ownership_map[status].append(item)
+
+            # Author Stats (Split comma-separated)
+            if book.author:
+                authors_list = [a.strip() for a in book.author.split(",")]
+                for author in authors_list:
+                    if author:
+                        authors_map[author].append(item)
+
+        # Get top 5 subjects
+        top_subjects = dict(
+            sorted(subject_map.items(), key=lambda x: len(x[1]), reverse=True)[:5]
+        )
+
+        # Get top 5 authors
+        top_authors = dict(
+            sorted(authors_map.items(), key=lambda x: len(x[1]), reverse=True)[:5]
+        )
+
+        return {
+            "total_books": len(books),
+            "unique_authors": len(authors_set),
+            "regions": dict(region_map),
+            "categories": dict(category_map),
+            "top_subjects": top_subjects,
+            "top_authors": top_authors,
+            "ownership": dict(ownership_map),
+        }
+
+    def get_list(self, slug: str) -> ReadingList | None:
+        """
+        Look up a reading list by its slug.
+
+        Args:
+            slug (str): The list's URL slug.
+
+        Returns:
+            ReadingList | None: The list, or None if there is no such list.
+        """
+        stmt = select(ReadingList).where(ReadingList.slug == slug)
+        return self._read(lambda session: session.execute(stmt).scalar_one_or_none())
+
+    def get_list_ids(self) -> list[int]:
+        """
+        Return the IDs of all reading lists, oldest first.
+        """
+        stmt = select(ReadingList.id).order_by(ReadingList.id)
+        return self._read(lambda session: list(session.execute(stmt).scalars()))
+
+    def create_list(
+        self, slug: str, name: str, admin_password_hash: str | None = None
+    ) -> ReadingList | None:
+        """
+        Create a new, empty reading list and commit.
+
+        Args:
+            slug (str): The list's URL slug; must be unique.
+            name (str): Display name.
+            admin_password_hash (str, optional): Hash of the list's own admin
+                password (see `bibliotracker.passwords`). Without one, only the
+                instance admin password can change the list.
+
+        Returns:
+            ReadingList | None: The new list, or None if the slug is taken.
+        """
+        with self.session() as session:
+            reading_list = ReadingList(
+                slug=slug, name=name, admin_password_hash=admin_password_hash
+            )
+            session.add(reading_list)
+            try:
+                session.commit()
+            except IntegrityError:
+                session.rollback()
+                return None
+            session.refresh(reading_list)
+            session.expunge(reading_list)
+            self._mark_write()
+            return reading_list
@@ -1,22 +1,130 @@
-from sqlalchemy import Boolean, Column, Integer, String, Text
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+    text,
+)
+from sqlalchemy.orm import DeclarativeBase, deferred
+
+# The list that existing books and requests without a list belong to
+DEFAULT_LIST_ID = 1
+DEFAULT_LIST_SLUG = "default"
 
 
 class Base(DeclarativeBase):
     pass
 
 
+class ReadingList(Base):
+    """
+    A to-read list with its own books and admin password, addressed by slug.
+    """
+
+    __tablename__ = "reading_lists"
+
+    id = Column(Integer, primary_key=True)
+    slug = Column(String(64), nullable=False, unique=True)
+    name = Column(String, nullable=False)
+    # scrypt hash; NULL means only the instance ADMIN_PASSWORD unlocks the list
+    admin_password_hash = Column(String, nullable=True)
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    def __repr__(self):
+        return f"<ReadingList(slug={self.slug}, name={self.name})>"
+
+
 class Book(Base):
     __tablename__ = "books"
 
     id = Column(Integer, primary_key=True, index=True)
+    # Every query filters on it, so it leads the composite indexes below
+    list_id = Column(
+        Integer,
+        ForeignKey("reading_lists.id", ondelete="CASCADE"),
+        nullable=False,
+        # A server default, as in the migration that added the column
+        server_default=str(DEFAULT_LIST_ID),
+    )
     title = Column(String, index=True, nullable=False)
     author = Column(String, nullable=False)
-    description = Column(Text, nullable=True)
+    # Only the detail view needs it; list queries skip loading it
+    description = deferred(Column(Text, nullable=True))
     region = Column(String, nullable=True)
     subjects = Column(Text, nullable=True)  # Stored as comma-separated values
     is_fiction = Column(String, nullable=True)  # Store "Fiction" or "Non-Fiction"
     is_owned = Column(Boolean, default=False)
+    # NULL for books added before timestamps were tracked
+    created_at = Column(
+        DateTime(timezone=True), nullable=True, server_default=func.now()
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+    # When the book was marked owned; NULL while it isn't (or if owned earlier)
+    owned_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Match the filter bar's combinations within a list, all ordered by newest
+    # first, so one list's pages never scan another list's rows
+    __table_args__ = (
+        Index("ix_books_list_id", "list_id", text("id DESC")),
+        Index("ix_books_list_is_fiction_id", "list_id", "is_fiction", text("id DESC")),
+        Index("ix_books_list_is_owned_id", "list_id", "is_owned", text("id DESC")),
+        Index(
+            "ix_books_list_is_owned_is_fiction_id",
+            "list_id",
+            "is_owned",
+            "is_fiction",
+            text("id DESC"),
+        ),
+        Index("ix_books_list_created_at", "list_id", "created_at"),
+        Index("ix_books_list_owned_at", "list_id", "owned_at"),
+    )
 
     def __repr__(self):
         return f"<Book(title={self.title}, author={self.author})>"
+
+
+# Case-insensitive duplicate checks compare lower(title); both also back sorts
+Index("ix_books_list_lower_title", Book.list_id, func.lower(Book.title))
+Index("ix_books_list_lower_author", Book.list_id, func.lower(Book.author))
+
+# Trigram indexes serve ILIKE '%term%' filters (requires the pg_trgm extension).
+# GIN can't lead with list_id without btree_gin; Postgres combines them with
+# ix_books_list_id in a BitmapAnd instead.
+for _column in (Book.subjects, Book.author, Book.region):
+    Index(
+        f"ix_books_{_column.key}_trgm",
+        _column,
+        postgresql_using="gin",
+        postgresql_ops={_column.key: "gin_trgm_ops"},
+    )
+
+
+class IdempotencyKey(Base):
+    """
+    Outcome of an /api/add request, keyed by its Idempotency-Key header.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    # SHA-256 of the request body; a key may not be reused for another request
+    request_hash = Column(String(64), nullable=False)
+    # Both stay NULL while the original request is still running
+    status_code = Column(Integer, nullable=True)
+    response = Column(Text, nullable=True)  # JSON body
+    created_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey(key={self.key}, status_code={self.status_code})>"
@@ -0,0 +1,103 @@
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import NullPool, PoolProxiedConnection, QueuePool
+
+from bibliotracker.config import Config
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    A QueuePool that records how long checkouts wait for a connection.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.checkout_timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def stats(self) -> dict:
+        """
+        Return current occupancy and cumulative checkout wait times.
+        """
+        with self._stats_lock:
+            return {
+                "mode": "queue",
+                "size": self.size(),
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "max_overflow": self._max_overflow,
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "wait_seconds_avg": self.wait_seconds_total / self.checkouts
+                if self.checkouts
+                else 0.0,
+                "wait_seconds_max": self.wait_seconds_max,
+            }
+
+
+def engine_options(app_config: Config) -> dict:
+    """
+    Build `create_engine` keyword arguments from the pool settings in Config.
+
+    Args:
+        app_config (Config): Configuration object containing the DB_* pool settings.
+
+    Returns:
+        dict: Keyword arguments for `sqlalchemy.create_engine`.
+    """
+    connect_args = {}
+    if app_config.DB_STATEMENT_TIMEOUT_MS > 0:
+        connect_args["options"] = (
+            f"-c statement_timeout={app_config.DB_STATEMENT_TIMEOUT_MS}"
+        )
+
+    if app_config.DB_USE_NULL_POOL:
+        # An external pooler (e.g. PgBouncer in transaction mode) owns pooling;
+        # server-side prepared statements don't survive connection switching.
+        connect_args["prepare_threshold"] = None
+        return {
+            "poolclass": NullPool,
+            "pool_pre_ping": False,
+            "connect_args": connect_args,
+        }
+
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": app_config.DB_POOL_SIZE,
+        "max_overflow": app_config.DB_MAX_OVERFLOW,
+        "pool_timeout": app_config.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": app_config.DB_POOL_RECYCLE_SECONDS,
+        # Emits a lightweight ping on checkout; costs a round-trip per checkout
+        "pool_pre_ping": app_config.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
+def pool_stats(engine) -> dict:
+    """
+    Return statistics for an engine's pool.
+    """
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        return engine.pool.stats()
+    return {"mode": "null" if isinstance(engine.pool, NullPool) else "other"}
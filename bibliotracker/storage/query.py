@@ -0,0 +1,363 @@
+import base64
+import json
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import (
+    ColumnElement,
+    Date,
+    Select,
+    and_,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+)
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import load_only, undefer
+from sqlalchemy.sql.functions import FunctionElement
+
+from bibliotracker.storage.models import DEFAULT_LIST_ID, Book
+
+# Sort key -> ORDER BY clauses; each one is backed by an index
+SORTS = {
+    "added": (Book.id.desc(),),
+    "oldest": (Book.id.asc(),),
+    "title": (func.lower(Book.title), Book.id.desc()),
+    "author": (func.lower(Book.author), Book.id.desc()),
+}
+
+# Columns a client may request with a sparse fieldset; "id" is always loaded
+BOOK_FIELDS = (
+    "id",
+    "title",
+    "author",
+    "description",
+    "region",
+    "subjects",
+    "is_fiction",
+    "is_owned",
+)
+
+# Substring filters are served by trigram indexes, which need 3+ characters
+MIN_SEARCH_LENGTH = 3
+
+
+def _contains(column, value: str) -> ColumnElement[bool]:
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return column.ilike(f"%{escaped}%", escape="\\")
+
+
+class BookQuery:
+    """
+    Filters and sort order for one to-read list, compiled to SQLAlchemy statements.
+
+    Only predicates with a supporting index are emitted: equality on
+    `list_id`, `is_fiction` and `is_owned` (composite indexes leading with
+    `list_id`) and case-insensitive substring
+    matches on `subjects`/`author`/`region` (trigram indexes), which is why
+    substring terms shorter than MIN_SEARCH_LENGTH are rejected.
+    """
+
+    def __init__(
+        self,
+        fiction: str | None = None,
+        owned: bool | None = None,
+        subject: str | None = None,
+        author: str | None = None,
+        region: str | None = None,
+        sort: str = "added",
+        fields: Sequence[str] | None = None,
+        list_id: int = DEFAULT_LIST_ID,
+    ) -> None:
+        """
+        Validate and store the query options.
+
+        Args:
+            fiction (str, optional): "Fiction" or "Non-Fiction".
+            owned (bool, optional): Filter by ownership status.
+            subject (str, optional): Substring of one of the book's subjects.
+            author (str, optional): Substring of the author list.
+            region (str, optional): Substring of the region list.
+            sort (str): One of SORTS. Defaults to "added" (newest first).
+            fields (Sequence[str], optional): Columns to load, from BOOK_FIELDS.
+                Defaults to every column, including the deferred description.
+            list_id (int): The list to query. Defaults to the default list.
+
+        Raises:
+            ValueError: If the sort key or a field is unknown, or a search term
+                is too short.
+        """
+        if sort not in SORTS:
+            raise ValueError(f"Unknown sort '{sort}', expected one of {list(SORTS)}")
+        unknown = set(fields or ()) - set(BOOK_FIELDS)
+        if unknown:
+            raise ValueError(
+                f"Unknown fields {sorted(unknown)}, expected any of {list(BOOK_FIELDS)}"
+            )
+        if fields is not None and sort in ("title", "author"):
+            # Cursors for these sorts are built from the sort column
+            fields = [*fields, sort]
+        self.fields = None if fields is None else ["id", *dict.fromkeys(fields)]
+        self.searches = {}
+        for name, column, value in (
+            ("subject", Book.subjects, subject),
+            ("author", Book.author, author),
+            ("region", Book.region, region),
+        ):
+            value = (value or "").strip()
+            if not value:
+                continue
+            if len(value) < MIN_SEARCH_LENGTH:
+                raise ValueError(
+                    f"'{name}' must be at least {MIN_SEARCH_LENGTH} characters"
+                )
+            self.searches[column] = value
+        self.fiction = fiction or None
+        self.owned = owned
+        self.sort = sort
+        self.list_id = list_id
+
+    def where_clauses(self) -> list[ColumnElement[bool]]:
+        clauses = [Book.list_id == self.list_id]
+        if self.fiction:
+            clauses.append(Book.is_fiction == self.fiction)
+        if self.owned is not None:
+            clauses.append(Book.is_owned == self.owned)
+        clauses.extend(_contains(col, value) for col, value in self.searches.items())
+        return clauses
+
+    def encode_cursor(self, book: Book) -> str:
+        """
+        Return an opaque cursor pointing just past `book` in this sort order.
+        """
+        values = [book.id]
+        if self.sort in ("title", "author"):
+            values.insert(0, getattr(book, self.sort))
+        raw = json.dumps(values).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> list:
+        """
+        Parse a cursor produced by `encode_cursor` for the same sort.
+
+        Raises:
+            ValueError: If the cursor is malformed or belongs to another sort.
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values = json.loads(raw)
+        except ValueError as error:
+            raise ValueError("Invalid cursor") from error
+        expected = 2 if self.sort in ("title", "author") else 1
+        if (
+            not isinstance(values, list)
+            or len(values) != expected
+            or not isinstance(values[-1], int)
+            or (expected == 2 and not isinstance(values[0], str))
+        ):
+            raise ValueError("Invalid cursor")
+        return values
+
+    def _after(self, values: list) -> ColumnElement[bool]:
+        if self.sort == "added":
+            return Book.id < values[0]
+        if self.sort == "oldest":
+            return Book.id > values[0]
+        # Matches the (lower(column) ASC, id DESC) order in SORTS
+        column = Book.title if self.sort == "title" else Book.author
+        key, last_key = func.lower(column), func.lower(literal(values[0]))
+        return or_(key > last_key, and_(key == last_key, Book.id < values[1]))
+
+    def page(
+        self,
+        skip_records: int = 0,
+        limit_records: int = 10,
+        after: list | None = None,
+    ) -> Select:
+        """
+        Build the filtered, sorted page query.
+
+        Args:
+            skip_records (int): Offset, ignored when `after` is given.
+            limit_records (int): Page size.
+            after (list, optional): Decoded cursor; the page starts after it
+                (keyset pagination) instead of skipping rows.
+        """
+        where = self.where_clauses()
+        if after is not None:
+            where.append(self._after(after))
+            skip_records = 0
+        if self.fields is None:
+            load = undefer(Book.description)
+        else:
+            load = load_only(*(getattr(Book, name) for name in self.fields))
+        return (
+            select(Book)
+            .options(load)
+            .where(*where)
+            .order_by(*SORTS[self.sort])
+            .offset(skip_records)
+            .limit(limit_records)
+        )
+
+    def count(self) -> Select:
+        """
+        Build the filtered count query used for pagination.
+        """
+        return select(func.count(Book.id)).where(*self.where_clauses())
+
+
+def facet_counts_query(list_id: int = DEFAULT_LIST_ID) -> Select:
+    """
+    Build a single aggregate counting the books behind each filter bar facet.
+    """
+    return (
+        select(
+            func.count().label("all"),
+            func.count().filter(Book.is_fiction == "Fiction").label("fiction"),
+            func.count().filter(Book.is_fiction == "Non-Fiction").label("nonfiction"),
+            func.count().filter(Book.is_owned.is_(True)).label("owned"),
+        )
+        .select_from(Book)
+        .where(Book.list_id == list_id)
+    )
+
+
+def title_lookup_query(book_title: str, list_id: int = DEFAULT_LIST_ID) -> Select:
+    """
+    Build the case-insensitive title lookup used for duplicate checks.
+    """
+    return (
+        select(Book)
+        .options(undefer(Book.description))
+        .where(Book.list_id == list_id, func.lower(Book.title) == book_title.lower())
+    )
+
+
+def existing_titles_query(
+    book_titles: Sequence[str], list_id: int = DEFAULT_LIST_ID
+) -> Select:
+    """
+    Build a batched case-insensitive title lookup, served by
+    ix_books_list_lower_title.
+    """
+    lowered = sorted({title.lower() for title in book_titles})
+    return select(func.lower(Book.title)).where(
+        Book.list_id == list_id, func.lower(Book.title).in_(lowered)
+    )
+
+
+# Values the add flow stores when enrichment could not determine a field
+MISSING_METADATA = ("", "Unknown")
+
+
+def missing_metadata_query(
+    limit_records: int, exclude_ids: Sequence[int] = ()
+) -> Select:
+    """
+    Build the query for books whose region, category or subjects are unknown,
+    newest first, across every list (the backfill serves them all).
+    """
+    missing = or_(
+        *(
+            or_(column.is_(None), column.in_(MISSING_METADATA))
+            for column in (Book.region, Book.is_fiction, Book.subjects)
+        )
+    )
+    stmt = select(Book).where(missing)
+    if exclude_ids:
+        stmt = stmt.where(Book.id.notin_(list(exclude_ids)))
+    return stmt.order_by(Book.id.desc()).limit(limit_records)
+
+
+# Bucket sizes for the stats timeline
+TIMELINE_PERIODS = ("week", "month")
+
+
+class date_bucket(FunctionElement):
+    """
+    The date a timestamp's week (starting Monday) or month starts on.
+
+    Compiles to `date_trunc` on Postgres; SQLite, used by the tests, gets an
+    equivalent `date()` expression.
+    """
+
+    type = Date()
+    inherit_cache = True
+
+    def __init__(self, period: str, column) -> None:
+        if period not in TIMELINE_PERIODS:
+            raise ValueError(
+                f"Unknown period '{period}', expected one of {list(TIMELINE_PERIODS)}"
+            )
+        self.period = period
+        # Inlined rather than bound, so GROUP BY matches the selected bucket
+        super().__init__(literal_column(f"'{period}'"), column)
+
+
+@compiles(date_bucket)
+def _date_bucket_postgres(element, compiler, **kw) -> str:
+    period, column = element.clauses
+    return (
+        f"CAST(date_trunc({compiler.process(period, **kw)}, "
+        f"{compiler.process(column, **kw)}) AS DATE)"
+    )
+
+
+@compiles(date_bucket, "sqlite")
+def _date_bucket_sqlite(element, compiler, **kw) -> str:
+    _, column = element.clauses
+    modifiers = (
+        "'weekday 0', '-6 days'" if element.period == "week" else "'start of month'"
+    )
+    return f"date({compiler.process(column, **kw)}, {modifiers})"
+
+
+def timeline_buckets(period: str, count: int, today: date) -> list[date]:
+    """
+    Return the start dates of the last `count` periods, oldest first.
+    """
+    if period == "week":
+        current = today - timedelta(days=today.weekday())
+        return [current - timedelta(weeks=n) for n in range(count - 1, -1, -1)]
+    months = today.year * 12 + today.month - 1
+    return [
+        date((months - n) // 12, (months - n) % 12 + 1, 1)
+        for n in range(count - 1, -1, -1)
+    ]
+
+
+def timeline_query(
+    column, period: str, since: datetime, list_id: int = DEFAULT_LIST_ID
+) -> Select:
+    """
+    Build a count of books per period of `column` (created_at or owned_at),
+    from `since` on.
+    """
+    bucket = date_bucket(period, column).label("bucket")
+    return (
+        select(bucket, func.count().label("books"))
+        .where(Book.list_id == list_id, column >= since)
+        .group_by(bucket)
+        .order_by(bucket)
+    )
+
+
+def timeline_baseline_query(since: datetime, list_id: int = DEFAULT_LIST_ID) -> Select:
+    """
+    Build the counts of books listed and owned before `since`, including those
+    from before timestamps were tracked.
+    """
+    return select(
+        func.count()
+        .filter(or_(Book.created_at < since, Book.created_at.is_(None)))
+        .label("total"),
+        func.count()
+        .filter(
+            Book.is_owned.is_(True),
+            or_(Book.owned_at < since, Book.owned_at.is_(None)),
+        )
+        .label("owned"),
+    ).where(Book.list_id == list_id)
@@ -13,14 +13,15 @@ os.environ["POSTGRES_PORT"] = "5432"
 os.environ["POSTGRES_USERNAME"] = "postgres"
 os.environ["POSTGRES_PASSWORD"] = "password"
 
-# Patch DB Client globally to safely import app without DB connection
-patcher_db = patch("bibliotracker.storage.client.PostgresClient")
+# Import app modules (services are built lazily, so no DB connection is made)
+from bibliotracker.app import app, db_client
+
+# Patch the DB client class used by the app globally; the real class in
+# bibliotracker.storage.client stays available for storage tests
+patcher_db = patch("bibliotracker.app.PostgresClient")
 MockPostgresClient = patcher_db.start()
 MockPostgresClient.return_value = MagicMock()
 
-# Import app modules
-from bibliotracker.app import app, db_client
-
 
 @pytest.fixture
 def mock_db_client() -> MagicMock:
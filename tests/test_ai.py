@@ -0,0 +1,117 @@
+from types import SimpleNamespace
+
+import pytest
+from pytest_mock import MockerFixture
+
+from bibliotracker.ai import BookAI, min_cacheable_tokens
+from bibliotracker.metrics import metrics
+from bibliotracker.resilience import CircuitBreaker, TokenBucket, Upstream
+
+
+def tool_response(cache_read_input_tokens: int = 0, **tool_input) -> SimpleNamespace:
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="tool_use", input=tool_input)],
+        usage=SimpleNamespace(
+            input_tokens=100,
+            output_tokens=20,
+            cache_read_input_tokens=cache_read_input_tokens,
+            cache_creation_input_tokens=0,
+        ),
+    )
+
+
+@pytest.fixture
+def book_ai(mocker: MockerFixture) -> BookAI:
+    mocker.patch("bibliotracker.ai.anthropic.Anthropic")
+    metrics.reset()
+    ai = BookAI()
+    ai.models = ["fast-model", "strong-model"]
+    ai.upstream = Upstream("anthropic", TokenBucket(100, 100), CircuitBreaker())
+    return ai
+
+
+def test_fast_model_answer_is_used(book_ai: BookAI) -> None:
+    book_ai.client.messages.create.return_value = tool_response(
+        region="Europe", is_fiction="Fiction", confidence="high"
+    )
+
+    details = book_ai.get_book_details(
+        "Dune", "Frank Herbert", fields=["region", "is_fiction"]
+    )
+
+    assert details == {"region": "Europe", "is_fiction": "Fiction"}
+    call = book_ai.client.messages.create.call_args
+    assert call.kwargs["model"] == "fast-model"
+    assert call.kwargs["tool_choice"]["name"] == "record_book_metadata"
+    # The static prefix is below every model's minimum, so it isn't marked
+    assert "cache_control" not in call.kwargs["system"][0]
+    assert metrics.snapshot()["counters"]["ai.resolved.tier0"] == 1
+
+
+def test_low_confidence_escalates(book_ai: BookAI) -> None:
+    book_ai.client.messages.create.side_effect = [
+        tool_response(region="Asia", confidence="low"),
+        tool_response(region="Europe", confidence="high"),
+    ]
+
+    details = book_ai.get_book_details("Obscure", "Someone", fields=["region"])
+
+    assert details == {"region": "Europe"}
+    models = [c.kwargs["model"] for c in book_ai.client.messages.create.call_args_list]
+    assert models == ["fast-model", "strong-model"]
+    assert metrics.snapshot()["counters"]["ai.escalations.low_confidence"] == 1
+
+
+def test_invalid_answer_escalates_and_falls_back(book_ai: BookAI) -> None:
+    book_ai.client.messages.create.side_effect = [
+        tool_response(region="Europe", is_fiction="Maybe", confidence="high"),
+        Exception("overloaded"),
+    ]
+
+    details = book_ai.get_book_details(
+        "Dune", "Frank Herbert", fields=["region", "is_fiction"]
+    )
+
+    assert details == {}
+    counters = metrics.snapshot()["counters"]
+    assert counters["ai.escalations.invalid"] == 1
+    assert counters["ai.unresolved"] == 1
+
+
+def test_background_lane_leaves_tokens_for_interactive(book_ai: BookAI) -> None:
+    book_ai.background_reserve_tokens = 2
+    book_ai.upstream = Upstream("anthropic", TokenBucket(0.001, 3), CircuitBreaker())
+    assert book_ai._has_capacity("background")
+
+    book_ai.upstream.bucket.try_acquire()
+    assert not book_ai._has_capacity("background")
+    assert book_ai._has_capacity("interactive")
+
+
+def test_prefix_marked_for_caching_only_while_the_cache_is_used(
+    book_ai: BookAI,
+) -> None:
+    book_ai._cache_prefix["fast-model"] = True
+    book_ai.client.messages.create.side_effect = [
+        tool_response(region="Europe", confidence="high", cache_read_input_tokens=900),
+        tool_response(region="Europe", confidence="high"),
+        tool_response(region="Europe", confidence="high"),
+    ]
+
+    for _ in range(3):
+        book_ai.get_book_details("Dune", "Frank Herbert", fields=["region"])
+
+    calls = book_ai.client.messages.create.call_args_list
+    marked = ["cache_control" in c.kwargs["system"][0] for c in calls]
+    # The second response shows no cache activity, so the marker is dropped
+    assert marked == [True, True, False]
+    assert metrics.snapshot()["counters"]["ai.cache_disabled.fast-model"] == 1
+
+
+def test_min_cacheable_tokens_per_model() -> None:
+    assert min_cacheable_tokens("claude-haiku-4-5") == 4096
+    assert min_cacheable_tokens("claude-opus-4-6") == 4096
+    assert min_cacheable_tokens("claude-sonnet-4-6") == 2048
+    assert min_cacheable_tokens("claude-sonnet-4-5") == 1024
+    assert min_cacheable_tokens("claude-opus-4-1") == 1024
+    assert min_cacheable_tokens("unknown-model") == 4096
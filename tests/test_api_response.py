@@ -2,7 +2,7 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from bibliotracker.app import get_toread
+from bibliotracker.app import DEFAULT_LIST, get_toread
 
 
 def test_get_toread_null_is_owned():
@@ -40,7 +40,7 @@ def test_get_toread_null_is_owned():
     app.db_client = mock_db_client
 
     try:
-        response = get_toread(page_number=1, page_size=10)
+        response = get_toread(DEFAULT_LIST, page_number=1, page_size=10)
 
         # Verify the item
         item = response["items"][0]
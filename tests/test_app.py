@@ -1,3 +1,5 @@
+import hashlib
+from datetime import UTC, date, datetime
 from unittest.mock import MagicMock
 
 from fastapi.testclient import TestClient
@@ -8,6 +10,35 @@ def test_read_root(client: TestClient) -> None:
     assert response.status_code == 200
 
 
+def test_read_root_inlines_first_page(
+    client: TestClient, mock_db_client: MagicMock, mocker
+) -> None:
+    from bibliotracker.app import config, event_broker, first_page_cache
+
+    mocker.patch.object(config, "SSR_FIRST_PAGE", True)
+    first_page_cache.clear()
+    mock_book = MagicMock(id=1, title="</script><b>", author="A1", region="R")
+    mock_book.subjects = None
+    mock_book.is_fiction = "Fiction"
+    mock_book.is_owned = False
+    mock_db_client.get_all_books.reset_mock()
+    mock_db_client.get_all_books.return_value = [mock_book]
+    mock_db_client.get_total_count.return_value = 1
+    mock_db_client.get_facet_counts.return_value = {"all": 1}
+
+    response = client.get("/")
+    assert '<script id="initialState" type="application/json">' in response.text
+    assert "<\\/script><b>" in response.text
+    client.get("/")
+    assert mock_db_client.get_all_books.call_count == 1
+
+    # A write drops the cached page
+    event_broker.publish("book_deleted", {"id": 1, "list_id": 1})
+    client.get("/")
+    assert mock_db_client.get_all_books.call_count == 2
+    first_page_cache.clear()
+
+
 def test_search_api_empty(client: TestClient) -> None:
     response = client.get("/api/search?q=")
     assert response.status_code == 200
@@ -37,6 +68,24 @@ def test_search_api_results(
     assert data[0]["authors"] == "A1"
 
 
+def test_search_api_marks_books_in_library(
+    client: TestClient, mock_book_service_for_app: MagicMock, mock_db_client: MagicMock
+) -> None:
+    mock_book_service_for_app.search_books.return_value = (
+        [
+            {"title": "Emma", "authors": ["A1"], "key": "k1"},
+            {"title": "Dune", "authors": ["A2"], "key": "k2"},
+        ],
+        2,
+    )
+    mock_db_client.get_existing_titles.return_value = {"emma"}
+
+    response = client.get("/api/search?q=test")
+    assert [book["in_library"] for book in response.json()] == [True, False]
+    mock_db_client.get_existing_titles.assert_called_with(["Emma", "Dune"], 1)
+    mock_db_client.get_existing_titles.return_value = set()
+
+
 def test_search_api_pagination(
     client: TestClient, mock_book_service_for_app: MagicMock
 ) -> None:
@@ -49,13 +98,46 @@ def test_search_api_pagination(
     assert response.status_code == 200
 
     # Verify mock called with correct page
-    mock_book_service_for_app.search_books.assert_called_with("test", page_number=2)
+    mock_book_service_for_app.search_books.assert_called_with(
+        "test", page_number=2, remote=False, aggregate_pages=1, list_id=1
+    )
 
     data = response.json()
     assert len(data) == 1
     assert data[0]["title"] == "B2"
 
 
+def test_search_api_remote(
+    client: TestClient, mock_book_service_for_app: MagicMock
+) -> None:
+    mock_book_service_for_app.search_books.return_value = (
+        [{"title": "B1", "authors": ["A1"], "key": None, "in_library": True}],
+        1,
+    )
+
+    response = client.get("/api/search?q=tes&remote=true&aggregate=true")
+    mock_book_service_for_app.search_books.assert_called_with(
+        "tes", page_number=1, remote=True, aggregate_pages=3, list_id=1
+    )
+    assert response.json()[0]["in_library"] is True
+
+
+def test_search_api_loads_library_suggestions(
+    client: TestClient, mock_book_service_for_app: MagicMock, mock_db_client: MagicMock
+) -> None:
+    mock_book_service_for_app.autocomplete.library_loaded.return_value = False
+    mock_book_service_for_app.search_books.return_value = ([], 0)
+    mock_db_client.iter_books.return_value = [MagicMock(id=1, title="B1", author="A1")]
+
+    # Loaded as a background task, which TestClient runs before returning
+    client.get("/api/search?q=test")
+    load_library = mock_book_service_for_app.autocomplete.load_library
+    load_library.assert_called_once()
+    books, list_id = load_library.call_args.args
+    assert (list(books), list_id) == ([(1, "B1", "A1")], 1)
+    mock_book_service_for_app.autocomplete.library_loaded.assert_called_with(1)
+
+
 def test_add_book_ignore_is_owned_without_auth(
     client: TestClient, mock_book_service_for_app: MagicMock, mock_db_client: MagicMock
 ) -> None:
@@ -87,6 +169,48 @@ def test_add_book_ignore_is_owned_without_auth(
     assert call_args.kwargs["is_owned"] is False
 
 
+def test_add_book_publishes_enrichment_after_insert(
+    client: TestClient,
+    mock_book_service_for_app: MagicMock,
+    mock_db_client: MagicMock,
+    mocker,
+) -> None:
+    mock_book_service_for_app.get_book_metadata.return_value = {
+        "title": "T1",
+        "authors": ["A1"],
+        "region": "Europe",
+    }
+    mock_db_client.add_book.return_value = (True, "Added")
+    record = MagicMock(id=9, title="T1", author="A1", region="Europe")
+    record.subjects = ""
+    record.is_fiction = "Fiction"
+    record.is_owned = False
+    mock_db_client.get_book_by_title.return_value = record
+    mock_broker = mocker.patch("bibliotracker.app.event_broker")
+
+    payload = {"book_key": "k1", "title": "T1", "authors_str": "A1", "subjects": []}
+    assert client.post("/api/add", json=payload).status_code == 200
+
+    calls = mock_broker.publish.call_args_list
+    assert [c.args[0] for c in calls] == ["book_added", "enrichment_completed"]
+    enriched = calls[1].args[1]
+    assert enriched["id"] == 9
+    assert enriched["region"] == "Europe"
+    assert enriched["list_id"] == 1
+
+
+def test_add_book_rejects_duplicate_before_enrichment(
+    client: TestClient, mock_book_service_for_app: MagicMock, mock_db_client: MagicMock
+) -> None:
+    mock_db_client.get_existing_titles.return_value = {"t1"}
+
+    payload = {"book_key": "k1", "title": "T1", "authors_str": "A1", "subjects": []}
+    response = client.post("/api/add", json=payload)
+    assert response.status_code == 409
+    mock_book_service_for_app.get_book_metadata.assert_not_called()
+    mock_db_client.get_existing_titles.return_value = set()
+
+
 def test_add_book_success_with_ownership(
     client: TestClient, mock_book_service_for_app: MagicMock, mock_db_client: MagicMock
 ) -> None:
@@ -116,6 +240,65 @@ def test_add_book_success_with_ownership(
     assert call_args.kwargs["is_owned"] is True
 
 
+def test_add_book_replays_idempotent_retry(
+    client: TestClient, mock_book_service_for_app: MagicMock, mock_db_client: MagicMock
+) -> None:
+    mock_book_service_for_app.get_book_metadata.return_value = {"title": "T1"}
+    mock_db_client.add_book.return_value = (True, "Added")
+    mock_db_client.claim_idempotency_key.return_value = None
+    payload = {"book_key": "k1", "title": "T1", "authors_str": "A1", "subjects": []}
+    headers = {"Idempotency-Key": "abc"}
+
+    response = client.post("/api/add", json=payload, headers=headers)
+    assert response.status_code == 200
+    key, status_code, body = mock_db_client.complete_idempotency_key.call_args.args
+    assert (key, status_code, body["status"]) == ("abc", 200, "success")
+    request_hash = mock_db_client.claim_idempotency_key.call_args.args[1]
+
+    # The retry gets the stored outcome without another enrichment
+    mock_db_client.claim_idempotency_key.return_value = {
+        "request_hash": request_hash,
+        "status_code": 200,
+        "response": body,
+    }
+    response = client.post("/api/add", json=payload, headers=headers)
+    assert response.json() == body
+    assert mock_book_service_for_app.get_book_metadata.call_count == 1
+
+    # Same key, different body
+    payload["title"] = "T2"
+    response = client.post("/api/add", json=payload, headers=headers)
+    assert response.status_code == 422
+
+
+def test_add_book_idempotency_in_progress_and_release(
+    client: TestClient, mock_book_service_for_app: MagicMock, mock_db_client: MagicMock
+) -> None:
+    from bibliotracker.app import BookSelection
+
+    payload = {"book_key": "k1", "title": "T1", "authors_str": "A1", "subjects": []}
+    headers = {"Idempotency-Key": "abc"}
+    request_hash = hashlib.sha256(
+        f"1:{BookSelection(**payload).model_dump_json()}".encode()
+    ).hexdigest()
+    mock_db_client.claim_idempotency_key.return_value = {
+        "request_hash": request_hash,
+        "status_code": None,
+        "response": None,
+    }
+
+    response = client.post("/api/add", json=payload, headers=headers)
+    assert response.status_code == 409
+    mock_book_service_for_app.get_book_metadata.assert_not_called()
+
+    # A failed enrichment frees the key for the retry
+    mock_db_client.claim_idempotency_key.return_value = None
+    mock_book_service_for_app.get_book_metadata.return_value = {}
+    response = client.post("/api/add", json=payload, headers=headers)
+    assert response.status_code == 404
+    mock_db_client.release_idempotency_key.assert_called_with("abc")
+
+
 def test_get_stats(client: TestClient, mock_db_client: MagicMock) -> None:
     mock_db_client.get_stats.return_value = {"total": 10}
     response = client.get("/api/stats")
@@ -145,6 +328,142 @@ def test_get_toread(client: TestClient, mock_db_client: MagicMock) -> None:
     assert len(data["items"]) == 1
     assert data["items"][0]["title"] == "B1"
     assert data["items"][0]["is_owned"] is False
+    assert "facets" not in data
+
+
+def test_get_toread_with_facets(client: TestClient, mock_db_client: MagicMock) -> None:
+    mock_db_client.get_all_books.return_value = []
+    mock_db_client.get_total_count.return_value = 0
+    facets = {"all": 5, "fiction": 3, "nonfiction": 1, "owned": 2}
+    mock_db_client.get_facet_counts.return_value = facets
+
+    response = client.get("/api/toread?page=1&size=10&fiction=Fiction&facets=true")
+    assert response.status_code == 200
+    assert response.json()["facets"] == facets
+
+
+def test_get_toread_filters_and_sort(
+    client: TestClient, mock_db_client: MagicMock
+) -> None:
+    mock_db_client.get_all_books.return_value = []
+    mock_db_client.get_total_count.return_value = 0
+
+    response = client.get("/api/toread?author=Austen&region=England&sort=title")
+    assert response.status_code == 200
+    book_query = mock_db_client.get_all_books.call_args.kwargs["book_query"]
+    assert book_query.sort == "title"
+    assert set(book_query.searches.values()) == {"Austen", "England"}
+
+
+def test_get_toread_sparse_fields(
+    client: TestClient, mock_db_client: MagicMock
+) -> None:
+    mock_book = MagicMock(id=1, title="B1", author="A1")
+    mock_db_client.get_all_books.return_value = [mock_book]
+    mock_db_client.get_total_count.return_value = 1
+
+    response = client.get("/api/toread?fields=title,author")
+    assert response.status_code == 200
+    assert response.json()["items"] == [{"id": 1, "title": "B1", "author": "A1"}]
+
+    response = client.get("/api/toread?fields=title,isbn")
+    assert response.status_code == 400
+
+
+def test_get_book_detail(client: TestClient, mock_db_client: MagicMock) -> None:
+    mock_book = MagicMock(
+        id=7, title="B7", author="A7", description="Long text", region="R"
+    )
+    mock_book.subjects = "S1, S2"
+    mock_book.is_fiction = "Fiction"
+    mock_book.is_owned = True
+    mock_db_client.get_book.return_value = mock_book
+
+    response = client.get("/api/books/7")
+    assert response.status_code == 200
+    assert response.json()["description"] == "Long text"
+    assert response.json()["subjects"] == ["S1", "S2"]
+
+    mock_db_client.get_book.return_value = None
+    assert client.get("/api/books/8").status_code == 404
+
+
+def test_get_similar_books(client: TestClient, mock_db_client: MagicMock) -> None:
+    from bibliotracker.app import event_broker, similar_books
+
+    def book(book_id: int, description: str) -> MagicMock:
+        record = MagicMock(id=book_id, title=f"B{book_id}", author="A", region="R")
+        record.description = description
+        record.subjects = "Science Fiction"
+        record.is_fiction = "Fiction"
+        record.is_owned = False
+        return record
+
+    books = [book(1, "Desert spice"), book(2, "Spice desert worms"), book(3, "Sea")]
+    similar_books.clear()
+    mock_db_client.iter_books.return_value = books
+    mock_db_client.get_books_by_ids.side_effect = lambda ids, list_id: [
+        b for i in ids for b in books if b.id == i
+    ]
+
+    response = client.get("/api/books/1/similar?limit=1")
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["id"] for item in items] == [2]
+    assert items[0]["title"] == "B2" and items[0]["score"] > 0
+
+    # Deletes apply to the loaded index
+    event_broker.publish("book_deleted", {"id": 2, "list_id": 1})
+    assert client.get("/api/books/2/similar").status_code == 404
+    assert client.get("/api/books/1/similar?limit=50").status_code == 422
+    similar_books.clear()
+    mock_db_client.get_books_by_ids.side_effect = None
+
+
+def test_get_toread_etag_revalidation(
+    client: TestClient, mock_db_client: MagicMock
+) -> None:
+    mock_db_client.get_all_books.return_value = []
+    mock_db_client.get_total_count.return_value = 0
+
+    response = client.get("/api/toread?page=2")
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "no-cache"
+
+    response = client.get("/api/toread?page=2", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    # A changed page gets a new tag and a full body
+    mock_db_client.get_total_count.return_value = 1
+    response = client.get("/api/toread?page=2", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["total"] == 1
+
+
+def test_get_toread_cursor_mode(client: TestClient, mock_db_client: MagicMock) -> None:
+    mock_db_client.get_all_books.return_value = [
+        MagicMock(id=9, title="B9", author="A"),
+        MagicMock(id=8, title="B8", author="A"),
+    ]
+    mock_db_client.get_total_count.return_value = 5
+
+    response = client.get("/api/toread?cursor=&size=2&fields=title")
+    next_cursor = response.json()["next_cursor"]
+    assert next_cursor
+    assert mock_db_client.get_all_books.call_args.kwargs["after"] is None
+
+    response = client.get(f"/api/toread?cursor={next_cursor}&size=3&fields=title")
+    assert response.json()["next_cursor"] is None
+    assert mock_db_client.get_all_books.call_args.kwargs["after"] == [8]
+
+    assert client.get("/api/toread?cursor=garbage").status_code == 400
+
+
+def test_get_toread_rejects_unknown_sort(client: TestClient) -> None:
+    response = client.get("/api/toread?sort=rating")
+    assert response.status_code == 400
 
 
 def test_delete_book_success(client: TestClient, mock_db_client: MagicMock) -> None:
@@ -156,4 +475,286 @@ def test_delete_book_success(client: TestClient, mock_db_client: MagicMock) -> N
     assert response.json()["status"] == "success"
 
     # Verify db_client.delete_book was called
-    mock_db_client.delete_book.assert_called_with(1)
+    mock_db_client.delete_book.assert_called_with(1, 1)
+
+
+def test_delete_book_publishes_event(
+    client: TestClient, mock_db_client: MagicMock, mocker
+) -> None:
+    mock_db_client.delete_book.return_value = True
+    mock_broker = mocker.patch("bibliotracker.app.event_broker")
+
+    headers = {"x-admin-password": "secret_password"}
+    response = client.delete("/api/books/3", headers=headers)
+    assert response.status_code == 200
+    mock_broker.publish.assert_called_with("book_deleted", {"id": 3, "list_id": 1})
+
+
+def test_update_book_publishes_event(
+    client: TestClient, mock_db_client: MagicMock, mocker
+) -> None:
+    mock_db_client.update_book_ownership.return_value = True
+    mock_broker = mocker.patch("bibliotracker.app.event_broker")
+
+    headers = {"x-admin-password": "secret_password"}
+    response = client.patch("/api/books/3", json={"is_owned": True}, headers=headers)
+    assert response.status_code == 200
+    mock_broker.publish.assert_called_with(
+        "book_updated", {"id": 3, "is_owned": True, "list_id": 1}
+    )
+
+
+def test_bulk_update_publishes_one_event(
+    client: TestClient, mock_db_client: MagicMock, mocker
+) -> None:
+    mock_db_client.update_books_ownership.return_value = [1, 2]
+    mock_broker = mocker.patch("bibliotracker.app.event_broker")
+    payload = {"book_ids": [1, 2, 3], "is_owned": True}
+
+    response = client.post("/api/books/bulk-update", json=payload)
+    assert response.status_code == 401
+
+    headers = {"x-admin-password": "secret_password"}
+    response = client.post("/api/books/bulk-update", json=payload, headers=headers)
+    assert response.json()["ids"] == [1, 2]
+    mock_db_client.update_books_ownership.assert_called_with([1, 2, 3], True, 1)
+    mock_broker.publish.assert_called_once_with(
+        "books_updated", {"ids": [1, 2], "is_owned": True, "list_id": 1}
+    )
+
+
+def test_bulk_delete(client: TestClient, mock_db_client: MagicMock, mocker) -> None:
+    mock_db_client.delete_books.return_value = [4]
+    mock_broker = mocker.patch("bibliotracker.app.event_broker")
+    headers = {"x-admin-password": "secret_password"}
+
+    response = client.post(
+        "/api/books/bulk-delete", json={"book_ids": [4, 5]}, headers=headers
+    )
+    assert response.json()["message"] == "Deleted 1 books"
+    mock_broker.publish.assert_called_once_with(
+        "books_deleted", {"ids": [4], "list_id": 1}
+    )
+
+    response = client.post(
+        "/api/books/bulk-delete", json={"book_ids": []}, headers=headers
+    )
+    assert response.status_code == 422
+
+
+def test_merge_books_publishes_events(
+    client: TestClient, mock_db_client: MagicMock, mocker
+) -> None:
+    kept = MagicMock(id=1, title="Dune", author="Frank Herbert", region="Arrakis")
+    kept.description = "Spice."
+    kept.subjects = "Science Fiction"
+    kept.is_fiction = "Fiction"
+    kept.is_owned = True
+    mock_db_client.merge_books.return_value = (kept, [2])
+    mock_broker = mocker.patch("bibliotracker.app.event_broker")
+    headers = {"x-admin-password": "secret_password"}
+
+    response = client.post(
+        "/api/books/merge", json={"keep_id": 1, "duplicate_ids": [2]}, headers=headers
+    )
+    assert response.json()["ids"] == [2]
+    assert response.json()["book"]["region"] == "Arrakis"
+    mock_db_client.merge_books.assert_called_with(1, [2], 1)
+    assert [c.args[0] for c in mock_broker.publish.call_args_list] == [
+        "books_deleted",
+        "book_updated",
+    ]
+
+    mock_db_client.merge_books.return_value = None
+    response = client.post(
+        "/api/books/merge", json={"keep_id": 9, "duplicate_ids": [2]}, headers=headers
+    )
+    assert response.status_code == 404
+
+
+def test_duplicate_report_drops_merged_books(
+    client: TestClient, mock_db_client: MagicMock, mocker
+) -> None:
+    def book(book_id: int) -> MagicMock:
+        record = MagicMock(id=book_id, title=f"B{book_id}", author="A", region="R")
+        record.subjects = ""
+        record.is_fiction = "Fiction"
+        record.is_owned = False
+        return record
+
+    report = {
+        "clusters": [
+            {"ids": [1, 2, 3], "similarity": 0.8},
+            {"ids": [4, 5], "similarity": 0.6},
+        ],
+        "books_scanned": 5,
+        "duration_seconds": 0.1,
+        "generated_at": 1.0,
+    }
+    mocker.patch.dict("bibliotracker.app.duplicate_sweep.reports", {1: report})
+    # Book 5 has since been merged into 4
+    mock_db_client.get_books_by_ids.return_value = [book(i) for i in (1, 2, 3, 4)]
+    headers = {"x-admin-password": "secret_password"}
+
+    assert client.get("/api/admin/duplicates").status_code == 401
+    data = client.get("/api/admin/duplicates", headers=headers).json()
+    assert data["books_scanned"] == 5
+    assert [[b["id"] for b in c["books"]] for c in data["clusters"]] == [[1, 2, 3]]
+
+
+def test_duplicate_sweep_runs_in_background(
+    client: TestClient, mock_db_client: MagicMock, mocker
+) -> None:
+    run = mocker.patch("bibliotracker.app.duplicate_sweep.run")
+    mocker.patch("bibliotracker.app.duplicate_sweep.running", set())
+    headers = {"x-admin-password": "secret_password"}
+
+    response = client.post("/api/admin/duplicates/sweep", headers=headers)
+    assert response.status_code == 202
+    assert response.json() == {"started": True}
+    run.assert_called_once_with(1)
+
+    # The mocked run never finishes, so the list's sweep is still running
+    response = client.post("/api/admin/duplicates/sweep", headers=headers)
+    assert response.json() == {"started": False}
+    assert client.get("/api/admin/duplicates", headers=headers).json()["running"]
+
+
+def test_stats_timeline_fills_empty_periods(
+    client: TestClient, mock_db_client: MagicMock, mocker
+) -> None:
+    mock_now = mocker.patch("bibliotracker.app.datetime", wraps=datetime)
+    mock_now.now.return_value = datetime(2026, 3, 18, tzinfo=UTC)
+    mock_db_client.get_timeline.return_value = {
+        "added": {date(2026, 3, 2): 2, date(2026, 3, 16): 1},
+        "owned": {date(2026, 3, 9): 1},
+        "total_before": 4,
+        "owned_before": 1,
+    }
+
+    response = client.get("/api/stats/timeline?period=week&periods=3")
+    assert response.json() == {
+        "period": "week",
+        "buckets": ["2026-03-02", "2026-03-09", "2026-03-16"],
+        "added": [2, 0, 1],
+        "owned": [0, 1, 0],
+        "total_before": 4,
+        "owned_before": 1,
+    }
+    mock_db_client.get_timeline.assert_called_with(
+        "week", datetime(2026, 3, 2, tzinfo=UTC), 1
+    )
+
+    assert client.get("/api/stats/timeline?period=day").status_code == 400
+    assert client.get("/api/stats/timeline?periods=0").status_code == 422
+
+
+def test_search_api_upstream_unavailable(
+    client: TestClient, mock_book_service_for_app: MagicMock
+) -> None:
+    from bibliotracker.resilience import UpstreamUnavailable
+
+    mock_book_service_for_app.search_books.side_effect = UpstreamUnavailable(
+        "google_books circuit is open"
+    )
+
+    response = client.get("/api/search?q=test")
+    assert response.status_code == 503
+
+
+def test_services_are_built_lazily() -> None:
+    from bibliotracker.lazy import Lazy
+
+    factory = MagicMock()
+    service = Lazy(factory)
+    assert not service.initialized
+    factory.assert_not_called()
+
+    service.search_books("query")
+    service.search_books("query")
+    factory.assert_called_once()
+    factory.return_value.search_books.assert_called_with("query")
+
+
+def test_lifespan_closes_services(mocker) -> None:
+    from bibliotracker.lazy import Lazy
+
+    built_service = MagicMock()
+    mocker.patch("bibliotracker.app.book_service", Lazy(lambda: built_service))
+    mock_broker = mocker.patch("bibliotracker.app.event_broker")
+
+    from bibliotracker.app import app, book_service
+
+    with TestClient(app):
+        book_service.get()
+    built_service.close.assert_called_once()
+    mock_broker.close.assert_called_once()
+
+
+def test_requests_are_scoped_to_the_named_list(
+    client: TestClient, mock_db_client: MagicMock
+) -> None:
+    from bibliotracker.app import list_cache
+    from bibliotracker.passwords import hash_password
+    from bibliotracker.storage.models import ReadingList
+
+    club = ReadingList(
+        id=2,
+        slug="book-club",
+        name="Book club",
+        admin_password_hash=hash_password("club-secret"),
+    )
+    mock_db_client.get_list.reset_mock()
+    mock_db_client.get_list.side_effect = lambda slug: (
+        club if slug == "book-club" else None
+    )
+    mock_db_client.delete_book.return_value = True
+    list_cache.clear()
+
+    response = client.get("/api/lists/current", headers={"X-List": "book-club"})
+    assert response.json() == {"id": 2, "slug": "book-club", "name": "Book club"}
+    assert client.get("/api/lists/current?list=book-club").json()["id"] == 2
+    assert client.get("/api/lists/current").json()["slug"] == "default"
+    assert client.get("/api/toread", headers={"X-List": "nope"}).status_code == 404
+    # Resolved lists are cached
+    mock_db_client.get_list.assert_any_call("book-club")
+    assert mock_db_client.get_list.call_count == 2
+    assert (
+        '<meta name="list" content="book-club">' in client.get("/lists/book-club").text
+    )
+
+    # The list's own password unlocks that list only
+    headers = {"X-List": "book-club", "x-admin-password": "club-secret"}
+    assert client.delete("/api/books/3", headers=headers).status_code == 200
+    mock_db_client.delete_book.assert_called_with(3, 2)
+    wrong_list = {"x-admin-password": "club-secret"}
+    assert client.delete("/api/books/3", headers=wrong_list).status_code == 401
+    assert client.get("/api/metrics", headers=headers).status_code == 401
+    headers["x-admin-password"] = "secret_password"
+    assert client.delete("/api/books/3", headers=headers).status_code == 200
+
+    mock_db_client.get_list.side_effect = None
+    list_cache.clear()
+
+
+def test_create_list(client: TestClient, mock_db_client: MagicMock) -> None:
+    from bibliotracker.passwords import verify_password
+    from bibliotracker.storage.models import ReadingList
+
+    mock_db_client.create_list.return_value = ReadingList(
+        id=3, slug="club", name="Club"
+    )
+    payload = {"slug": "club", "name": "Club", "admin_password": "club-secret"}
+    headers = {"x-admin-password": "secret_password"}
+
+    assert client.post("/api/lists", json=payload).status_code == 401
+    response = client.post("/api/lists", json=payload, headers=headers)
+    assert response.json() == {"id": 3, "slug": "club", "name": "Club"}
+    slug, name, password_hash = mock_db_client.create_list.call_args.args
+    assert (slug, name) == ("club", "Club")
+    assert verify_password("club-secret", password_hash)
+
+    mock_db_client.create_list.return_value = None
+    assert client.post("/api/lists", json=payload, headers=headers).status_code == 409
+    payload["slug"] = "Not A Slug"
+    assert client.post("/api/lists", json=payload, headers=headers).status_code == 422
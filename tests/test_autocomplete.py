@@ -0,0 +1,78 @@
+from bibliotracker.books.autocomplete import AutocompleteIndex, normalize
+
+
+def test_normalize() -> None:
+    assert normalize("  The Hobbit:  There & Back ") == "the hobbit there back"
+
+
+def test_prefix_matches_title_author_and_surname() -> None:
+    index = AutocompleteIndex()
+    index.record_results(
+        [
+            {"title": "The Hobbit", "authors": ["J.R.R. Tolkien"], "key": "k1"},
+            {"title": "Emma", "authors": ["Jane Austen"], "key": "k2"},
+        ]
+    )
+
+    assert [book["key"] for book in index.search("hob")] == ["k1"]
+    assert [book["key"] for book in index.search("the h")] == ["k1"]
+    assert [book["key"] for book in index.search("aust")] == ["k2"]
+    assert [book["key"] for book in index.search("jane a")] == ["k2"]
+    assert index.search("bbit") == []
+    assert index.search("  ") == []
+
+
+def test_library_books_rank_first_and_can_be_removed() -> None:
+    index = AutocompleteIndex()
+    index.record_results([{"title": "Dune", "authors": ["Frank Herbert"], "key": "k1"}])
+    index.load_library([(7, "Dune Messiah", "Frank Herbert")])
+
+    results = index.search("dune")
+    assert [book["in_library"] for book in results] == [True, False]
+    assert index.library_loaded(1)
+    assert not index.library_loaded(2)
+
+    index.remove_library_book(7)
+    assert [book["key"] for book in index.search("dune")] == ["k1"]
+
+
+def test_evicts_least_seen_results() -> None:
+    index = AutocompleteIndex(max_entries=2)
+    index.add_library_book(1, "Anna Karenina", "Leo Tolstoy")
+    index.record_results([{"title": "Alpha", "authors": [], "key": "a"}])
+    index.record_results([{"title": "Alpha", "authors": [], "key": "a"}])
+    index.record_results([{"title": "Beta", "authors": [], "key": "b"}])
+    index.record_results([{"title": "Gamma", "authors": [], "key": "c"}])
+
+    # Library books don't count towards the limit and are never evicted
+    assert len(index) == 3
+    assert index.search("alp") and index.search("anna")
+    assert len(index.search("beta")) + len(index.search("gamma")) == 1
+
+
+def test_library_books_only_match_their_list() -> None:
+    index = AutocompleteIndex()
+    index.load_library([(7, "Dune Messiah", "Frank Herbert")], list_id=1)
+    index.load_library([(8, "Dune", "Frank Herbert")], list_id=2)
+
+    assert [book["title"] for book in index.search("dune", list_id=2)] == ["Dune"]
+    assert [book["title"] for book in index.search("dune")] == ["Dune Messiah"]
+
+    # Reloading one list leaves the other's books in place
+    index.load_library([], list_id=1)
+    assert index.search("dune") == []
+    assert len(index.search("dune", list_id=2)) == 1
+
+
+def test_least_recently_searched_lists_are_dropped() -> None:
+    index = AutocompleteIndex(max_lists=2)
+    index.load_library([(7, "Dune", "Frank Herbert")], list_id=1)
+    index.load_library([(8, "Emma", "Jane Austen")], list_id=2)
+    assert index.search("dune", list_id=1)
+
+    # List 2 was searched least recently, so loading a third list drops it
+    index.load_library([(9, "Ulysses", "James Joyce")], list_id=3)
+    assert not index.library_loaded(2)
+    assert index.search("emma", list_id=2) == []
+    assert index.library_loaded(1) and index.library_loaded(3)
+    assert len(index) == 2
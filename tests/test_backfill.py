@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from bibliotracker.books.backfill import MetadataBackfill, missing_fields
+from bibliotracker.storage.client import PostgresClient
+from tests.test_storage_client import make_config
+
+
+def test_missing_fields() -> None:
+    book = SimpleNamespace(region="Unknown", is_fiction="Fiction", subjects=None)
+    assert missing_fields(book) == ["region", "subjects"]
+
+
+def test_backfill_enriches_unknown_books(tmp_path) -> None:
+    client = PostgresClient(make_config(tmp_path, []))
+    client.initialize_schema()
+    client.add_book(
+        "Known",
+        "A",
+        book_region="Europe",
+        book_subjects=["S"],
+        is_fiction_category="Fiction",
+    )
+    client.add_book("Dune", "Frank Herbert", book_region="Unknown", book_subjects=["S"])
+    client.add_book("Mystery", "A", book_region="Asia", is_fiction_category="Fiction")
+
+    book_ai = MagicMock()
+    book_ai.get_book_details.side_effect = lambda title, author, fields, lane: (
+        {"region": "Americas", "is_fiction": "Fiction"} if title == "Dune" else {}
+    )
+    publish = MagicMock()
+    backfill = MetadataBackfill(client, book_ai, publish, batch_size=10)
+
+    assert backfill.run_once() == 1
+    lanes = {call.kwargs["lane"] for call in book_ai.get_book_details.call_args_list}
+    assert lanes == {"background"}
+    publish.assert_called_once()
+    event, data = publish.call_args.args
+    assert event == "book_updated"
+    assert data["region"] == "Americas"
+    assert data["list_id"] == 1
+
+    # Dune is complete now and the failed book is skipped until its retry time
+    assert client.get_books_missing_metadata() != []
+    assert backfill.run_once() == 0
+    assert book_ai.get_book_details.call_count == 2
@@ -39,6 +39,132 @@ def test_search_books_success(mocker: MockerFixture) -> None:
     assert results[0]["key"] == "k1"
 
 
+def test_search_books_answers_from_local_index(mocker: MockerFixture) -> None:
+    mock_client_instance = mocker.Mock()
+    mocker.patch(
+        "bibliotracker.books.service.GoogleBooksClient",
+        return_value=mock_client_instance,
+    )
+    mocker.patch("bibliotracker.books.service.Config")
+
+    service = BookLookupService()
+    service.autocomplete.min_results = 2
+    service.autocomplete.record_results(
+        [
+            {"title": "Dune", "authors": ["Frank Herbert"], "key": "k1"},
+            {"title": "Dune Messiah", "authors": ["Frank Herbert"], "key": "k2"},
+        ]
+    )
+
+    results, count = service.search_books("dun")
+    assert count == 2
+    assert {result["source"] for result in results} == {"local"}
+    mock_client_instance.search_books.assert_not_called()
+
+    # Explicit remote searches and later pages always go to Google Books
+    mock_client_instance.search_books.return_value = {"totalItems": 0, "items": []}
+    service.search_books("dun", remote=True)
+    service.search_books("dun", page_number=2)
+    assert mock_client_instance.search_books.call_count == 2
+
+
+def test_search_books_aggregates_pages(mocker: MockerFixture) -> None:
+    def volume(volume_id: str, title: str, language: str = "en") -> dict:
+        return {
+            "id": volume_id,
+            "volumeInfo": {"title": title, "authors": ["A"], "language": language},
+        }
+
+    pages = {
+        12: [volume("k1", "Dune"), volume("k2", "Emma", language="fr")],
+        14: [volume("k3", "DUNE!"), volume("k4", "Persuasion")],
+        16: [volume("k5", "Middlemarch")],
+    }
+    mock_client_instance = mocker.Mock()
+    mock_client_instance.search_books.side_effect = (
+        lambda query, max_results, start_index: {
+            "totalItems": 50,
+            "items": pages[start_index],
+        }
+    )
+    mocker.patch(
+        "bibliotracker.books.service.GoogleBooksClient",
+        return_value=mock_client_instance,
+    )
+    mocker.patch("bibliotracker.books.service.Config")
+
+    service = BookLookupService()
+    results, count = service.search_books(
+        "d", page_number=3, results_limit=2, remote=True, aggregate_pages=3
+    )
+
+    # Page order is kept, the later "DUNE!" edition and non-English item dropped
+    assert [result["key"] for result in results] == ["k1", "k4", "k5"]
+    assert count == 50
+    assert mock_client_instance.search_books.call_count == 3
+    service.search_executor.shutdown()
+
+
+def test_search_books_aggregate_tolerates_partial_outage(
+    mocker: MockerFixture,
+) -> None:
+    from bibliotracker.resilience import UpstreamUnavailable
+
+    mock_client_instance = mocker.Mock()
+    mock_client_instance.search_books.side_effect = [
+        {
+            "totalItems": 1,
+            "items": [{"id": "k1", "volumeInfo": {"title": "T", "language": "en"}}],
+        },
+        UpstreamUnavailable("rate limited"),
+    ]
+    mocker.patch(
+        "bibliotracker.books.service.GoogleBooksClient",
+        return_value=mock_client_instance,
+    )
+    mocker.patch("bibliotracker.books.service.Config")
+
+    service = BookLookupService()
+    results, _ = service.search_books("t", remote=True, aggregate_pages=2)
+    assert [result["key"] for result in results] == ["k1"]
+
+    mock_client_instance.search_books.side_effect = UpstreamUnavailable("open")
+    with pytest.raises(UpstreamUnavailable):
+        service.search_books("u", remote=True, aggregate_pages=2)
+    service.search_executor.shutdown()
+
+
+def test_search_books_prefetches_next_page(mocker: MockerFixture) -> None:
+    mock_client_instance = mocker.Mock()
+    mock_client_instance.search_books.side_effect = (
+        lambda query, max_results, start_index: {
+            "totalItems": 100,
+            "items": [
+                {
+                    "id": f"k{start_index}",
+                    "volumeInfo": {"title": f"T{start_index}", "language": "en"},
+                }
+            ],
+        }
+    )
+    mocker.patch(
+        "bibliotracker.books.service.GoogleBooksClient",
+        return_value=mock_client_instance,
+    )
+    mocker.patch("bibliotracker.books.service.Config")
+
+    service = BookLookupService()
+    service.search_books("dune", remote=True)
+    service.prefetch_executor.shutdown(wait=True)
+    assert mock_client_instance.search_books.call_count == 2
+
+    # Page 2 was parked by the prefetch and is served without a request
+    results, _ = service.search_books("Dune ", page_number=2)
+    assert [result["key"] for result in results] == ["k40"]
+    assert mock_client_instance.search_books.call_count == 2
+    service.search_executor.shutdown()
+
+
 def test_search_books_failure(mocker: MockerFixture) -> None:
     # Mock exception
     mock_client_instance = mocker.Mock()
@@ -74,3 +200,75 @@ def test_get_book_metadata(mocker: MockerFixture) -> None:
     service = BookLookupService()
     details = service.get_book_metadata("Raw Title", "Author")
     assert details["title"] == "Clean Title"
+
+
+def test_get_book_metadata_uses_volume_info(mocker: MockerFixture) -> None:
+    mock_ai = mocker.Mock()
+    mock_ai.get_book_details.return_value = {"region": "Europe", "title": "Ignored"}
+    mock_client_instance = mocker.Mock()
+    mock_client_instance.search_books.return_value = {
+        "totalItems": 1,
+        "items": [
+            {
+                "id": "k1",
+                "volumeInfo": {
+                    "title": "Dune",
+                    "authors": ["Frank Herbert"],
+                    "description": "<p>" + "A desert planet epic. " * 10 + "</p>",
+                    "categories": ["Fiction / Science Fiction / General"],
+                    "language": "en",
+                },
+            }
+        ],
+    }
+
+    mocker.patch("bibliotracker.books.service.BookAI", return_value=mock_ai)
+    mocker.patch(
+        "bibliotracker.books.service.GoogleBooksClient",
+        return_value=mock_client_instance,
+    )
+    mocker.patch("bibliotracker.books.service.Config")
+
+    service = BookLookupService()
+    service.search_books("dune")
+    details = service.get_book_metadata("Dune", "Frank Herbert", book_key="k1")
+
+    # Only the field Google Books can't answer is requested from the model
+    mock_ai.get_book_details.assert_called_once_with(
+        "Dune", "Frank Herbert", fields=["region"]
+    )
+    mock_client_instance.get_volume.assert_not_called()
+    assert details["title"] == "Dune"
+    assert details["region"] == "Europe"
+    assert details["subjects"] == ["Fiction", "Science Fiction"]
+    assert details["is_fiction"] == "Fiction"
+    assert not details["description"].startswith("<p>")
+
+
+def test_get_book_metadata_fetches_uncached_volume(mocker: MockerFixture) -> None:
+    mock_ai = mocker.Mock()
+    mock_ai.get_book_details.return_value = {
+        "region": "Asia",
+        "is_fiction": "Non-Fiction",
+        "description": "AI summary",
+    }
+    mock_client_instance = mocker.Mock()
+    mock_client_instance.get_volume.return_value = {
+        "volumeInfo": {"title": "Sapiens", "authors": ["Yuval Noah Harari"]}
+    }
+
+    mocker.patch("bibliotracker.books.service.BookAI", return_value=mock_ai)
+    mocker.patch(
+        "bibliotracker.books.service.GoogleBooksClient",
+        return_value=mock_client_instance,
+    )
+    mocker.patch("bibliotracker.books.service.Config")
+
+    service = BookLookupService()
+    details = service.get_book_metadata("Sapiens", "Harari", book_key="v9")
+
+    mock_client_instance.get_volume.assert_called_once_with("v9")
+    fields = mock_ai.get_book_details.call_args.kwargs["fields"]
+    assert fields == ["description", "region", "subjects", "is_fiction"]
+    assert details["authors"] == ["Yuval Noah Harari"]
+    assert details["description"] == "AI summary"
@@ -0,0 +1,98 @@
+import random
+from unittest.mock import MagicMock
+
+import pytest
+
+from bibliotracker.books import duplicates
+from bibliotracker.books.duplicates import (
+    DuplicateSweep,
+    MinHasher,
+    find_duplicate_clusters,
+    shingles,
+)
+
+DUNE = (
+    "Set on the desert planet Arrakis, Dune is the story of Paul Atreides, "
+    "heir to a noble family tasked with ruling an inhospitable world where "
+    "the only thing of value is the spice melange."
+)
+
+
+def test_shingles_normalize_case_and_punctuation() -> None:
+    assert shingles("Dune", "Frank Herbert", DUNE) == shingles(
+        "DUNE!", "frank  herbert", DUNE.upper()
+    )
+    assert shingles("", "", None) == set()
+
+
+def test_signature_agreement_estimates_jaccard() -> None:
+    hasher = MinHasher()
+    # Shingle hashes are uniform 64-bit values
+    rng = random.Random(0)
+    values = [rng.getrandbits(64) for _ in range(150)]
+    first, second = set(values[:100]), set(values[50:])  # Jaccard 1/3
+    estimate = MinHasher.similarity(hasher.signature(first), hasher.signature(second))
+    assert estimate == pytest.approx(1 / 3, abs=0.15)
+    assert MinHasher.similarity(hasher.signature(first), hasher.signature(first)) == 1
+
+
+def test_clusters_group_near_duplicates_only() -> None:
+    hasher = MinHasher()
+    books = {
+        1: ("Dune", "Frank Herbert", DUNE),
+        2: ("Dune (Deluxe Edition)", "Frank Herbert", DUNE + " Deluxe edition."),
+        3: ("Dune: A Novel", "Herbert, Frank", DUNE),
+        4: ("Emma", "Jane Austen", "Emma Woodhouse, handsome, clever, and rich."),
+        5: ("Persuasion", "Jane Austen", "Anne Elliot meets Captain Wentworth."),
+    }
+    signatures = {i: hasher.signature(shingles(*book)) for i, book in books.items()}
+
+    clusters = find_duplicate_clusters(signatures, threshold=0.5)
+    assert [cluster["ids"] for cluster in clusters] == [[1, 2, 3]]
+    assert 0.5 <= clusters[0]["similarity"] <= 1
+
+
+def test_oversized_buckets_are_skipped(monkeypatch) -> None:
+    monkeypatch.setattr(duplicates, "MAX_BUCKET_SIZE", 2)
+    signature = MinHasher().signature({1, 2, 3})
+    assert find_duplicate_clusters({1: signature, 2: signature, 3: signature}) == []
+
+
+def test_sweep_pages_through_every_book(monkeypatch) -> None:
+    monkeypatch.setattr(duplicates, "SWEEP_PAGE_SIZE", 2)
+
+    def book(book_id: int, title: str, description: str) -> MagicMock:
+        record = MagicMock(id=book_id, title=title, author="Frank Herbert")
+        record.description = description
+        return record
+
+    pages = [
+        [book(1, "Dune", DUNE), book(2, "Emma", "A matchmaker in Highbury.")],
+        [book(3, "Dune", DUNE)],
+    ]
+    db_client = MagicMock()
+    db_client.get_all_books.side_effect = pages
+
+    sweep = DuplicateSweep(db_client)
+    report = sweep.run(list_id=2)
+    assert sweep.reports == {2: report}
+    assert report["books_scanned"] == 3
+    assert report["clusters"] == [{"ids": [1, 3], "similarity": 1.0}]
+    assert db_client.get_all_books.call_args.kwargs["after"] == [2]
+    assert db_client.get_all_books.call_args.kwargs["book_query"].list_id == 2
+
+
+def test_sweeps_of_other_lists_are_not_blocked() -> None:
+    db_client = MagicMock()
+    db_client.get_all_books.return_value = []
+    sweep = DuplicateSweep(db_client)
+
+    assert sweep.start(1)
+    assert not sweep.start(1)
+    # List 1's sweep holds its lock; list 2 still runs
+    with sweep._list_locks[1]:
+        assert sweep.start(2)
+        assert sweep.run(2)["books_scanned"] == 0
+    assert sweep.running == {1}
+    sweep.run(1)
+    assert sweep.running == set()
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from bibliotracker.events import EventBroker
+
+
+@pytest.mark.asyncio
+async def test_publish_reaches_subscriber() -> None:
+    broker = EventBroker()
+    stream = broker.stream()
+
+    # First message is the reconnect hint
+    assert await anext(stream) == "retry: 5000\n\n"
+    assert broker.subscriber_count == 1
+
+    broker.publish("book_deleted", {"id": 7})
+    message = await asyncio.wait_for(anext(stream), timeout=1)
+    assert message == 'event: book_deleted\ndata: {"id": 7}\n\n'
+
+    await stream.aclose()
+    assert broker.subscriber_count == 0
+
+
+@pytest.mark.asyncio
+async def test_close_ends_stream() -> None:
+    broker = EventBroker()
+    stream = broker.stream()
+    await anext(stream)
+
+    broker.close()
+    with pytest.raises(StopAsyncIteration):
+        await asyncio.wait_for(anext(stream), timeout=1)
+    assert broker.subscriber_count == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_client_is_asked_to_resync() -> None:
+    broker = EventBroker(queue_size=2)
+    stream = broker.stream()
+    await anext(stream)
+
+    for book_id in range(3):
+        broker.publish("book_deleted", {"id": book_id})
+    await asyncio.sleep(0)
+
+    message = await asyncio.wait_for(anext(stream), timeout=1)
+    assert message.startswith("event: resync")
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_close_ends_stream_with_full_queue() -> None:
+    broker = EventBroker(queue_size=2)
+    stream = broker.stream()
+    await anext(stream)
+
+    for book_id in range(2):
+        broker.publish("book_deleted", {"id": book_id})
+    broker.close()
+    await asyncio.sleep(0)
+
+    with pytest.raises(StopAsyncIteration):
+        await asyncio.wait_for(anext(stream), timeout=1)
+    assert broker.subscriber_count == 0
+
+
+def test_listeners_run_on_publish() -> None:
+    broker = EventBroker()
+    received = []
+    broker.add_listener(lambda event_type, data: received.append((event_type, data)))
+    broker.add_listener(lambda event_type, data: 1 / 0)
+
+    # A failing listener neither raises nor stops the others
+    broker.publish("book_added", {"id": 1})
+    assert received == [("book_added", {"id": 1})]
+
+
+@pytest.mark.asyncio
+async def test_stream_only_gets_its_list() -> None:
+    broker = EventBroker()
+    stream = broker.stream(list_id=2)
+    await anext(stream)
+
+    broker.publish("book_deleted", {"id": 7, "list_id": 1})
+    broker.publish("book_deleted", {"id": 8, "list_id": 2})
+    message = await asyncio.wait_for(anext(stream), timeout=1)
+    assert message == 'event: book_deleted\ndata: {"id": 8, "list_id": 2}\n\n'
+    await stream.aclose()
@@ -0,0 +1,10 @@
+from bibliotracker.passwords import hash_password, verify_password
+
+
+def test_hash_round_trip() -> None:
+    password_hash = hash_password("correct horse")
+    assert password_hash.startswith("scrypt$")
+    assert password_hash != hash_password("correct horse")  # salted
+    assert verify_password("correct horse", password_hash)
+    assert not verify_password("wrong horse", password_hash)
+    assert not verify_password("correct horse", "not-a-hash")
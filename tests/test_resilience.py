@@ -0,0 +1,121 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from bibliotracker.resilience import (
+    CircuitBreaker,
+    PriorityScheduler,
+    TokenBucket,
+    Upstream,
+    UpstreamUnavailable,
+    hedged_call,
+)
+
+
+def test_token_bucket_limits_burst() -> None:
+    bucket = TokenBucket(rate_per_second=1, capacity=2)
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+
+def test_circuit_opens_and_recovers() -> None:
+    breaker = CircuitBreaker(min_calls=2, failure_ratio=0.5, cooldown_seconds=0.05)
+    upstream = Upstream("test", TokenBucket(100, 100), breaker)
+
+    def failing() -> None:
+        raise RuntimeError("boom")
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            upstream.call(failing)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # Fails fast without calling the upstream
+    with pytest.raises(UpstreamUnavailable):
+        upstream.call(lambda: "never")
+
+    time.sleep(0.06)
+    assert upstream.call(lambda: "ok") == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_client_errors_do_not_open_circuit() -> None:
+    breaker = CircuitBreaker(min_calls=1)
+    upstream = Upstream("test", TokenBucket(100, 100), breaker)
+
+    with pytest.raises(ValueError):
+        upstream.call(lambda: int("x"), is_failure=lambda e: False)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_hedged_call_returns_fastest_attempt() -> None:
+    attempts = []
+
+    def slow_then_fast() -> str:
+        attempts.append(1)
+        if len(attempts) == 1:
+            time.sleep(0.5)
+            return "slow"
+        return "fast"
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        start = time.perf_counter()
+        result = hedged_call(slow_then_fast, hedge_after=0.05, executor=executor)
+        elapsed = time.perf_counter() - start
+
+    assert result == "fast"
+    assert elapsed < 0.4
+
+
+def test_scheduler_holds_background_while_interactive_waits() -> None:
+    scheduler = PriorityScheduler(
+        {"interactive": 1, "background": 1}, recheck_seconds=0.01
+    )
+    order = []
+
+    def run(lane: str) -> None:
+        with scheduler.slot(lane):
+            order.append(lane)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        with scheduler.slot("interactive"):
+            # The interactive caller queues at its cap; background yields to it
+            interactive = executor.submit(run, "interactive")
+            time.sleep(0.05)
+            background = executor.submit(run, "background")
+            time.sleep(0.05)
+            assert scheduler.snapshot()["background"] == {
+                "active": 0,
+                "waiting": 1,
+                "limit": 1,
+            }
+        interactive.result()
+        background.result()
+
+    assert order == ["interactive", "background"]
+
+
+def test_scheduler_background_waits_for_capacity() -> None:
+    capacity = {"background": False}
+    scheduler = PriorityScheduler(
+        {"interactive": 2, "background": 1},
+        has_capacity=lambda lane: lane == "interactive" or capacity[lane],
+        recheck_seconds=0.01,
+    )
+
+    def run() -> str:
+        with scheduler.slot("background"):
+            return "done"
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(run)
+        time.sleep(0.05)
+        assert not future.done()
+        capacity["background"] = True
+        assert future.result(timeout=1) == "done"
+
+    with pytest.raises(KeyError):
+        with scheduler.slot("batch"):
+            pass
@@ -0,0 +1,63 @@
+import pytest
+
+from bibliotracker.books.similarity import SimilarityIndex, book_terms
+
+
+def test_book_terms_skip_stopwords_and_weight_subjects() -> None:
+    terms = book_terms("The spice and the desert, the DESERT!", ["Science  Fiction"])
+    assert set(terms) == {"spice", "desert", "subject:science fiction"}
+    assert terms["desert"] > terms["spice"]
+
+
+def test_similar_ranks_shared_terms_first() -> None:
+    index = SimilarityIndex()
+    index.load(
+        [
+            (1, "A desert planet, spice and sandworms.", ["Science Fiction"]),
+            (2, "Sandworms roam the desert of a spice planet.", ["Science Fiction"]),
+            (3, "A quiet village romance in Victorian England.", ["Romance"]),
+            (4, "Starships cross the galaxy.", ["Science Fiction"]),
+        ]
+    )
+
+    results = index.similar(1, limit=3)
+    assert [book_id for book_id, _ in results] == [2, 4]
+    assert 0 < results[1][1] < results[0][1] <= 1
+
+    index.remove_book(2)
+    index.add_book(5, "Spice merchants cross the desert.", ["Science Fiction"])
+    assert [book_id for book_id, _ in index.similar(1)][0] == 5
+
+    with pytest.raises(KeyError):
+        index.similar(2)
+
+
+def test_book_without_terms_has_no_neighbours() -> None:
+    index = SimilarityIndex()
+    index.load([(1, None, []), (2, "Desert spice.", [])])
+    assert index.similar(1) == []
+
+
+def test_incremental_norms_match_a_full_rebuild() -> None:
+    books = [
+        (1, "A desert planet, spice and sandworms.", ["Science Fiction"]),
+        (2, "Sandworms roam the desert of a spice planet.", ["Science Fiction"]),
+        (3, "A quiet village romance in Victorian England.", ["Romance"]),
+        (4, "Starships cross the galaxy.", ["Science Fiction"]),
+    ]
+    index = SimilarityIndex()
+    index.load(books[:2])
+    index.add_book(*books[2])
+    index.add_book(*books[3])
+    index.add_book(5, "Spice merchants cross the desert.", ["Adventure"])
+    index.remove_book(5)
+
+    rebuilt = SimilarityIndex()
+    rebuilt.load(books)
+    for book_id, _, _ in books:
+        assert index.similar(book_id) == rebuilt.similar(book_id)
+        expected = sum(
+            (weight * rebuilt._idf(term)) ** 2
+            for term, weight in rebuilt._books[book_id].items()
+        )
+        assert index._norm(book_id) == pytest.approx(expected**0.5)
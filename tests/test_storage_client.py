@@ -0,0 +1,390 @@
+from datetime import UTC, date, datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, update
+
+from bibliotracker.storage.client import PostgresClient
+from bibliotracker.storage.models import Base, Book
+from bibliotracker.storage.query import BookQuery, timeline_buckets
+
+
+def make_config(tmp_path, replicas: list[str], **overrides) -> SimpleNamespace:
+    options = {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'primary.db'}",
+        "POSTGRES_REPLICA_URLS": replicas,
+        "READ_YOUR_WRITES_SECONDS": 5.0,
+        "REPLICA_RETRY_SECONDS": 30.0,
+        "DB_POOL_SIZE": 2,
+        "DB_MAX_OVERFLOW": 1,
+        "DB_POOL_TIMEOUT_SECONDS": 1.0,
+        "DB_POOL_RECYCLE_SECONDS": -1,
+        "DB_POOL_PRE_PING": False,
+        "DB_STATEMENT_TIMEOUT_MS": 0,
+        "DB_USE_NULL_POOL": False,
+    }
+    options.update(overrides)
+    return SimpleNamespace(**options)
+
+
+def seed(url: str, *titles: str) -> None:
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        for title in titles:
+            connection.execute(
+                Book.__table__.insert().values(title=title, author="A", is_owned=False)
+            )
+    engine.dispose()
+
+
+@pytest.fixture
+def replica_url(tmp_path) -> str:
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    # The replica holds different rows so tests can tell where a read went
+    seed(url, "Replica Book")
+    return url
+
+
+@pytest.fixture
+def client(tmp_path) -> PostgresClient:
+    client = PostgresClient(make_config(tmp_path, []))
+    client.initialize_schema()
+    return client
+
+
+def test_reads_use_replica(tmp_path, replica_url: str) -> None:
+    client = PostgresClient(make_config(tmp_path, [replica_url]))
+    client.initialize_schema()
+
+    assert client.check_book_exists("replica book")
+    assert [b.title for b in client.get_all_books()] == ["Replica Book"]
+
+
+def test_reads_after_write_use_primary(tmp_path, replica_url: str) -> None:
+    client = PostgresClient(make_config(tmp_path, [replica_url]))
+    client.initialize_schema()
+
+    added, _ = client.add_book(book_title="Fresh Book", book_author="B")
+    assert added
+    assert client.check_book_exists("Fresh Book")
+    assert not client.check_book_exists("Replica Book")
+
+
+def test_failed_replica_falls_back_to_primary(tmp_path) -> None:
+    # A replica without the books table fails every query
+    broken_url = f"sqlite:///{tmp_path / 'broken.db'}"
+    client = PostgresClient(
+        make_config(tmp_path, [broken_url], READ_YOUR_WRITES_SECONDS=0.0)
+    )
+    client.initialize_schema()
+    seed(str(client.engine.url), "Primary Book")
+
+    assert client.check_book_exists("Primary Book")
+    # The replica is skipped until its retry delay elapses
+    assert client._replica_order() == []
+
+
+def test_pool_stats_track_checkouts(client: PostgresClient) -> None:
+    client.get_total_count()
+
+    stats = client.pool_stats()["primary"]
+    assert stats["mode"] == "queue"
+    assert stats["size"] == 2
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] >= 1
+
+
+def test_null_pool_mode(tmp_path) -> None:
+    client = PostgresClient(make_config(tmp_path, [], DB_USE_NULL_POOL=True))
+    assert client.pool_stats()["primary"] == {"mode": "null"}
+
+
+def test_facet_counts_single_query(client: PostgresClient) -> None:
+    client.add_book("F1", "A", is_fiction_category="Fiction", is_owned=True)
+    client.add_book("F2", "A", is_fiction_category="Fiction")
+    client.add_book("N1", "A", is_fiction_category="Non-Fiction", is_owned=True)
+    client.add_book("U1", "A")
+
+    assert client.get_facet_counts() == {
+        "all": 4,
+        "fiction": 2,
+        "nonfiction": 1,
+        "owned": 2,
+    }
+
+
+def test_existing_titles_batched(client: PostgresClient) -> None:
+    client.add_book("The Hobbit", "A")
+    client.add_book("Emma", "A")
+
+    assert client.get_existing_titles(["the HOBBIT", "Dune", "Emma"]) == {
+        "the hobbit",
+        "emma",
+    }
+    assert client.get_existing_titles([]) == set()
+
+
+def test_get_books_by_ids_keeps_order(client: PostgresClient) -> None:
+    for title in ("B1", "B2", "B3"):
+        client.add_book(title, "A")
+    ids = [book.id for book in client.get_all_books(limit_records=10)]
+
+    books = client.get_books_by_ids([ids[2], 999, ids[0]])
+    assert [book.id for book in books] == [ids[2], ids[0]]
+    assert client.get_books_by_ids([]) == []
+
+
+def test_bulk_update_and_delete(client: PostgresClient) -> None:
+    for title in ("B1", "B2", "B3"):
+        client.add_book(title, "A")
+    ids = [book.id for book in client.get_all_books(limit_records=10)]
+
+    assert client.update_books_ownership([*ids[:2], 999], True) == sorted(ids[:2])
+    assert client.get_facet_counts()["owned"] == 2
+
+    assert client.delete_books([ids[0], ids[0], 999]) == [ids[0]]
+    assert client.get_total_count() == 2
+    assert client.delete_books([]) == []
+
+
+def test_merge_books_fills_missing_fields(client: PostgresClient) -> None:
+    client.add_book("Dune", "Frank Herbert", book_region="Unknown")
+    client.add_book(
+        "Dune (Deluxe)",
+        "Frank Herbert",
+        book_description="Spice.",
+        book_region="Arrakis",
+        is_owned=True,
+    )
+    client.add_book("Emma", "Jane Austen")
+    keep, duplicate, other = [
+        book.id for book in client.get_all_books(book_query=BookQuery(sort="oldest"))
+    ]
+
+    kept, merged = client.merge_books(keep, [duplicate, keep, 999])
+    assert merged == [duplicate]
+    assert (kept.title, kept.description, kept.region) == ("Dune", "Spice.", "Arrakis")
+    assert kept.is_owned is True
+    assert [book.id for book in client.get_all_books()] == [other, keep]
+    assert client.merge_books(999, [other]) is None
+
+
+def test_timeline_counts_per_period(client: PostgresClient) -> None:
+    for title in ("Old", "Undated", "W1a", "W1b", "W3"):
+        client.add_book(title, "A")
+    dates = {
+        "Old": datetime(2026, 1, 5, tzinfo=UTC),
+        "Undated": None,
+        "W1a": datetime(2026, 3, 2, 9, tzinfo=UTC),  # Monday
+        "W1b": datetime(2026, 3, 8, 23, tzinfo=UTC),  # Sunday, same week
+        "W3": datetime(2026, 3, 17, tzinfo=UTC),
+    }
+    with client.session() as session:
+        for title, created_at in dates.items():
+            session.execute(
+                update(Book).where(Book.title == title).values(created_at=created_at)
+            )
+        session.commit()
+    ids = {book.title: book.id for book in client.get_all_books(limit_records=10)}
+    client.update_books_ownership([ids["Old"], ids["Undated"]], True)
+    assert client.update_book_ownership(ids["Old"], False)
+
+    since = datetime(2026, 3, 2, tzinfo=UTC)
+    weekly = client.get_timeline("week", since)
+    assert weekly["added"] == {date(2026, 3, 2): 2, date(2026, 3, 16): 1}
+    assert sum(weekly["owned"].values()) == 1  # Undated, marked owned today
+    assert weekly["total_before"] == 2
+    assert weekly["owned_before"] == 0
+
+    monthly = client.get_timeline("month", datetime(2026, 1, 1, tzinfo=UTC))
+    assert monthly["added"] == {date(2026, 1, 1): 1, date(2026, 3, 1): 3}
+
+
+def test_timeline_buckets_cross_year_boundaries() -> None:
+    assert timeline_buckets("month", 3, date(2026, 2, 14)) == [
+        date(2025, 12, 1),
+        date(2026, 1, 1),
+        date(2026, 2, 1),
+    ]
+    assert timeline_buckets("week", 2, date(2026, 1, 4)) == [
+        date(2025, 12, 22),
+        date(2025, 12, 29),
+    ]
+
+
+def test_idempotency_key_lifecycle(client: PostgresClient) -> None:
+    assert (
+        client.claim_idempotency_key("k1", "h1", ttl_seconds=60, lease_seconds=60)
+        is None
+    )
+    assert client.claim_idempotency_key(
+        "k1", "h1", ttl_seconds=60, lease_seconds=60
+    ) == {
+        "request_hash": "h1",
+        "status_code": None,
+        "response": None,
+    }
+
+    client.complete_idempotency_key("k1", 200, {"status": "success"})
+    previous = client.claim_idempotency_key(
+        "k1", "h1", ttl_seconds=60, lease_seconds=60
+    )
+    assert previous["status_code"] == 200
+    assert previous["response"] == {"status": "success"}
+
+    # Released and expired keys can be claimed again
+    client.release_idempotency_key("k1")
+    assert (
+        client.claim_idempotency_key("k1", "h2", ttl_seconds=60, lease_seconds=60)
+        is None
+    )
+    assert (
+        client.claim_idempotency_key("k1", "h3", ttl_seconds=0, lease_seconds=60)
+        is None
+    )
+
+
+def test_idempotency_key_stale_claim_is_taken_over(client: PostgresClient) -> None:
+    # An unfinished claim past its lease (e.g. a crashed worker) is replaced
+    assert (
+        client.claim_idempotency_key("k1", "h1", ttl_seconds=60, lease_seconds=60)
+        is None
+    )
+    assert client.claim_idempotency_key("k1", "h1", ttl_seconds=60, lease_seconds=60)
+    assert (
+        client.claim_idempotency_key("k1", "h1", ttl_seconds=60, lease_seconds=0)
+        is None
+    )
+
+    # Finished requests are kept for the full TTL
+    client.complete_idempotency_key("k1", 200, {"status": "success"})
+    previous = client.claim_idempotency_key("k1", "h1", ttl_seconds=60, lease_seconds=0)
+    assert previous["status_code"] == 200
+
+
+def test_book_query_filters_and_sorts(client: PostgresClient) -> None:
+    client.add_book(
+        "Dune",
+        "Frank Herbert",
+        book_region="Arrakis",
+        book_subjects=["Science Fiction", "Ecology"],
+    )
+    client.add_book(
+        "Emma", "Jane Austen", book_region="England", book_subjects=["Romance"]
+    )
+    client.add_book(
+        "Persuasion",
+        "Jane Austen",
+        book_region="England, Bath",
+        book_subjects=["Romance", "100%_Classic"],
+    )
+
+    by_author = BookQuery(author="austen", sort="title")
+    assert [b.title for b in client.get_all_books(book_query=by_author)] == [
+        "Emma",
+        "Persuasion",
+    ]
+    assert client.get_total_count(BookQuery(region="bath")) == 1
+    assert client.get_total_count(BookQuery(subject="romance", author="jane")) == 2
+    # LIKE wildcards in search terms are matched literally
+    assert client.get_total_count(BookQuery(subject="0%_")) == 1
+    assert client.get_total_count(BookQuery(subject="_Cl")) == 1
+    assert client.get_total_count(BookQuery(subject="%%%")) == 0
+
+    oldest = client.get_all_books(book_query=BookQuery(sort="oldest"))
+    assert [b.title for b in oldest] == ["Dune", "Emma", "Persuasion"]
+
+
+@pytest.mark.parametrize("options", [{"sort": "rating"}, {"author": "ja"}])
+def test_book_query_rejects_unindexed_options(options) -> None:
+    with pytest.raises(ValueError):
+        BookQuery(**options)
+
+
+def test_sparse_fields_skip_description(client: PostgresClient) -> None:
+    client.add_book("Dune", "Frank Herbert", book_description="Spice. " * 200)
+
+    [listed] = client.get_all_books(book_query=BookQuery(fields=["title"]))
+    assert listed.title == "Dune"
+    assert "description" not in listed.__dict__
+
+    [full] = client.get_all_books()
+    assert full.description.startswith("Spice.")
+    assert client.get_book(listed.id).description.startswith("Spice.")
+    assert client.get_book(listed.id + 1) is None
+
+
+@pytest.mark.parametrize("sort", ["added", "oldest", "title", "author"])
+def test_cursor_pagination_walks_every_book_once(client: PostgresClient, sort) -> None:
+    # Repeated titles/authors exercise the id tie-breaker
+    for n in range(11):
+        client.add_book(f"{'ab'[n % 2]}Title {n % 3}-{n}", f"Author {n % 4}")
+
+    book_query = BookQuery(sort=sort, fields=["id"])
+    expected = [b.id for b in client.get_all_books(0, 100, BookQuery(sort=sort))]
+    seen, after = [], None
+    while True:
+        page = client.get_all_books(limit_records=4, book_query=book_query, after=after)
+        seen.extend(b.id for b in page)
+        if len(page) < 4:
+            break
+        after = book_query.decode_cursor(book_query.encode_cursor(page[-1]))
+
+    assert seen == expected
+
+
+def test_iter_books_pages_through_the_whole_list(client: PostgresClient) -> None:
+    for n in range(7):
+        client.add_book(f"Title {n}", "Author")
+
+    book_query = BookQuery(sort="title", fields=["title"])
+    titles = [book.title for book in client.iter_books(book_query, page_size=3)]
+    assert titles == [f"Title {n}" for n in range(7)]
+
+
+def test_cursor_must_match_sort() -> None:
+    title_cursor = BookQuery(sort="title").encode_cursor(Book(id=3, title="Dune"))
+    with pytest.raises(ValueError):
+        BookQuery(sort="added").decode_cursor(title_cursor)
+    with pytest.raises(ValueError):
+        BookQuery().decode_cursor("not-a-cursor!")
+
+
+def test_lists_are_isolated(client: PostgresClient) -> None:
+    other = client.create_list("book-club", "Book club", admin_password_hash="x")
+    assert other.id != 1 and other.admin_password_hash == "x"
+    assert client.create_list("book-club", "Again") is None
+    assert client.get_list("book-club").name == "Book club"
+    assert client.get_list("missing") is None
+    assert client.get_list_ids() == [1, other.id]
+
+    client.add_book("Dune", "Frank Herbert", is_owned=True)
+    # The same title may be on both lists
+    assert client.add_book("Dune", "Frank Herbert", list_id=other.id)[0]
+    client.add_book("Emma", "Jane Austen", list_id=other.id)
+    [mine] = client.get_all_books()
+    theirs = client.get_all_books(book_query=BookQuery(list_id=other.id))
+
+    assert [b.title for b in theirs] == ["Emma", "Dune"]
+    assert client.get_total_count(BookQuery(list_id=other.id)) == 2
+    assert client.get_facet_counts()["all"] == 1
+    assert client.get_facet_counts(other.id) == {
+        "all": 2,
+        "fiction": 0,
+        "nonfiction": 0,
+        "owned": 0,
+    }
+    assert client.get_existing_titles(["Emma", "Dune"]) == {"dune"}
+    assert client.get_stats(other.id)["total_books"] == 2
+
+    # Books of another list can't be read or changed through this one
+    assert client.get_book(theirs[0].id) is None
+    assert [b.id for b in client.get_books_by_ids([mine.id, theirs[0].id])] == [mine.id]
+    assert not client.update_book_ownership(theirs[0].id, True)
+    assert client.update_books_ownership([b.id for b in theirs], True) == []
+    assert client.delete_books([theirs[0].id]) == []
+    assert client.merge_books(mine.id, [theirs[1].id])[1] == []
+    assert client.merge_books(theirs[0].id, [mine.id]) is None
+    assert client.delete_book(mine.id, list_id=other.id) is False
+    assert client.get_total_count(BookQuery(list_id=other.id)) == 2